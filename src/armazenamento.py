@@ -0,0 +1,304 @@
+import logging
+import os
+from typing import Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow é opcional; sem ele as tabelas são gravadas em CSV
+    pa = feather = pq = None
+
+# Extensão de arquivo de cada formato suportado, na ordem de preferência de leitura
+EXTENSOES = {
+    "feather": ".feather",
+    "parquet": ".parquet",
+    "csv": ".csv",
+}
+
+logger = logging.getLogger(__name__)
+
+
+def formato_disponivel(formato: str) -> bool:
+    """
+    Indica se o formato pode ser lido e gravado no ambiente atual.
+
+    Parâmetros:
+    formato (str): 'feather', 'parquet' ou 'csv'.
+
+    Retorna:
+    bool: True se o formato é suportado e a biblioteca necessária está instalada.
+    """
+    if formato not in EXTENSOES:
+        raise ValueError(f"Formato '{formato}' inválido. Os formatos válidos são {', '.join(EXTENSOES)}.")
+    return formato == "csv" or feather is not None
+
+
+def formato_padrao() -> str:
+    """
+    Retorna o formato usado quando nenhum é informado: Feather se o pyarrow estiver
+    instalado, CSV caso contrário.
+
+    Retorna:
+    str: Nome do formato.
+    """
+    return "feather" if formato_disponivel("feather") else "csv"
+
+
+def salvar_tabela(df: pd.DataFrame, caminho_base: str, formato: Optional[str] = None) -> str:
+    """
+    Grava um DataFrame no formato informado, acrescentando a extensão ao caminho.
+
+    Os formatos colunares (Feather/Parquet) preservam os tipos das colunas e dispensam
+    a releitura do texto nas etapas seguintes. Se o formato não estiver disponível ou a
+    gravação colunar falhar (ex.: coluna com tipos mistos), o DataFrame é gravado em CSV.
+
+    Parâmetros:
+    df (pandas.DataFrame): DataFrame a ser salvo.
+    caminho_base (str): Caminho do arquivo, sem extensão.
+    formato (str): 'feather', 'parquet' ou 'csv'; por padrão, `formato_padrao()`.
+
+    Retorna:
+    str: Caminho do arquivo gravado.
+    """
+    formato = formato or formato_padrao()
+    if not formato_disponivel(formato):
+        logger.warning(f"Formato '{formato}' indisponível (pyarrow não instalado); gravando em CSV.")
+        formato = "csv"
+
+    caminho = f"{caminho_base}{EXTENSOES[formato]}"
+    if formato == "feather":
+        try:
+            df.reset_index(drop=True).to_feather(caminho)
+            return caminho
+        except (TypeError, ValueError, NotImplementedError) as e:
+            logger.warning(f"Falha ao gravar '{caminho}' em Feather ({e}); gravando em CSV.")
+            _remover_parcial(caminho)
+    elif formato == "parquet":
+        try:
+            df.to_parquet(caminho, index=False)
+            return caminho
+        except (TypeError, ValueError, NotImplementedError) as e:
+            logger.warning(f"Falha ao gravar '{caminho}' em Parquet ({e}); gravando em CSV.")
+            _remover_parcial(caminho)
+
+    caminho = f"{caminho_base}{EXTENSOES['csv']}"
+    df.to_csv(caminho, index=False)
+    return caminho
+
+
+def _remover_parcial(caminho: str) -> None:
+    if os.path.exists(caminho):
+        os.remove(caminho)
+
+
+class GravadorTabela:
+    """
+    Grava uma tabela em blocos, à medida que os registros chegam, sem manter a tabela
+    inteira em memória.
+
+    Os registros são acumulados até `tamanho_bloco` linhas e então acrescentados ao arquivo:
+    como lotes de um arquivo Arrow IPC (Feather), como row groups (Parquet) ou como linhas
+    de texto (CSV, com o cabeçalho apenas no primeiro bloco). O arquivo resultante é lido
+    normalmente por `ler_tabela`. Como em `salvar_tabela`, se o primeiro bloco não puder ser
+    gravado no formato colunar, a tabela é gravada em CSV.
+
+    O esquema do arquivo colunar é definido pelo primeiro bloco, com as colunas sem nenhum
+    valor gravadas como texto; os blocos seguintes são convertidos para esse esquema. Se um
+    bloco não puder ser convertido (ex.: texto em uma coluna numérica), o que já foi gravado
+    é convertido para CSV e a gravação continua nesse formato.
+
+    Atributos:
+    caminho (str): Caminho do arquivo gravado (definido na gravação do primeiro bloco).
+    colunas (list): Colunas da tabela; chaves ausentes de um registro ficam vazias.
+    formato (str): Formato do arquivo.
+    tamanho_bloco (int): Número de linhas acumuladas antes de cada gravação.
+    linhas (int): Número de linhas recebidas.
+    """
+
+    def __init__(self, caminho_base: str, colunas: list, formato: Optional[str] = None,
+                 tamanho_bloco: int = 1000) -> None:
+        """
+        Prepara a gravação; o arquivo é criado no primeiro bloco.
+
+        Parâmetros:
+        caminho_base (str): Caminho do arquivo, sem extensão.
+        colunas (list): Colunas da tabela, na ordem de gravação.
+        formato (str): 'feather', 'parquet' ou 'csv'; por padrão, `formato_padrao()`.
+        tamanho_bloco (int): Número de linhas acumuladas antes de cada gravação.
+        """
+        formato = formato or formato_padrao()
+        if not formato_disponivel(formato):
+            logger.warning(f"Formato '{formato}' indisponível (pyarrow não instalado); gravando em CSV.")
+            formato = "csv"
+
+        self.caminho_base = caminho_base
+        self.colunas = list(colunas)
+        self.formato = formato
+        self.tamanho_bloco = max(1, int(tamanho_bloco))
+        self.caminho = None
+        self.linhas = 0
+        self._bloco = []
+        self._escritor = None
+        self._esquema = None
+
+    def adicionar(self, registro: dict) -> None:
+        """
+        Acrescenta um registro (coluna -> valor), gravando o bloco quando ele fica cheio.
+
+        Parâmetros:
+        registro (dict): Valores da linha; colunas ausentes ficam vazias.
+
+        Retorna:
+        None
+        """
+        self._bloco.append(registro)
+        self.linhas += 1
+        if len(self._bloco) >= self.tamanho_bloco:
+            self._gravar_bloco()
+
+    def _gravar_bloco(self) -> None:
+        df = pd.DataFrame(self._bloco, columns=self.colunas)
+        self._bloco = []
+
+        if self.caminho is None and self.formato != "csv":
+            try:
+                tabela = pa.Table.from_pandas(df, preserve_index=False)
+                # Colunas vazias no primeiro bloco (sem valores ou só com NaN) são gravadas como texto
+                vazias = set(df.columns[df.isna().all().to_numpy()])
+                self._esquema = pa.schema([
+                    campo.with_type(pa.string()) if pa.types.is_null(campo.type) or campo.name in vazias else campo
+                    for campo in tabela.schema
+                ]).with_metadata(tabela.schema.metadata)
+                self.caminho = f"{self.caminho_base}{EXTENSOES[self.formato]}"
+                if self.formato == "feather":
+                    opcoes = pa.ipc.IpcWriteOptions(compression="lz4")
+                    self._escritor = pa.ipc.new_file(self.caminho, self._esquema, options=opcoes)
+                else:
+                    self._escritor = pq.ParquetWriter(self.caminho, self._esquema)
+            except (TypeError, ValueError, NotImplementedError) as e:
+                logger.warning(f"Falha ao gravar '{self.caminho_base}' em {self.formato} ({e}); gravando em CSV.")
+                if self.caminho is not None:
+                    _remover_parcial(self.caminho)
+                self.formato, self.caminho, self._escritor = "csv", None, None
+
+        if self.formato == "csv":
+            cabecalho = self.caminho is None
+            self.caminho = self.caminho or f"{self.caminho_base}{EXTENSOES['csv']}"
+            df.to_csv(self.caminho, mode="w" if cabecalho else "a", header=cabecalho, index=False)
+            return
+
+        try:
+            tabela = self._converter_bloco(df)
+        except (TypeError, ValueError, NotImplementedError) as e:
+            logger.warning(f"Bloco de '{self.caminho}' incompatível com o esquema ({e}); convertendo a tabela para CSV.")
+            self._converter_para_csv()
+            df.to_csv(self.caminho, mode="a", header=False, index=False)
+            return
+        self._escritor.write_table(tabela)
+
+    def _converter_bloco(self, df: pd.DataFrame) -> "pa.Table":
+        # Colunas sem valores no bloco viram nulos do tipo do esquema; as demais são convertidas
+        colunas = []
+        for campo in self._esquema:
+            serie = df[campo.name]
+            if serie.isna().all():
+                colunas.append(pa.nulls(len(serie), campo.type))
+                continue
+            coluna = pa.Array.from_pandas(serie)
+            colunas.append(coluna if coluna.type == campo.type else coluna.cast(campo.type))
+        return pa.Table.from_arrays(colunas, schema=self._esquema)
+
+    def _converter_para_csv(self) -> None:
+        self._escritor.close()
+        self._escritor = None
+        caminho_csv = f"{self.caminho_base}{EXTENSOES['csv']}"
+        ler_tabela(self.caminho).to_csv(caminho_csv, index=False)
+        _remover_parcial(self.caminho)
+        self.formato, self.caminho = "csv", caminho_csv
+
+    def fechar(self) -> str:
+        """
+        Grava o bloco pendente e fecha o arquivo. Uma tabela sem registros é gravada
+        apenas com as colunas.
+
+        Retorna:
+        str: Caminho do arquivo gravado.
+        """
+        if self._bloco or self.caminho is None:
+            if self._bloco:
+                self._gravar_bloco()
+            else:
+                self.caminho = salvar_tabela(pd.DataFrame(columns=self.colunas), self.caminho_base, self.formato)
+        if self._escritor is not None:
+            self._escritor.close()
+            self._escritor = None
+        return self.caminho
+
+    def __enter__(self) -> "GravadorTabela":
+        return self
+
+    def __exit__(self, tipo_erro, *exc) -> None:
+        if tipo_erro is None:
+            self.fechar()
+            return
+        # Uma gravação interrompida não deixa um arquivo incompleto para as etapas seguintes
+        if self._escritor is not None:
+            self._escritor.close()
+            self._escritor = None
+        if self.caminho is not None:
+            _remover_parcial(self.caminho)
+
+
+def localizar_tabela(caminho: str) -> Optional[str]:
+    """
+    Localiza o arquivo de uma tabela gravada por `salvar_tabela`.
+
+    Se o caminho já possui uma extensão conhecida, ele é usado como está. Caso contrário,
+    entre os arquivos existentes do caminho em formatos legíveis, é escolhido o mais recente.
+
+    Parâmetros:
+    caminho (str): Caminho do arquivo, com ou sem extensão.
+
+    Retorna:
+    str: Caminho do arquivo encontrado, ou None se nenhum existir.
+    """
+    if os.path.splitext(caminho)[1] in EXTENSOES.values():
+        return caminho if os.path.exists(caminho) else None
+
+    candidatos = [
+        f"{caminho}{extensao}" for formato, extensao in EXTENSOES.items()
+        if formato_disponivel(formato) and os.path.exists(f"{caminho}{extensao}")
+    ]
+    if not candidatos:
+        return None
+    return max(candidatos, key=os.path.getmtime)
+
+
+def ler_tabela(caminho: str, colunas: Optional[list] = None, memory_map: bool = True) -> pd.DataFrame:
+    """
+    Lê uma tabela gravada por `salvar_tabela`, detectando o formato pela extensão.
+
+    Arquivos Feather e Parquet são lidos com mapeamento em memória, sem cópia do arquivo
+    para um buffer intermediário, e apenas as colunas pedidas são carregadas.
+
+    Parâmetros:
+    caminho (str): Caminho do arquivo, com ou sem extensão.
+    colunas (list): Colunas a carregar; por padrão, todas.
+    memory_map (bool): Se verdadeiro, mapeia em memória os arquivos colunares.
+
+    Retorna:
+    pandas.DataFrame: Tabela lida.
+    """
+    encontrado = localizar_tabela(caminho)
+    if encontrado is None:
+        raise FileNotFoundError(f"Tabela '{caminho}' não encontrada em nenhum dos formatos {', '.join(EXTENSOES)}.")
+
+    extensao = os.path.splitext(encontrado)[1]
+    if extensao == EXTENSOES["feather"]:
+        return feather.read_table(encontrado, columns=colunas, memory_map=memory_map).to_pandas()
+    if extensao == EXTENSOES["parquet"]:
+        return pd.read_parquet(encontrado, columns=colunas, memory_map=memory_map)
+    return pd.read_csv(encontrado, usecols=colunas)
@@ -0,0 +1,347 @@
+import logging
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from historico import DIRETORIO_PROCESSADOS, HistoricoSnapshots, painel_dos_consolidados
+from modelos import MotorTriagem, RegraTriagem
+from modelos.motor import MODELOS_PADRAO
+from util import Utils
+
+# Frequências de rebalanceamento (período do pandas usado para agrupar as datas)
+FREQUENCIAS = {
+    "diaria": None,
+    "semanal": "W",
+    "mensal": "M",
+}
+
+DIAS_POR_ANO = 365.25
+
+
+class Backtest:
+    """
+    Backtest vetorizado dos modelos de triagem sobre uma sequência de snapshots datados.
+
+    Os snapshots são organizados em matrizes (datas x papéis), uma por coluna. A seleção de
+    cada modelo é feita para todas as datas de rebalanceamento de uma só vez
+    (`RegraTriagem.posicoes_em_painel`), e a carteira, igualmente ponderada entre os papéis
+    selecionados, é mantida sem novas negociações até o rebalanceamento seguinte. Valor da
+    carteira, retornos, giro e drawdown são calculados com operações sobre as matrizes,
+    sem laços por data ou por papel.
+
+    Os snapshots podem vir do histórico particionado (`do_historico`) ou dos consolidados
+    diários que a coleta grava em `02_processados` (`dos_consolidados`), o que inclui as datas
+    coletadas antes do histórico existir.
+
+    Os retornos consideram apenas a variação da cotação (sem proventos). Um papel ausente de
+    um snapshot mantém a última cotação conhecida.
+
+    Atributos:
+    datas (pandas.DatetimeIndex): Datas dos snapshots, em ordem crescente.
+    papeis (numpy.ndarray): Tickers presentes em algum snapshot (colunas das matrizes).
+    precos (numpy.ndarray): Matriz (datas x papéis) de cotações, com a última cotação conhecida
+        repetida nas datas sem snapshot do papel.
+    """
+
+    def __init__(
+            self,
+            painel: pd.DataFrame,
+            coluna_data: str = "dt_snapshot",
+            coluna_papel: str = "Papel",
+            coluna_preco: str = "Cotação",
+            logger_level: int = logging.INFO,
+    ) -> None:
+        """
+        Organiza os snapshots em matrizes (datas x papéis).
+
+        Parâmetros:
+        painel (pandas.DataFrame): Snapshots no formato longo, com as colunas renomeadas e
+            tratadas (ex.: `MotorTriagem.preparar`), uma linha por data e ticker.
+        coluna_data (str): Coluna com a data do snapshot.
+        coluna_papel (str): Coluna com o código do papel.
+        coluna_preco (str): Coluna com a cotação usada nos retornos.
+        logger_level (int): Nível de registro do logger.
+        """
+        self.logger_level = logger_level
+        self.logger = Utils.log_config(logger_level=self.logger_level)
+
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+        self.logger = logging.getLogger(__name__)
+
+        painel = painel.drop_duplicates(subset=[coluna_data, coluna_papel], keep="last")
+        codigos_data, datas = pd.factorize(pd.to_datetime(painel[coluna_data]), sort=True)
+        codigos_papel, papeis = pd.factorize(painel[coluna_papel].astype(str), sort=True)
+        self.painel = painel
+        self.datas = pd.DatetimeIndex(datas)
+        self.papeis = np.asarray(papeis)
+        self._linhas = codigos_data
+        self._colunas = codigos_papel
+        self._matrizes = {}
+        # Ordem de cada papel nas linhas do seu snapshot, para desfazer os empates como a triagem
+        self._ordem = np.zeros((len(self.datas), len(self.papeis)), dtype=np.intp)
+        self._ordem[codigos_data, codigos_papel] = np.arange(len(painel))
+
+        # A última cotação conhecida é repetida nas datas em que o papel não aparece
+        self.precos = pd.DataFrame(self.matriz(coluna_preco)).ffill().to_numpy()
+
+    @classmethod
+    def do_historico(
+            cls,
+            historico: HistoricoSnapshots,
+            inicio=None,
+            fim=None,
+            modelos: Optional[list] = None,
+            coluna_preco: str = "Cotação",
+    ) -> "Backtest":
+        """
+        Cria o backtest a partir dos snapshots de ações gravados no histórico.
+
+        Os snapshots do intervalo são lidos de uma vez, renomeados e tratados em uma única
+        passagem sobre a tabela longa, convertendo apenas as colunas usadas pelos modelos.
+
+        Parâmetros:
+        historico (HistoricoSnapshots): Histórico de snapshots de ações.
+        inicio (str, date or datetime): Data inicial, inclusive; por padrão, sem limite.
+        fim (str, date or datetime): Data final, inclusive; por padrão, sem limite.
+        modelos (list): Modelos que serão avaliados (nomes ou `RegraTriagem`); por padrão, os padrão.
+        coluna_preco (str): Coluna com a cotação usada nos retornos.
+
+        Retorna:
+        Backtest: Backtest sobre os snapshots do intervalo.
+        """
+        return cls._do_painel_bruto(historico.painel(inicio, fim), historico.tipo, modelos, coluna_preco)
+
+    @classmethod
+    def dos_consolidados(
+            cls,
+            diretorio: str = DIRETORIO_PROCESSADOS,
+            inicio=None,
+            fim=None,
+            modelos: Optional[list] = None,
+            coluna_preco: str = "Cotação",
+    ) -> "Backtest":
+        """
+        Cria o backtest a partir dos consolidados diários de ações que a coleta grava em
+        `02_processados` (`acoes_consolidados_<dd_mm_yyyy>`), inclusive os coletados antes do
+        histórico particionado (`HistoricoSnapshots`).
+
+        Parâmetros:
+        diretorio (str): Diretório dos consolidados.
+        inicio (str, date or datetime): Data inicial, inclusive; por padrão, sem limite.
+        fim (str, date or datetime): Data final, inclusive; por padrão, sem limite.
+        modelos (list): Modelos que serão avaliados (nomes ou `RegraTriagem`); por padrão, os padrão.
+        coluna_preco (str): Coluna com a cotação usada nos retornos.
+
+        Retorna:
+        Backtest: Backtest sobre os consolidados do intervalo.
+        """
+        return cls._do_painel_bruto(painel_dos_consolidados("acoes", diretorio, inicio, fim), "acoes",
+                                    modelos, coluna_preco)
+
+    @classmethod
+    def _do_painel_bruto(cls, painel: pd.DataFrame, tipo: str, modelos: Optional[list],
+                         coluna_preco: str) -> "Backtest":
+        """Renomeia e trata o painel com as colunas extraídas, convertendo apenas as usadas pelos modelos."""
+        regras = cls._regras(modelos)
+        colunas = list(dict.fromkeys(
+            [coluna_preco] + [coluna for regra in regras.values() for coluna in regra.colunas_numericas]))
+
+        painel = Utils.renomear_colunas(painel, tipo)
+        painel = MotorTriagem.preparar(painel, [coluna for coluna in colunas if coluna in painel.columns])
+        return cls(painel, coluna_preco=coluna_preco)
+
+    @staticmethod
+    def _regras(modelos: Optional[list]) -> dict:
+        regras = {}
+        for modelo in modelos or list(MODELOS_PADRAO):
+            regra = modelo if isinstance(modelo, RegraTriagem) else RegraTriagem.padrao(modelo)
+            regras[regra.nome] = regra
+        return regras
+
+    def matriz(self, coluna: str) -> np.ndarray:
+        """
+        Retorna a matriz (datas x papéis) de uma coluna numérica, com NaN nas datas em que o
+        papel não aparece.
+
+        Parâmetros:
+        coluna (str): Coluna do painel.
+
+        Retorna:
+        numpy.ndarray: Matriz somente leitura, calculada uma única vez por coluna.
+        """
+        if coluna not in self._matrizes:
+            matriz = np.full((len(self.datas), len(self.papeis)), np.nan)
+            matriz[self._linhas, self._colunas] = pd.to_numeric(self.painel[coluna], errors="coerce").to_numpy(
+                dtype="float64", na_value=np.nan)
+            matriz.flags.writeable = False
+            self._matrizes[coluna] = matriz
+        return self._matrizes[coluna]
+
+    def datas_rebalanceamento(self, frequencia: str = "mensal") -> np.ndarray:
+        """
+        Seleciona as datas de rebalanceamento: o primeiro snapshot de cada período.
+
+        Parâmetros:
+        frequencia (str): 'diaria', 'semanal' ou 'mensal'.
+
+        Retorna:
+        numpy.ndarray: Posições (linhas das matrizes) das datas de rebalanceamento.
+        """
+        if frequencia not in FREQUENCIAS:
+            raise ValueError(f"Frequência '{frequencia}' inválida. As válidas são {', '.join(FREQUENCIAS)}.")
+        if FREQUENCIAS[frequencia] is None:
+            return np.arange(len(self.datas))
+        periodos = self.datas.to_period(FREQUENCIAS[frequencia])
+        return np.flatnonzero(~periodos.duplicated())
+
+    def pesos(self, regra: RegraTriagem, rebalanceamentos: np.ndarray, limite: Optional[int] = None,
+              parametros: Optional[dict] = None) -> np.ndarray:
+        """
+        Calcula os pesos da carteira do modelo em cada data de rebalanceamento. Os papéis de cada
+        data são os de `RegraTriagem.selecionar` sobre o snapshot da data, inclusive nos empates.
+
+        Parâmetros:
+        regra (RegraTriagem): Conjunto de regras do modelo.
+        rebalanceamentos (numpy.ndarray): Posições das datas de rebalanceamento.
+        limite (int): Número de papéis da carteira; por padrão, o `limite` do modelo.
+        parametros (dict): Valores que substituem os parâmetros padrão do modelo.
+
+        Retorna:
+        numpy.ndarray: Matriz (rebalanceamentos x papéis) de pesos, iguais entre os selecionados;
+        uma data sem papéis selecionados fica inteiramente em caixa.
+        """
+        painel = {coluna: self.matriz(coluna)[rebalanceamentos] for coluna in regra.colunas_criterio}
+        posicoes, _, _ = regra.posicoes_em_painel(painel, limite=limite, parametros=parametros,
+                                                  ordem=self._ordem[rebalanceamentos])
+
+        linhas, vagas = np.nonzero(posicoes >= 0)
+        quantidade = np.bincount(linhas, minlength=len(rebalanceamentos))
+        pesos = np.zeros((len(rebalanceamentos), len(self.papeis)))
+        pesos[linhas, posicoes[linhas, vagas]] = 1 / quantidade[linhas]
+        return pesos
+
+    def simular(self, pesos: np.ndarray, rebalanceamentos: np.ndarray, custo: float = 0.0) -> dict:
+        """
+        Simula a carteira rebalanceada para os pesos informados.
+
+        Entre dois rebalanceamentos as posições não são negociadas (os pesos variam com os
+        preços). O custo de transação é cobrado no rebalanceamento sobre o volume negociado
+        (compras + vendas) como fração do valor da carteira.
+
+        Parâmetros:
+        pesos (numpy.ndarray): Matriz (rebalanceamentos x papéis) de pesos-alvo.
+        rebalanceamentos (numpy.ndarray): Posições das datas de rebalanceamento, em ordem crescente.
+        custo (float): Custo de transação por unidade negociada (ex.: 0.001 = 0,1%).
+
+        Retorna:
+        dict: 'serie' (valor da carteira, retorno e drawdown por data), 'rebalanceamentos' (giro,
+        custo e papéis de cada rebalanceamento) e 'resumo' (indicadores do período).
+        """
+        rebalanceamentos = np.asarray(rebalanceamentos)
+        precos = self.precos
+        inicio = rebalanceamentos[0]
+        datas = np.arange(inicio, len(self.datas))
+        caixa = 1 - pesos.sum(axis=1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Variação de cada papel entre rebalanceamentos consecutivos e o fator de cada período
+            variacao_periodo = np.nan_to_num(precos[rebalanceamentos[1:]] / precos[rebalanceamentos[:-1]], nan=1.0)
+            fator_periodo = (pesos[:-1] * variacao_periodo).sum(axis=1) + caixa[:-1]
+
+            # Pesos que a carteira anterior atinge na data de cada rebalanceamento
+            pesos_anteriores = np.zeros_like(pesos)
+            pesos_anteriores[1:] = pesos[:-1] * variacao_periodo / fator_periodo[:, None]
+            negociado = np.abs(pesos - pesos_anteriores).sum(axis=1)
+            giro = np.clip(pesos - pesos_anteriores, 0, None).sum(axis=1)
+            fator_custo = 1 - custo * negociado
+
+            # Valor da carteira logo após cada rebalanceamento
+            valor_rebalanceamento = np.cumprod(np.r_[1.0, fator_periodo] * fator_custo)
+
+            # Valor em cada data: valor no rebalanceamento vigente x variação desde então
+            periodo = np.searchsorted(rebalanceamentos, datas, side="right") - 1
+            variacao = np.nan_to_num(precos[datas] / precos[rebalanceamentos[periodo]], nan=1.0)
+            valor = valor_rebalanceamento[periodo] * ((pesos[periodo] * variacao).sum(axis=1) + caixa[periodo])
+
+        retorno = np.r_[0.0, valor[1:] / valor[:-1] - 1]
+        drawdown = valor / np.maximum.accumulate(valor) - 1
+        serie = pd.DataFrame({"valor": valor, "retorno": retorno, "drawdown": drawdown},
+                             index=pd.Index(self.datas[datas], name="data"))
+
+        linhas, colunas = np.nonzero(pesos > 0)
+        papeis = pd.Series(self.papeis[colunas]).groupby(linhas).agg(tuple)
+        tabela_rebalanceamentos = pd.DataFrame({
+            "giro": giro,
+            "custo": custo * negociado,
+            "quantidade": (pesos > 0).sum(axis=1),
+            "papeis": papeis.reindex(range(len(rebalanceamentos)), fill_value=()).to_numpy(),
+        }, index=pd.Index(self.datas[rebalanceamentos], name="data"))
+
+        return {
+            "serie": serie,
+            "rebalanceamentos": tabela_rebalanceamentos,
+            "resumo": self._resumir(serie, tabela_rebalanceamentos),
+        }
+
+    @staticmethod
+    def _resumir(serie: pd.DataFrame, rebalanceamentos: pd.DataFrame) -> dict:
+        anos = (serie.index[-1] - serie.index[0]).days / DIAS_POR_ANO
+        valor_final = serie["valor"].iloc[-1]
+        observacoes_por_ano = (len(serie) - 1) / anos if anos > 0 else np.nan
+        return {
+            "inicio": serie.index[0].strftime("%Y-%m-%d"),
+            "fim": serie.index[-1].strftime("%Y-%m-%d"),
+            "retorno_total": valor_final - 1,
+            "retorno_anualizado": valor_final ** (1 / anos) - 1 if anos > 0 else np.nan,
+            "volatilidade_anualizada": serie["retorno"].iloc[1:].std() * np.sqrt(observacoes_por_ano),
+            "max_drawdown": serie["drawdown"].min(),
+            "giro_medio": rebalanceamentos["giro"].iloc[1:].mean(),
+            "rebalanceamentos": len(rebalanceamentos),
+        }
+
+    def executar(
+            self,
+            modelos: Optional[list] = None,
+            frequencia: str = "mensal",
+            limite: Optional[int] = None,
+            custo: float = 0.0,
+            parametros: Optional[dict] = None,
+    ) -> dict:
+        """
+        Executa o backtest de cada modelo.
+
+        Parâmetros:
+        modelos (list): Modelos (nomes ou `RegraTriagem`); por padrão, Graham, Magic Formula e Bazin.
+        frequencia (str): Frequência de rebalanceamento ('diaria', 'semanal' ou 'mensal').
+        limite (int): Número de papéis de cada carteira; por padrão, o `limite` de cada modelo.
+        custo (float): Custo de transação por unidade negociada.
+        parametros (dict): Parâmetros de cada modelo (nome do modelo -> {parâmetro: valor}).
+
+        Retorna:
+        dict: Resultado de `simular` para cada modelo (nome -> dict).
+        """
+        rebalanceamentos = self.datas_rebalanceamento(frequencia)
+        if rebalanceamentos.size == 0:
+            raise ValueError("Nenhum snapshot disponível para o backtest.")
+
+        resultados = {}
+        for nome, regra in self._regras(modelos).items():
+            pesos = self.pesos(regra, rebalanceamentos, limite=limite, parametros=(parametros or {}).get(nome))
+            resultados[nome] = self.simular(pesos, rebalanceamentos, custo=custo)
+            self.logger.info(f"Backtest '{nome}': {resultados[nome]['resumo']}")
+        return resultados
+
+    @staticmethod
+    def comparar(resultados: dict) -> pd.DataFrame:
+        """
+        Reúne os resumos de `executar` em uma tabela.
+
+        Parâmetros:
+        resultados (dict): Resultado de `executar`.
+
+        Retorna:
+        pandas.DataFrame: Uma linha por modelo, com os indicadores do resumo.
+        """
+        return pd.DataFrame.from_dict({nome: resultado["resumo"] for nome, resultado in resultados.items()},
+                                      orient="index")
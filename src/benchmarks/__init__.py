@@ -0,0 +1,23 @@
+"""Benchmarks offline do pipeline, executados a partir de fixtures HTML gravadas.
+
+Execute a partir do diretório src/, por exemplo:
+    python -m benchmarks.parser_detalhes
+    python -m benchmarks.suite            # todas as etapas, com comparação contra o baseline
+"""
+import os
+
+DIRETORIO_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def ler_fixture(nome: str) -> str:
+    """
+    Lê uma fixture HTML do diretório de fixtures.
+
+    Parâmetros:
+    nome (str): Nome do arquivo da fixture.
+
+    Retorna:
+    str: Conteúdo da fixture.
+    """
+    with open(os.path.join(DIRETORIO_FIXTURES, nome), encoding="utf-8") as arquivo:
+        return arquivo.read()
@@ -0,0 +1,95 @@
+"""Compara a conversão vetorizada de números no formato brasileiro com a conversão
+célula a célula original (`Series.apply`).
+
+Gera um universo sintético com as colunas numéricas de METADATA_COLS_ACOES no formato
+extraído do Fundamentus ("1.234,56", "-6,5%", "-", vazio). Uso (a partir de src/):
+    python -m benchmarks.conversao_numerica [--linhas N] [--repeticoes N]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from conversao import converter_colunas_br
+from util import Utils
+
+
+def limpar_e_converter_colunas_original(df: pd.DataFrame, colunas: list) -> pd.DataFrame:
+    """Implementação original de `Utils.limpar_e_converter_colunas`, mantida como referência."""
+    def limpar_e_converter(valor):
+        if pd.isnull(valor) or isinstance(valor, str) and (valor.strip() == "" or valor.strip() == "-"):
+            return np.nan
+
+        try:
+            valor_limpo = valor.replace("%", "").replace(".", "").replace(",", ".")
+            valor_convertido = float(valor_limpo)
+            return valor_convertido
+        except ValueError:
+            return np.nan
+
+    for coluna in colunas:
+        if coluna in df.columns:
+            df[coluna] = df[coluna].apply(limpar_e_converter)
+
+    return df
+
+
+def gerar_universo(linhas: int, semente: int = 42) -> pd.DataFrame:
+    """
+    Gera um DataFrame com as colunas numéricas das ações em texto no formato brasileiro.
+
+    Parâmetros:
+    linhas (int): Número de papéis do universo.
+    semente (int): Semente do gerador aleatório.
+
+    Retorna:
+    pandas.DataFrame: Universo sintético com valores em texto.
+    """
+    rng = np.random.default_rng(semente)
+    colunas = [col for col in Utils.METADATA_COLS_ACOES.values() if col[:4] in ("vlr_", "vol_", "num_", "pct_")]
+    tabela = str.maketrans({",": ".", ".": ","})
+    dados = {}
+    for col in colunas:
+        valores = rng.normal(0, 10 ** rng.integers(1, 10), size=linhas)
+        sufixo = "%" if col.startswith("pct_") else ""
+        textos = np.array([f"{valor:,.2f}".translate(tabela) + sufixo for valor in valores], dtype=object)
+        ausentes = rng.random(linhas)
+        textos[ausentes < 0.03] = "-"
+        textos[(ausentes >= 0.03) & (ausentes < 0.05)] = ""
+        dados[col] = textos
+    return pd.DataFrame(dados)
+
+
+def medir(funcao, df: pd.DataFrame, colunas: list, repeticoes: int) -> tuple:
+    melhor = float("inf")
+    resultado = None
+    for _ in range(repeticoes):
+        copia = df.copy()
+        inicio = time.perf_counter()
+        resultado = funcao(copia, colunas)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--linhas", type=int, default=1000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    df = gerar_universo(args.linhas)
+    colunas = list(df.columns)
+
+    tempo_original, esperado = medir(limpar_e_converter_colunas_original, df, colunas, args.repeticoes)
+    tempo_vetorizado, obtido = medir(converter_colunas_br, df, colunas, args.repeticoes)
+    pd.testing.assert_frame_equal(obtido, esperado.astype("float64"))
+
+    celulas = args.linhas * len(colunas)
+    print(f"Universo: {args.linhas} linhas x {len(colunas)} colunas ({celulas} células)")
+    print(f"Series.apply:  {tempo_original * 1000:9.1f} ms")
+    print(f"Vetorizado:    {tempo_vetorizado * 1000:9.1f} ms ({tempo_original / tempo_vetorizado:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Mede o custo de inicialização da linha de comando (main.py) com `python -X importtime`.
+
+Cada cenário roda em um interpretador novo, importando o que o subcomando carrega antes de
+executar: `--help` (apenas o parser), cada etapa (`etapas.coleta`, `etapas.triagem`,
+`etapas.relatorio`, mais as métricas) e, como referência, todos os módulos que o main.py
+importava no topo antes dos subcomandos. São exibidos a mediana do tempo de importação
+acumulado, o número de módulos importados e a razão em relação à referência.
+Uso (a partir de src/):
+    python -m benchmarks.importtime [--repeticoes 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Importações que o main.py fazia no topo, antes de qualquer subcomando
+REFERENCIA = ("import pandas; import armazenamento, scraping, gerar_pdf, historico, metricas, modelos, util")
+
+CENARIOS = {
+    "--help": f"import sys; sys.argv = ['main.py', '--help']; import runpy\n"
+              f"try: runpy.run_path('main.py', run_name='__main__')\nexcept SystemExit: pass",
+    "scrape": "import main, metricas, etapas.coleta",
+    "screen": "import main, metricas, etapas.triagem",
+    "report": "import main, metricas, etapas.relatorio",
+    "run-all": "import main, metricas, etapas.coleta, etapas.triagem, etapas.relatorio",
+    "referência (import ansioso)": REFERENCIA,
+}
+
+
+def medir_importacao(codigo: str) -> tuple:
+    """
+    Executa o código em um interpretador novo com `-X importtime`.
+
+    Parâmetros:
+    codigo (str): Código passado ao interpretador com `-c`.
+
+    Retorna:
+    tuple: Tempo acumulado das importações de primeiro nível em segundos e número de módulos importados.
+    """
+    resultado = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo], cwd=SRC,
+                               capture_output=True, text=True, check=True)
+    total_us, modulos = 0, 0
+    for linha in resultado.stderr.splitlines():
+        if not linha.startswith("import time:") or "self [us]" in linha:
+            continue
+        _, acumulado, nome = linha[len("import time:"):].split("|")
+        modulos += 1
+        # Apenas as importações de primeiro nível (sem recuo), cujo tempo acumulado já inclui as dependências
+        if not nome[1:].startswith(" "):
+            total_us += int(acumulado)
+    return total_us / 1e6, modulos
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    resultados = {}
+    for cenario, codigo in CENARIOS.items():
+        medidas = [medir_importacao(codigo) for _ in range(args.repeticoes)]
+        resultados[cenario] = (statistics.median(segundos for segundos, _ in medidas), medidas[-1][1])
+
+    referencia = resultados["referência (import ansioso)"][0]
+    print(f"{'cenário':<30}{'importação':>12}{'módulos':>10}{'vs. ref.':>10}")
+    for cenario, (segundos, modulos) in resultados.items():
+        print(f"{cenario:<30}{segundos * 1000:>9.1f} ms{modulos:>10}{segundos / referencia:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
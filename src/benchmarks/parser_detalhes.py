@@ -0,0 +1,107 @@
+"""Compara a extração lxml/XPath das páginas de detalhes com o laço BeautifulSoup original.
+
+Antes de medir, verifica que as duas implementações produzem o mesmo mapeamento para
+cada fixture. Uso (a partir de src/):
+    python -m benchmarks.parser_detalhes [--repeticoes N]
+"""
+import argparse
+import time
+
+from bs4 import BeautifulSoup
+
+from benchmarks import ler_fixture
+from scraping.parser import extrair_pares_indicadores
+from scraping.scraping import VARIATION_HEADINGS
+
+FIXTURES_DETALHES = ["detalhes_petr4.html", "detalhes_hglg11.html"]
+
+
+def extrair_pares_indicadores_bs4(html_content: str, variation_headings: list) -> dict:
+    """Implementação original (BeautifulSoup, célula a célula), mantida como referência."""
+    soup = BeautifulSoup(html_content, "lxml")
+    tables = soup.find_all("table", attrs={'class': 'w728'})
+
+    financial_data_raw = []
+    for table in tables:
+        table_row = table.find_all("tr")
+        for table_data in table_row:
+            cells_list = table_data.find_all("td")
+            headings = [
+                cell.text.replace("?", "").strip()
+                for cell in cells_list
+                if "?" in cell.text or cell.text in variation_headings
+            ]
+            for header in headings:
+                if headings.count(header) > 1:
+                    new_header_name = header + "_1"
+                    headings[headings.index(header)] = new_header_name
+            values = [
+                cell.text.strip() for cell in cells_list
+                if ("?" not in cell.text) and (cell.text not in headings)
+            ]
+            table_data_dict = {
+                header: value for header, value in zip(headings, values)
+            }
+            if table_data_dict != {}:
+                financial_data_raw.append(table_data_dict)
+
+    return {
+        name: value for dictionary in financial_data_raw
+        for name, value in dictionary.items()
+    }
+
+
+def medir_paginas_por_segundo(funcao, paginas: list, repeticoes: int) -> float:
+    """
+    Mede quantas páginas por segundo uma função de extração processa.
+
+    Parâmetros:
+    funcao (callable): Função de extração (html, variation_headings) -> dict.
+    paginas (list): Conteúdos HTML a processar.
+    repeticoes (int): Número de passagens sobre a lista de páginas.
+
+    Retorna:
+    float: Páginas processadas por segundo.
+    """
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for pagina in paginas:
+            funcao(pagina, VARIATION_HEADINGS)
+    return repeticoes * len(paginas) / (time.perf_counter() - inicio)
+
+
+def verificar_equivalencia(paginas: dict) -> None:
+    """
+    Garante que as duas implementações produzem o mesmo mapeamento para cada fixture.
+
+    Parâmetros:
+    paginas (dict): Nome da fixture -> conteúdo HTML.
+
+    Retorna:
+    None
+    """
+    for nome, pagina in paginas.items():
+        esperado = extrair_pares_indicadores_bs4(pagina, VARIATION_HEADINGS)
+        obtido = extrair_pares_indicadores(pagina, VARIATION_HEADINGS)
+        if obtido != esperado:
+            raise AssertionError(f"Extração divergente para a fixture {nome}")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeticoes", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    paginas = {nome: ler_fixture(nome) for nome in FIXTURES_DETALHES}
+    verificar_equivalencia(paginas)
+    print(f"Equivalência verificada em {len(paginas)} fixtures.")
+
+    lista_paginas = list(paginas.values())
+    pps_bs4 = medir_paginas_por_segundo(extrair_pares_indicadores_bs4, lista_paginas, args.repeticoes)
+    pps_lxml = medir_paginas_por_segundo(extrair_pares_indicadores, lista_paginas, args.repeticoes)
+    print(f"BeautifulSoup: {pps_bs4:10.1f} páginas/s")
+    print(f"lxml/XPath:    {pps_lxml:10.1f} páginas/s ({pps_lxml / pps_bs4:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Mede o relatório paginado em PDF (`CsvParaPdf.create_pdf_paginado`) para tabelas de
+tamanhos crescentes, até --linhas linhas, e verifica que o tempo cresce linearmente.
+
+A tabela é um universo sintético de ações com todas as colunas do dataset renomeado,
+gravado em CSV e lido em blocos. Para cada tamanho são exibidos o tempo, o tempo por linha
+e as páginas geradas; ao final, a razão entre o tempo por linha do maior e do menor tamanho
+(próxima de 1 quando o crescimento é linear). Uso (a partir de src/):
+    python -m benchmarks.pdf_paginado [--linhas 10000] [--passos 4] [--repeticoes 1]
+"""
+import argparse
+import logging
+import os
+import tempfile
+
+from benchmarks.suite import gerar_universo_acoes, medir
+from gerar_pdf import CsvParaPdf
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=10000)
+    parser.add_argument("--passos", type=int, default=4, help="número de tamanhos, dobrando até --linhas")
+    parser.add_argument("--repeticoes", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)
+    universo = gerar_universo_acoes(args.linhas)
+    tamanhos = sorted({max(1, args.linhas >> passo) for passo in range(args.passos)})
+    print(f"Universo: {args.linhas} linhas x {len(universo.columns)} colunas")
+
+    por_linha = {}
+    with tempfile.TemporaryDirectory() as diretorio:
+        for tamanho in tamanhos:
+            caminho_csv = os.path.join(diretorio, f"universo_{tamanho}.csv")
+            caminho_pdf = os.path.join(diretorio, f"universo_{tamanho}.pdf")
+            universo.head(tamanho).to_csv(caminho_csv, index=False)
+            segundos = medir(lambda: CsvParaPdf.create_pdf_paginado(caminho_csv, caminho_pdf, "Benchmark"),
+                             args.repeticoes)
+            por_linha[tamanho] = segundos / tamanho
+            print(f"{tamanho:>8} linhas {segundos * 1000:10.1f} ms {por_linha[tamanho] * 1e6:8.1f} µs/linha "
+                  f"{os.path.getsize(caminho_pdf) / 1e6:8.2f} MB")
+
+    print(f"Tempo por linha ({tamanhos[-1]} / {tamanhos[0]} linhas): "
+          f"{por_linha[tamanhos[-1]] / por_linha[tamanhos[0]]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
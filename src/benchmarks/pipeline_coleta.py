@@ -0,0 +1,100 @@
+"""Mede o PipelineColeta (threads de download + processos de parsing) sobre fixtures HTML.
+
+Os downloads são simulados com as fixtures de páginas de detalhes e uma latência fixa por
+página; o benchmark varia o número de processos de parsing de 0 (parsing na thread
+consumidora) até o número de núcleos e verifica que todas as configurações produzem os
+mesmos registros. Uso (a partir de src/):
+    python -m benchmarks.pipeline_coleta [--paginas N] [--latencia-ms MS] [--workers-io N]
+"""
+import argparse
+import os
+import time
+
+from benchmarks import ler_fixture
+from scraping.parser import extrair_pares_indicadores
+from scraping.pipeline import PipelineColeta
+from scraping.scraping import VARIATION_HEADINGS
+
+FIXTURES_DETALHES = ["detalhes_petr4.html", "detalhes_hglg11.html"]
+
+
+def criar_download_simulado(num_paginas: int, latencia: float):
+    """
+    Cria uma função de download que devolve as fixtures após uma espera fixa.
+
+    Parâmetros:
+    num_paginas (int): Número de tickers simulados.
+    latencia (float): Espera, em segundos, de cada download.
+
+    Retorna:
+    tuple: (tickers, baixar), com a lista de tickers e a função ticker -> HTML.
+    """
+    paginas = [ler_fixture(nome) for nome in FIXTURES_DETALHES]
+    tickers = [f"PAPEL{i:05d}" for i in range(num_paginas)]
+    pagina_por_ticker = {ticker: paginas[i % len(paginas)] for i, ticker in enumerate(tickers)}
+
+    def baixar(ticker: str) -> str:
+        time.sleep(latencia)
+        return pagina_por_ticker[ticker]
+
+    return tickers, baixar
+
+
+def medir(tickers: list, baixar, processos: int, workers_io: int, tamanho_fila: int, tamanho_lote: int) -> tuple:
+    """
+    Executa o pipeline uma vez e mede a vazão.
+
+    Parâmetros:
+    tickers (list): Tickers a coletar.
+    baixar (callable): Função de download simulada.
+    processos (int): Número de processos de parsing.
+    workers_io (int): Número de threads de download.
+    tamanho_fila (int): Capacidade da fila de páginas.
+    tamanho_lote (int): Páginas por lote de parsing.
+
+    Retorna:
+    tuple: (páginas por segundo, mapeamento ticker -> indicadores).
+    """
+    with PipelineColeta(baixar, VARIATION_HEADINGS, workers_io=workers_io, processos=processos,
+                        tamanho_fila=tamanho_fila, tamanho_lote=tamanho_lote) as pipeline:
+        # Aquece o pool de processos fora da medição
+        list(pipeline.executar(tickers[:1]))
+        inicio = time.perf_counter()
+        resultados = {}
+        for ticker, financial_data, erro in pipeline.executar(tickers):
+            if erro is not None:
+                raise erro
+            resultados[ticker] = financial_data
+        duracao = time.perf_counter() - inicio
+    return len(tickers) / duracao, resultados
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--paginas", type=int, default=2000)
+    parser.add_argument("--latencia-ms", type=float, default=5.0)
+    parser.add_argument("--workers-io", type=int, default=16)
+    parser.add_argument("--tamanho-fila", type=int, default=64)
+    parser.add_argument("--tamanho-lote", type=int, default=4)
+    parser.add_argument("--max-processos", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    tickers, baixar = criar_download_simulado(args.paginas, args.latencia_ms / 1000)
+    esperado = {ticker: extrair_pares_indicadores(baixar(ticker), VARIATION_HEADINGS) for ticker in tickers[:2]}
+
+    print(f"{args.paginas} páginas, latência {args.latencia_ms:.1f} ms, {args.workers_io} threads de download, "
+          f"{os.cpu_count()} núcleos")
+    referencia = None
+    for processos in range(0, args.max_processos + 1):
+        pps, resultados = medir(tickers, baixar, processos, args.workers_io, args.tamanho_fila, args.tamanho_lote)
+        if len(resultados) != len(tickers) or any(resultados[t] != v for t, v in esperado.items()):
+            raise AssertionError(f"Resultado divergente com {processos} processos de parsing")
+        if referencia is None:
+            referencia = resultados
+        elif resultados != referencia:
+            raise AssertionError(f"Resultado divergente com {processos} processos de parsing")
+        print(f"processos={processos:2d}: {pps:10.1f} páginas/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""Suíte de benchmarks offline das etapas do pipeline, com comparação contra um baseline.
+
+Mede, a partir das fixtures HTML gravadas e de universos sintéticos de tamanho
+configurável:
+    - coleta_detalhes: `Scraping.coleta_indicadores_de_ativos` (download simulado, parsing,
+      acumulação e conversão de tipos) sobre as páginas de detalhes;
+    - coleta_listagem: `Scraping.coleta_indicadores_da_listagem` sobre a página de listagem;
+    - limpeza_<N>: `Utils.limpar_e_converter_colunas` sobre N linhas;
+    - modelos_<N>: `MotorTriagem` (tratamento + Graham, Magic Formula e Bazin) sobre N linhas;
+    - pdf_<N>: `CsvParaPdf.create_pdf_from_csv` sobre uma tabela de até --max-linhas-pdf linhas;
+    - backtest_<D>x<N>: `Backtest` (montagem das matrizes e execução mensal dos três modelos)
+      sobre D snapshots diários de N papéis.
+
+Cada etapa é executada --repeticoes vezes e o menor tempo é registrado em JSON. Com um
+baseline salvo, as etapas mais lentas que o baseline além da tolerância são listadas e o
+processo termina com código 1. Uso (a partir de src/):
+    python -m benchmarks.suite [--tamanhos 1000 10000 100000] [--salvar-baseline]
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import requests
+
+from benchmarks import ler_fixture
+from backtest import Backtest
+from benchmarks.conversao_numerica import gerar_universo
+from gerar_pdf import CsvParaPdf
+from modelos import MotorTriagem
+from scraping import Scraping
+from util import Utils
+
+DIRETORIO_RESULTADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados")
+BASELINE_PADRAO = os.path.join(DIRETORIO_RESULTADOS, "baseline.json")
+SAIDA_PADRAO = os.path.join(DIRETORIO_RESULTADOS, "ultima_execucao.json")
+
+URL_DETALHES_FIXTURE = "http://fixtures/detalhes.php?papel="
+URL_LISTAGEM_FIXTURE = "http://fixtures/resultado.php"
+
+
+class SessaoFixtures:
+    """
+    Sessão HTTP offline, com a interface de `SessaoHttp`, que responde com as fixtures
+    gravadas: as páginas de detalhes alternam entre as fixtures de ação e de FII.
+    """
+
+    limitador = None
+
+    def __init__(self) -> None:
+        self.paginas_detalhes = [ler_fixture("detalhes_petr4.html"), ler_fixture("detalhes_hglg11.html")]
+        self.listagem = ler_fixture("resultado_acoes.html")
+
+    def get(self, url: str, headers=None, **kwargs) -> requests.Response:
+        if url.startswith(URL_DETALHES_FIXTURE):
+            ticker = url[len(URL_DETALHES_FIXTURE):]
+            conteudo = self.paginas_detalhes[sum(map(ord, ticker)) % len(self.paginas_detalhes)]
+        else:
+            conteudo = self.listagem
+        resposta = requests.Response()
+        resposta.status_code = 200
+        resposta.encoding = "utf-8"
+        resposta._content = conteudo.encode("utf-8")
+        resposta.url = url
+        return resposta
+
+
+def gerar_universo_acoes(linhas: int, semente: int = 42) -> pd.DataFrame:
+    """
+    Gera um dataset de ações sintético, com as colunas renomeadas e os valores em texto no
+    formato extraído do Fundamentus.
+
+    Parâmetros:
+    linhas (int): Número de papéis do universo.
+    semente (int): Semente do gerador aleatório.
+
+    Retorna:
+    pandas.DataFrame: Universo sintético pronto para o `MotorTriagem`.
+    """
+    df = gerar_universo(linhas, semente=semente)
+    # Múltiplos e liquidez com distribuições próximas das reais, para que os filtros selecionem papéis
+    rng = np.random.default_rng(semente + 1)
+    tabela = str.maketrans({",": ".", ".": ","})
+    realistas = {
+        "vlr_cot": rng.lognormal(3, 1, linhas),
+        "vlr_ind_p_sobre_l": rng.normal(12, 15, linhas),
+        "vlr_ind_p_sobre_vp": rng.lognormal(0.3, 0.6, linhas),
+        "vlr_ind_p_sobre_ebit": rng.normal(8, 10, linhas),
+        "vlr_ind_ev_sobre_ebit": rng.normal(9, 10, linhas),
+        "vlr_ind_roic": rng.normal(10, 12, linhas),
+        "vlr_ind_divida_bruta_sobre_patrim": rng.lognormal(-0.5, 0.8, linhas),
+        "vol_med_neg_2m": rng.lognormal(14, 3, linhas),
+    }
+    for coluna, valores in realistas.items():
+        df[coluna] = [f"{valor:,.2f}".translate(tabela) for valor in valores]
+    df["vlr_ind_div_yield"] = [f"{valor:,.1f}%".translate(tabela) for valor in rng.gamma(2, 3, linhas)]
+    df.insert(0, "nome_papel", [f"SINT{i}" for i in range(linhas)])
+    df["dt_ult_cot"] = datetime.now().strftime("%d/%m/%Y")
+    return Utils.renomear_colunas(df, "acoes")
+
+
+def gerar_painel_acoes(dias: int, papeis: int, semente: int = 42) -> pd.DataFrame:
+    """
+    Gera snapshots diários sintéticos e já tratados de um universo de ações: as cotações seguem
+    um passeio aleatório e os múltiplos variam a cada dia.
+
+    Parâmetros:
+    dias (int): Número de snapshots (dias úteis).
+    papeis (int): Número de papéis do universo.
+    semente (int): Semente do gerador aleatório.
+
+    Retorna:
+    pandas.DataFrame: Painel no formato longo, com a coluna `dt_snapshot`.
+    """
+    universo = gerar_universo_acoes(papeis, semente)
+    colunas = ["Cotação", "P/L", "P/VP", "Vol $ méd (2m)", "Div. Yield", "EV / EBIT", "ROIC", "P/EBIT",
+               "Div Br/ Patrim"]
+    universo = MotorTriagem.preparar(universo[["Papel"] + colunas], colunas)
+
+    rng = np.random.default_rng(semente + 2)
+    painel = pd.DataFrame({
+        "dt_snapshot": np.repeat(pd.bdate_range("2020-01-01", periods=dias), papeis),
+        "Papel": np.tile(universo["Papel"].to_numpy(), dias),
+    })
+    variacao = np.exp(np.cumsum(rng.normal(0, 0.02, (dias, papeis)), axis=0))
+    painel["Cotação"] = (universo["Cotação"].to_numpy() * variacao).ravel()
+    for coluna in colunas[1:]:
+        ruido = 1 + rng.normal(0, 0.05, (dias, papeis))
+        painel[coluna] = (universo[coluna].to_numpy() * ruido).ravel()
+    return painel
+
+
+def medir(funcao, repeticoes: int) -> float:
+    """
+    Executa a função repetidas vezes e retorna o menor tempo.
+
+    Parâmetros:
+    funcao (callable): Função sem argumentos a medir.
+    repeticoes (int): Número de execuções.
+
+    Retorna:
+    float: Menor tempo de execução, em segundos.
+    """
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def executar_suite(tamanhos: list, paginas: int, max_linhas_pdf: int, repeticoes: int,
+                   dimensoes_backtest: tuple = (750, 500)) -> dict:
+    """
+    Executa todas as etapas da suíte.
+
+    Parâmetros:
+    tamanhos (list): Números de linhas dos universos sintéticos.
+    paginas (int): Número de páginas de detalhes da etapa de coleta.
+    max_linhas_pdf (int): Número máximo de linhas das tabelas renderizadas em PDF.
+    repeticoes (int): Número de execuções de cada etapa.
+    dimensoes_backtest (tuple): Número de snapshots diários e de papéis do backtest.
+
+    Retorna:
+    dict: Resultado de cada etapa (segundos, linhas e linhas por segundo).
+    """
+    estagios = {}
+
+    def registrar(nome: str, segundos: float, linhas: int) -> None:
+        estagios[nome] = {"segundos": round(segundos, 6), "linhas": linhas,
+                          "linhas_por_segundo": round(linhas / segundos, 1) if segundos > 0 else None}
+        print(f"{nome:<24} {segundos * 1000:12.1f} ms {linhas:>10} linhas")
+
+    scraping = Scraping(sessao=SessaoFixtures(), url_kpis_ticker=URL_DETALHES_FIXTURE,
+                        url_tickers_acoes=URL_LISTAGEM_FIXTURE)
+    tickers = [f"SINT{i}" for i in range(paginas)]
+    registrar("coleta_detalhes", medir(lambda: scraping.coleta_indicadores_de_ativos(
+        tickers, parse_dtypes=True, rodadas_retentativa=0), repeticoes), paginas)
+    linhas_listagem = len(scraping.coleta_indicadores_da_listagem("acoes"))
+    registrar("coleta_listagem", medir(lambda: scraping.coleta_indicadores_da_listagem("acoes"), repeticoes),
+              linhas_listagem)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        for tamanho in tamanhos:
+            universo = gerar_universo_acoes(tamanho)
+            colunas_numericas = [col for col in universo.columns if col not in ("Papel", "Data últ cot")]
+            registrar(f"limpeza_{tamanho}", medir(
+                lambda: Utils.limpar_e_converter_colunas(universo.copy(), colunas_numericas), repeticoes), tamanho)
+            registrar(f"modelos_{tamanho}", medir(
+                lambda: MotorTriagem(universo).executar(paralelo=False), repeticoes), tamanho)
+
+            linhas_pdf = min(tamanho, max_linhas_pdf)
+            tabela_pdf = universo.head(linhas_pdf)[["Papel", "Cotação", "P/L", "Div. Yield"]]
+            caminho_csv = os.path.join(diretorio, f"recomendacao_sintetica_{tamanho}.csv")
+            tabela_pdf.to_csv(caminho_csv, index=False)
+            registrar(f"pdf_{tamanho}", medir(
+                lambda: CsvParaPdf.create_pdf_from_csv(caminho_csv, diretorio, "Benchmark"), repeticoes), linhas_pdf)
+
+    dias, papeis = dimensoes_backtest
+    painel = gerar_painel_acoes(dias, papeis)
+    registrar(f"backtest_{dias}x{papeis}", medir(
+        lambda: Backtest(painel).executar(frequencia="mensal"), repeticoes), len(painel))
+    return estagios
+
+
+def comparar_com_baseline(estagios: dict, baseline: dict, tolerancia: float) -> list:
+    """
+    Compara os tempos com o baseline.
+
+    Parâmetros:
+    estagios (dict): Resultado da execução atual.
+    baseline (dict): Resultado salvo como referência.
+    tolerancia (float): Aumento relativo de tempo aceito (ex.: 0.25 = 25% mais lento).
+
+    Retorna:
+    list: Regressões, como tuplas (etapa, segundos no baseline, segundos atuais, razão).
+    """
+    regressoes = []
+    print(f"\n{'etapa':<24} {'baseline':>12} {'atual':>12} {'razão':>8}")
+    for nome, atual in estagios.items():
+        referencia = baseline.get("estagios", {}).get(nome)
+        if referencia is None:
+            print(f"{nome:<24} {'-':>12} {atual['segundos'] * 1000:10.1f}ms {'novo':>8}")
+            continue
+        razao = atual["segundos"] / referencia["segundos"] if referencia["segundos"] > 0 else float("inf")
+        marcador = "  <-- REGRESSÃO" if razao > 1 + tolerancia else ""
+        print(f"{nome:<24} {referencia['segundos'] * 1000:10.1f}ms {atual['segundos'] * 1000:10.1f}ms "
+              f"{razao:8.2f}{marcador}")
+        if marcador:
+            regressoes.append((nome, referencia["segundos"], atual["segundos"], razao))
+    return regressoes
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--paginas", type=int, default=200)
+    parser.add_argument("--max-linhas-pdf", type=int, default=2000)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--backtest", type=int, nargs=2, default=[750, 500], metavar=("DIAS", "PAPEIS"))
+    parser.add_argument("--saida", default=SAIDA_PADRAO)
+    parser.add_argument("--baseline", default=BASELINE_PADRAO)
+    parser.add_argument("--tolerancia", type=float, default=0.25)
+    parser.add_argument("--salvar-baseline", action="store_true",
+                        help="grava o resultado como novo baseline, sem comparar")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)
+    estagios = executar_suite(args.tamanhos, args.paginas, args.max_linhas_pdf, args.repeticoes,
+                              tuple(args.backtest))
+    resultado = {
+        "metadados": {
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "processador": platform.processor() or platform.machine(),
+            "nucleos": os.cpu_count(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "repeticoes": args.repeticoes,
+        },
+        "estagios": estagios,
+    }
+
+    destino = args.baseline if args.salvar_baseline else args.saida
+    os.makedirs(os.path.dirname(os.path.abspath(destino)), exist_ok=True)
+    with open(destino, "w", encoding="utf-8") as arquivo:
+        json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+    print(f"\nResultados gravados em {destino}")
+    if args.salvar_baseline:
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"Baseline {args.baseline} não encontrado; use --salvar-baseline para criá-lo.")
+        return
+    with open(args.baseline, encoding="utf-8") as arquivo:
+        baseline = json.load(arquivo)
+    regressoes = comparar_com_baseline(estagios, baseline, args.tolerancia)
+    if regressoes:
+        print(f"\n{len(regressoes)} etapa(s) mais lenta(s) que o baseline além de {args.tolerancia:.0%}: "
+              f"{', '.join(nome for nome, *_ in regressoes)}")
+        sys.exit(1)
+    print("\nNenhuma regressão em relação ao baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+# Caracteres descartados antes da conversão: porcentagem, espaços (inclusive &nbsp;) e separador de milhar
+_CARACTERES_DESCARTAVEIS = ("%", " ", "\xa0", ".")
+
+
+def _converter_textos(valores: np.ndarray) -> np.ndarray:
+    """
+    Converte um array de textos no formato brasileiro para float64 em lote.
+
+    Todos os valores são unidos em um único texto, limpos com substituições sobre esse
+    texto e lidos de uma vez pelo leitor C do pandas. Valores não textuais (números em
+    colunas mistas) são mantidos; textos não numéricos resultam em NaN.
+
+    Parâmetros:
+    valores (numpy.ndarray): Array de objetos com os valores a converter.
+
+    Retorna:
+    numpy.ndarray: Valores convertidos.
+    """
+    nulos = pd.isna(valores)
+    if pd.api.types.infer_dtype(valores, skipna=True) in ("string", "empty"):
+        eh_texto = ~nulos
+    else:
+        eh_texto = np.fromiter((isinstance(valor, str) for valor in valores), dtype=bool, count=len(valores))
+    textos = np.where(eh_texto, valores, "")
+
+    texto = "\n".join(textos.tolist())
+    for caractere in _CARACTERES_DESCARTAVEIS:
+        texto = texto.replace(caractere, "")
+    texto = texto.replace(",", ".")
+
+    convertidos = None
+    if '"' not in texto and "\r" not in texto:
+        coluna = pd.read_csv(io.StringIO(texto), header=None, names=["valor"], na_values=["-", ""],
+                             keep_default_na=False, skip_blank_lines=False)["valor"]
+        if len(coluna) == len(valores):
+            convertidos = pd.to_numeric(coluna, errors="coerce").to_numpy(dtype="float64")
+
+    if convertidos is None:
+        # Textos com aspas ou quebras de linha: conversão valor a valor
+        limpos = pd.Series(textos, dtype=object).str.replace(r"[%\s.]", "", regex=True).str.replace(",", ".")
+        convertidos = pd.to_numeric(limpos, errors="coerce").to_numpy(dtype="float64")
+
+    outros = ~eh_texto & ~nulos
+    if outros.any():
+        convertidos[outros] = pd.to_numeric(pd.Series(valores[outros]), errors="coerce")
+    return convertidos
+
+
+def converter_numeros_br(serie: pd.Series, fracao: bool = False) -> pd.Series:
+    """
+    Converte uma coluna de números no formato brasileiro ("1.234,56", "-6,5%") para float.
+
+    Pontos de milhar são removidos, a vírgula decimal vira ponto e o símbolo '%' é
+    descartado. Valores nulos, vazios, "-" ou não numéricos resultam em NaN. Colunas que
+    já são numéricas são apenas convertidas para float.
+
+    Parâmetros:
+    serie (pandas.Series): Coluna a ser convertida.
+    fracao (bool): Se verdadeiro, divide o resultado por 100 (porcentagem -> fração decimal).
+
+    Retorna:
+    pandas.Series: Coluna convertida para float64.
+    """
+    if pd.api.types.is_numeric_dtype(serie):
+        valores = serie.to_numpy(dtype="float64")
+    else:
+        valores = _converter_textos(serie.to_numpy(dtype=object))
+
+    if fracao:
+        valores = valores / 100
+    return pd.Series(valores, index=serie.index, name=serie.name)
+
+
+def converter_colunas_br(df: pd.DataFrame, colunas: list, fracao: bool = False) -> pd.DataFrame:
+    """
+    Converte as colunas informadas que existirem no DataFrame, como `converter_numeros_br`.
+
+    As colunas de texto são convertidas juntas, em uma única leitura, o que dilui o custo
+    fixo da conversão em DataFrames com muitas colunas.
+
+    Parâmetros:
+    df (pandas.DataFrame): DataFrame com os dados.
+    colunas (list): Colunas a serem convertidas.
+    fracao (bool): Se verdadeiro, divide os resultados por 100.
+
+    Retorna:
+    pandas.DataFrame: O mesmo DataFrame, com as colunas convertidas.
+    """
+    colunas = [coluna for coluna in dict.fromkeys(colunas) if coluna in df.columns]
+    colunas_texto = [coluna for coluna in colunas if not pd.api.types.is_numeric_dtype(df[coluna])]
+
+    convertidas = {}
+    if colunas_texto and len(df):
+        valores = np.concatenate([df[coluna].to_numpy(dtype=object) for coluna in colunas_texto])
+        blocos = np.split(_converter_textos(valores), len(colunas_texto))
+        convertidas.update(zip(colunas_texto, blocos))
+
+    for coluna in colunas:
+        valores = convertidas.get(coluna)
+        if valores is None:
+            valores = df[coluna].to_numpy(dtype="float64")
+        df[coluna] = valores / 100 if fracao else valores
+    return df
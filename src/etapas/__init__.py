@@ -0,0 +1,54 @@
+"""Etapas do pipeline executadas pela linha de comando (main.py).
+
+Cada etapa fica em um módulo próprio, que importa apenas as suas dependências:
+    - coleta: scraping, consolidação, histórico e filtro dos papéis ativos;
+    - triagem: modelos de triagem sobre o dataset tratado e renomeado;
+    - relatorio: PDFs das recomendações e, opcionalmente, do universo triado.
+O main.py importa o módulo de uma etapa apenas quando ela é executada, e este pacote não
+importa nenhuma dependência pesada (pandas, numpy, requests, fpdf).
+"""
+import os
+from datetime import datetime
+
+# Nome do dataset tratado e renomeado gravado pela coleta e lido pelas demais etapas
+PREFIXO_RENOMEADOS = "{tipo}_consolidados_tratados_renomeados_"
+
+
+class Contexto:
+    """
+    Configuração de uma execução do pipeline, compartilhada pelas etapas.
+
+    Atributos:
+    opcoes (argparse.Namespace): Opções da linha de comando.
+    tipo (str): Tipo de papel ('acoes' ou 'fiis').
+    data (str): Data dos arquivos no formato dd_mm_yyyy (por padrão, a data atual).
+    metricas (Metricas): Coletor de métricas compartilhado pelas etapas.
+    d_base, d_execucoes, d_extraidos, d_processados, dfinal, d_historico, d_metricas (str): Diretórios
+        de dados.
+    """
+
+    def __init__(self, opcoes, metricas) -> None:
+        """
+        Monta a configuração a partir das opções da linha de comando.
+
+        Parâmetros:
+        opcoes (argparse.Namespace): Opções da linha de comando.
+        metricas (Metricas): Coletor de métricas da execução.
+        """
+        self.opcoes = opcoes
+        self.tipo = opcoes.tipo
+        self.data = getattr(opcoes, "data", None) or datetime.now().strftime("%d_%m_%Y")
+        self.metricas = metricas
+
+        self.d_base = os.path.join(opcoes.diretorio, "")
+        self.d_execucoes = f"{self.d_base}00_execucoes/"
+        self.d_extraidos = f"{self.d_base}01_extraidos/"
+        self.d_processados = f"{self.d_base}02_processados/"
+        self.dfinal = f"{self.d_base}03_final/"
+        self.d_historico = f"{self.d_base}04_historico/"
+        self.d_metricas = f"{self.d_base}05_metricas/"
+
+    @property
+    def caminho_renomeados(self) -> str:
+        """Caminho (sem extensão) do dataset tratado e renomeado da data da execução."""
+        return f"{self.d_processados}{PREFIXO_RENOMEADOS.format(tipo=self.tipo)}{self.data}"
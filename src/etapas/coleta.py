@@ -0,0 +1,107 @@
+import logging
+from datetime import datetime
+
+import pandas as pd
+
+from armazenamento import ler_tabela
+from historico import HistoricoSnapshots
+from scraping import CacheHttp, LimitadorTaxa, Scraping
+from util import Utils
+from . import PREFIXO_RENOMEADOS, Contexto
+
+
+def executar(contexto: Contexto) -> pd.DataFrame:
+    """
+    Coleta os indicadores do tipo de papel, grava o consolidado (e o histórico) e filtra os
+    papéis ativos, gravando o dataset tratado e o renomeado em `02_processados`.
+
+    Parâmetros:
+    contexto (Contexto): Configuração da execução.
+
+    Retorna:
+    pandas.DataFrame: Dataset tratado e com as colunas renomeadas, usado pela triagem.
+    """
+    opcoes, metricas, tipo_papel = contexto.opcoes, contexto.metricas, contexto.tipo
+    d_base, d_extraidos, d_processados = contexto.d_base, contexto.d_extraidos, contexto.d_processados
+    mes_atual = datetime.now().month
+    ano_atual = datetime.now().year
+    id_execucao = None if opcoes.sem_retomada else f"{tipo_papel}_{contexto.data}"
+
+    cache = CacheHttp(diretorio=f"{d_base}00_cache/", modo_offline=opcoes.offline) if not opcoes.sem_cache else None
+    limitador = LimitadorTaxa(opcoes.requisicoes_por_segundo, rajada=opcoes.rajada) \
+        if opcoes.requisicoes_por_segundo else None
+    # O diário da retomada fica no diretório de dados da execução, como o cache e os resultados
+    scraping = Scraping(cache=cache, limitador=limitador, formato_armazenamento=opcoes.formato, metricas=metricas,
+                        diretorio_execucoes=contexto.d_execucoes)
+
+    if not (opcoes.somente_listagem or opcoes.incremental) and not opcoes.sem_fluxo:
+        lista_papeis = scraping.retornar_lista_papeis(tipo=tipo_papel, diretorio=d_extraidos,
+                                                      nome_do_arquivo=f'lista_de_{tipo_papel}_')
+
+        # Filtrando durante a coleta apenas os registros com cotação no mês, para trabalhar apenas com as ações ATIVAS
+        dados_processados, dados_filtrados = scraping.gravar_coleta_em_fluxo(
+            lista_papeis, tipo_papel, diretorio=d_processados, nome_do_arquivo=f'{tipo_papel}_consolidados_',
+            filtro=Utils.filtro_cotados_no_mes(mes_atual, ano_atual), max_concorrencia=opcoes.max_concorrencia,
+            id_execucao=id_execucao, processos_parse=opcoes.processos_parse)
+        dados_filtrados['dt_ult_cot'] = pd.to_datetime(dados_filtrados['dt_ult_cot'], format='%d/%m/%Y',
+                                                       errors='coerce')
+        if len(scraping.falhas):
+            # Papéis descartados após as retentativas, com o motivo de cada falha
+            scraping.salvar_dataframe_como_csv(scraping.falhas.como_dataframe(), tipo_papel,
+                                               diretorio=d_processados, nome_do_arquivo=f'{tipo_papel}_falhas_')
+        if not opcoes.sem_historico:
+            with metricas.etapa("historico"):
+                HistoricoSnapshots(tipo_papel, diretorio=contexto.d_historico,
+                                   formato=opcoes.formato).gravar_arquivo(dados_processados)
+    else:
+        if opcoes.somente_listagem:
+            dados_papeis = scraping.coleta_indicadores_da_listagem(tipo_papel)
+        elif opcoes.incremental:
+            dados_papeis = scraping.coleta_indicadores_incremental(tipo_papel,
+                                                                   caminho_base=f"{d_base}00_base/fundamentos_{tipo_papel}",
+                                                                   max_idade_dias=opcoes.max_idade_fundamentos,
+                                                                   max_concorrencia=opcoes.max_concorrencia,
+                                                                   id_execucao=id_execucao)
+        else:
+            lista_papeis = scraping.retornar_lista_papeis(tipo=tipo_papel, diretorio=d_extraidos,
+                                                          nome_do_arquivo=f'lista_de_{tipo_papel}_')
+            dados_papeis = scraping.coleta_indicadores_de_ativos(lista_papeis, max_concorrencia=opcoes.max_concorrencia,
+                                                                 id_execucao=id_execucao,
+                                                                 processos_parse=opcoes.processos_parse)
+
+        dados_processados = scraping.salvar_dataframe_como_csv(dados_papeis, tipo_papel,
+                                                               diretorio=d_processados,
+                                                               nome_do_arquivo=f'{tipo_papel}_consolidados_')
+        if len(scraping.falhas):
+            # Papéis descartados após as retentativas, com o motivo de cada falha
+            scraping.salvar_dataframe_como_csv(scraping.falhas.como_dataframe(), tipo_papel,
+                                               diretorio=d_processados, nome_do_arquivo=f'{tipo_papel}_falhas_')
+        if not opcoes.sem_historico:
+            with metricas.etapa("historico", len(dados_papeis)):
+                HistoricoSnapshots(tipo_papel, diretorio=contexto.d_historico,
+                                   formato=opcoes.formato).gravar(dados_papeis)
+
+        # Filtrando apenas os registros que a data de cotação está atualizada, para trabalhar apenas com as ações ATIVAS
+        with metricas.etapa("filtro", len(dados_papeis)) as etapa:
+            dados_filtrados = ler_tabela(dados_processados)
+            if opcoes.somente_listagem:
+                # A listagem não traz a data da última cotação; considera ativos os papéis com liquidez
+                dados_filtrados = dados_filtrados[dados_filtrados['vol_med_neg_2m'] > 0]
+            else:
+                dados_filtrados['dt_ult_cot'] = pd.to_datetime(dados_filtrados['dt_ult_cot'], format='%d/%m/%Y',
+                                                               errors='coerce')
+                dados_filtrados = dados_filtrados.dropna(subset=['dt_ult_cot'])
+
+                dados_filtrados = dados_filtrados[(dados_filtrados['dt_ult_cot'].dt.month == mes_atual) &
+                                                  (dados_filtrados['dt_ult_cot'].dt.year == ano_atual)]
+            etapa.linhas_saida = len(dados_filtrados)
+
+    scraping.salvar_dataframe_como_csv(dados_filtrados, tipo_papel, diretorio=d_processados,
+                                       nome_do_arquivo=f'{tipo_papel}_consolidados_tratados_')
+
+    dados_filtrados_renomeado = Utils.renomear_colunas(dados_filtrados, tipo_papel)
+
+    scraping.salvar_dataframe_como_csv(dados_filtrados_renomeado, tipo_papel, diretorio=d_processados,
+                                       nome_do_arquivo=PREFIXO_RENOMEADOS.format(tipo=tipo_papel))
+    logging.info(f"Coleta dos dados de {tipo_papel} finalizada!")
+    return dados_filtrados_renomeado
@@ -0,0 +1,39 @@
+import logging
+from typing import Optional
+
+from gerar_pdf import CsvParaPdf
+from . import Contexto
+
+# Títulos do apêndice com o universo triado de cada tipo de papel
+TITULOS_UNIVERSO = {
+    "acoes": "Universo de Ações Triadas",
+    "fiis": "Universo de FIIs Triados",
+}
+
+
+def executar(contexto: Contexto, dados: Optional["pandas.DataFrame"] = None) -> list:
+    """
+    Gera os PDFs das recomendações novas ou alteradas e, se solicitado, o apêndice com o
+    universo triado em uma tabela paginada.
+
+    Parâmetros:
+    contexto (Contexto): Configuração da execução.
+    dados (pandas.DataFrame): Dataset tratado e renomeado usado no apêndice; por padrão, o
+        gravado pela coleta na data da execução.
+
+    Retorna:
+    list: Caminhos dos PDFs gerados.
+    """
+    opcoes = contexto.opcoes
+    gerador_pdf = CsvParaPdf(metricas=contexto.metricas, d_base=contexto.d_base)
+    gerados = gerador_pdf.gerar_pdf_de_csv(processos=opcoes.processos_pdf, forcar=opcoes.forcar)
+
+    if opcoes.pdf_universo:
+        if dados is None:
+            # Importado aqui: sem o apêndice, o subcomando `report` não carrega o pandas
+            from armazenamento import ler_tabela
+            dados = ler_tabela(contexto.caminho_renomeados)
+        gerados.append(gerador_pdf.gerar_pdf_paginado(dados, f"universo_{contexto.tipo}_",
+                                                      TITULOS_UNIVERSO[contexto.tipo], data=contexto.data))
+    logging.info(f"Relatórios dos dados de {contexto.tipo} finalizados!")
+    return gerados
@@ -0,0 +1,38 @@
+import logging
+from typing import Optional
+
+import pandas as pd
+
+from modelos import MotorTriagem
+from . import Contexto
+
+
+def executar(contexto: Contexto, dados: Optional[pd.DataFrame] = None) -> dict:
+    """
+    Executa os modelos de triagem e grava as carteiras em `03_final/csv`.
+
+    Parâmetros:
+    contexto (Contexto): Configuração da execução.
+    dados (pandas.DataFrame): Dataset tratado e renomeado; por padrão, o gravado pela coleta na
+        data da execução.
+
+    Retorna:
+    dict: Carteira de cada modelo (nome -> DataFrame); vazio para FIIs, que não têm modelos.
+    """
+    if contexto.tipo != "acoes":
+        logging.info(f"Não há modelos de triagem para {contexto.tipo}.")
+        return {}
+
+    # Os modelos compartilham o dataset já carregado e tratado uma única vez
+    motor = MotorTriagem(contexto.caminho_renomeados if dados is None else dados, metricas=contexto.metricas)
+    carteiras = motor.executar()
+    motor.salvar(carteiras, diretorio=f"{contexto.dfinal}csv/", data=contexto.data)
+
+    coluna_setor = contexto.opcoes.por_setor
+    if coluna_setor:
+        # Carteiras de todos os setores em uma única passagem por modelo
+        carteiras_setor = motor.executar_por_grupo(coluna_setor)
+        motor.salvar({f"{nome}_por_{coluna_setor.lower()}": carteira for nome, carteira in carteiras_setor.items()},
+                     diretorio=f"{contexto.dfinal}csv/", data=contexto.data)
+    logging.info(f"Triagem dos dados de {contexto.tipo} finalizada!")
+    return carteiras
@@ -1,45 +1,226 @@
+import csv
+import functools
+import itertools
 import os
 import logging
-import pandas as pd
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional, Union
+
 from fpdf import FPDF
 from datetime import datetime
+from metricas import Metricas
 from util import Utils
 
+# Títulos dos relatórios por modelo (o nome do CSV é recomendacao_<modelo>[_por_<grupo>]_<dd_mm_yyyy>.csv)
+TITULOS = {
+    "magic_form": "As Melhores Ações\nCom Melhor Custo/Benefício.\nSegundo: MétodoMagic Formula",
+    "ben_grahan": "As Melhores Ações\nCom Melhor Custo/Benefício.\nSegundo: Benjamin Graham",
+    "decio_bazin": "As Melhores Ações\nCom Melhor Custo/Benefício.\nSegundo: Método Décio Bazin",
+}
+
+_PADRAO_RECOMENDACAO = re.compile(r"^recomendacao_(?P<modelo>.+?)(?:_por_(?P<grupo>\w+?))?_\d{2}_\d{2}_\d{4}\.csv$")
+
+# Layout da tabela: largura e altura das células (mm) e estilo da fonte de cada coluna
+LARGURA_CELULA = 40
+ALTURA_CELULA = 10
+ESTILO_PRIMEIRA_COLUNA = "B"
+ESTILO_DEMAIS_COLUNAS = ""
+
+# Layout da tabela paginada (apêndice com o universo completo): fonte (pt), altura das linhas,
+# espaçamento interno e largura mínima das colunas (mm)
+FONTE_TABELA_PAGINADA = 7
+ALTURA_LINHA_PAGINADA = 5
+ESPACAMENTO_CELULA = 1.5
+LARGURA_MINIMA_COLUNA = 8
+MARGEM_LATERAL = 10
+
+# Linhas lidas por bloco e linhas da amostra usada para calcular as larguras das colunas
+LINHAS_POR_BLOCO = 2000
+LINHAS_AMOSTRA = 1000
+
+# Textos lidos como valor ausente pelo `pandas.read_csv`
+VALORES_AUSENTES = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN", "<NA>", "N/A",
+    "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+})
+BOOLEANOS = {"True": True, "TRUE": True, "true": True, "False": False, "FALSE": False, "false": False}
+_PADRAO_INTEIRO = re.compile(r"[+-]?\d+")
+_PADRAO_DECIMAL = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+
+
+class _BufferPdf:
+    """
+    Buffer do documento com a interface usada pelo fpdf 1.7 (`+=`, `len` e `encode`), que
+    acumula os trechos em uma lista em vez de concatenar o texto a cada operação.
+    """
+
+    def __init__(self) -> None:
+        self._partes = []
+        self._tamanho = 0
+
+    def __iadd__(self, texto: str) -> "_BufferPdf":
+        self._partes.append(texto)
+        self._tamanho += len(texto)
+        return self
+
+    def __len__(self) -> int:
+        return self._tamanho
+
+    def encode(self, *args) -> bytes:
+        return "".join(self._partes).encode(*args)
+
+
+class _PdfTabela(FPDF):
+    """
+    FPDF para tabelas longas. No fpdf 1.7, cada operação é concatenada ao texto da página e do
+    documento, o que torna o tempo de geração quadrático no tamanho do PDF; aqui o conteúdo da
+    página atual e o documento são acumulados em listas e juntados uma única vez.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        if isinstance(self.buffer, str):
+            self.buffer = _BufferPdf()
+
+    def _out(self, s):
+        if self.state == 2 and isinstance(self.pages.get(self.page), str):
+            self.__dict__.setdefault("_conteudo_pagina", []).append(s.decode("latin1") if isinstance(s, bytes) else s)
+        else:
+            super()._out(s)
+
+    def _endpage(self):
+        conteudo = self.__dict__.pop("_conteudo_pagina", None)
+        if conteudo:
+            self.pages[self.page] += "\n".join(conteudo) + "\n"
+        super()._endpage()
+
+
+def _coluna_como_texto(valores: list) -> list:
+    """Converte os textos de uma coluna como `pandas.read_csv(...).astype(str)`, pelo tipo inferido."""
+    presentes = [valor for valor in valores if valor not in VALORES_AUSENTES]
+    completa = len(presentes) == len(valores)
+    if presentes and completa and all(_PADRAO_INTEIRO.fullmatch(valor) for valor in presentes):
+        return [str(int(valor)) for valor in valores]
+    if all(_PADRAO_DECIMAL.fullmatch(valor) for valor in presentes):
+        return ["nan" if valor in VALORES_AUSENTES else str(float(valor)) for valor in valores]
+    if presentes and completa and all(valor in BOOLEANOS for valor in presentes):
+        return [str(BOOLEANOS[valor]) for valor in valores]
+    return ["nan" if valor in VALORES_AUSENTES else valor for valor in valores]
+
+
+def ler_csv_como_texto(csv_path: str) -> tuple:
+    """
+    Lê um CSV pequeno (ex.: carteira recomendada) com o módulo csv, sem importar o pandas.
+
+    Os valores são devolvidos como texto no mesmo formato de `pandas.read_csv(...).astype(str)`:
+    colunas inteiras, decimais (com ausentes como 'nan') e booleanas são normalizadas pelo tipo
+    que o pandas inferiria, e as demais mantêm o texto do arquivo.
+
+    Parâmetros:
+    csv_path (str): Caminho do CSV, com cabeçalho.
+
+    Retorna:
+    tuple: (cabecalhos, linhas), com a lista dos nomes das colunas e a lista das linhas (listas de textos).
+    """
+    with open(csv_path, newline="", encoding="utf-8-sig") as arquivo:
+        leitor = csv.reader(arquivo)
+        cabecalhos = next(leitor, None)
+        linhas = [linha for linha in leitor if linha]
+    if not cabecalhos:
+        raise ValueError(f"O arquivo {csv_path} não possui cabeçalho.")
+
+    cabecalhos = [cabecalho or f"Unnamed: {i}" for i, cabecalho in enumerate(cabecalhos)]
+    colunas = [_coluna_como_texto([linha[i] if i < len(linha) else "" for linha in linhas])
+               for i in range(len(cabecalhos))]
+    return cabecalhos, [list(valores) for valores in zip(*colunas)]
+
+
+def _renderizar(csv_path: str, pdf_dir: str, title: str) -> tuple:
+    """Renderiza um PDF (executado nos processos do pool) e devolve o caminho, o tempo e as linhas."""
+    inicio = time.perf_counter()
+    pdf_path, linhas = CsvParaPdf._criar_pdf(csv_path, pdf_dir, title)
+    return pdf_path, time.perf_counter() - inicio, linhas
+
 
 class CsvParaPdf:
     def __init__(
             self,
             logger_level: int = logging.INFO,
+            metricas: Optional[Metricas] = None,
+            d_base: str = "./dados/",
     ) -> None:
+        self.metricas = metricas or Metricas()
         self.logger_level = logger_level
         self.logger = Utils.log_config(logger_level=self.logger_level)
 
         logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
         self.logger = logging.getLogger(__name__)
 
-        self.d_base = "./dados/"
+        self.d_base = d_base
         self.d_extraidos = f"{self.d_base}01_extraidos/"
         self.d_processados = f"{self.d_base}02_processados/"
         self.dfinal = f"{self.d_base}03_final/"
 
     @staticmethod
-    def create_pdf_from_csv(csv_path, pdf_dir, title):
-        logging.info(f"Iniciando a criação dos PDFs a partir dos arquivos presentes no diretório {csv_path}")
-        # Obtém o nome do arquivo sem a extensão para usar como nome do PDF
-        csv_filename = os.path.basename(csv_path)
-        pdf_filename = os.path.splitext(csv_filename)[0] + ".pdf"
+    def titulo_do_arquivo(csv_file: str) -> str:
+        """
+        Retorna o título do relatório a partir do nome do CSV de recomendação, de qualquer data.
 
-        # Caminho completo para salvar o PDF na pasta de saída
-        pdf_path = os.path.join(pdf_dir, pdf_filename)
+        Parâmetros:
+        csv_file (str): Nome do arquivo (ex.: 'recomendacao_magic_form_17_10_2024.csv').
 
-        # Carrega o CSV em um DataFrame usando pandas
-        df = pd.read_csv(csv_path)
+        Retorna:
+        str: Título do modelo, com o grupo (ex.: setor) quando a carteira for por grupo; vazio
+        para arquivos de outros modelos.
+        """
+        correspondencia = _PADRAO_RECOMENDACAO.match(csv_file)
+        if correspondencia is None or correspondencia.group("modelo") not in TITULOS:
+            return ""
+        titulo = TITULOS[correspondencia.group("modelo")]
+        if correspondencia.group("grupo"):
+            titulo += f"\nPor {correspondencia.group('grupo').capitalize()}"
+        return titulo
 
-        # Cria um objeto PDF em modo paisagem (landscape)
-        pdf = FPDF(orientation='L')  # 'L' para paisagem
-        pdf.set_auto_page_break(auto=True, margin=15)
-        pdf.add_page()
+    @staticmethod
+    def _desenhar_linhas(pdf: FPDF, valores: list, x_position: float, estilos: list, larguras: Optional[list] = None,
+                         altura: float = ALTURA_CELULA, familia: str = "Times", tamanho_fonte: float = 12,
+                         cabecalho: Optional[Callable[[], None]] = None) -> None:
+        """
+        Desenha as linhas da tabela coluna a coluna, em blocos que cabem na página: a fonte é
+        definida uma vez por coluna em cada página, e não a cada célula. A cada nova página,
+        `cabecalho` (se informado) redesenha o cabeçalho da tabela.
+        """
+        larguras = larguras or [LARGURA_CELULA] * len(estilos)
+        posicoes_x = [x_position + deslocamento for deslocamento in itertools.accumulate(larguras[:-1], initial=0)]
+        inicio = 0
+        while inicio < len(valores):
+            # Linhas que cabem até a quebra automática de página
+            cabem = int((pdf.page_break_trigger - pdf.get_y()) // altura)
+            if cabem < 1:
+                pdf.add_page()
+                if cabecalho:
+                    cabecalho()
+                continue
+            bloco = valores[inicio:inicio + cabem]
+            y_position = pdf.get_y()
+            for coluna, estilo in enumerate(estilos):
+                pdf.set_font(familia, estilo, tamanho_fonte)
+                x_coluna, largura = posicoes_x[coluna], larguras[coluna]
+                for linha, registro in enumerate(bloco):
+                    pdf.set_xy(x_coluna, y_position + linha * altura)
+                    pdf.cell(largura, altura, registro[coluna], 1, 0, "C")
+            pdf.set_xy(x_position, y_position + len(bloco) * altura)
+            inicio += len(bloco)
+            if inicio < len(valores):
+                pdf.add_page()
+                if cabecalho:
+                    cabecalho()
 
+    @staticmethod
+    def _cabecalho_relatorio(pdf: FPDF, title: str) -> None:
+        """Adiciona a data/hora de geração e o título no topo da primeira página."""
         # Adiciona a data/hora de geração no topo do PDF (canto superior direito)
         pdf.set_font("Arial", "", 10)
         now = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
@@ -52,73 +233,277 @@ class CsvParaPdf:
         pdf.multi_cell(0, 10, title, align="C")
         pdf.ln(10)  # Adiciona espaço após o título
 
-        # Cria a tabela com os dados
-        pdf.set_font("Times", "", 12)
+    @staticmethod
+    def _criar_pdf(csv_path: str, pdf_dir: str, title: str) -> tuple:
+        # Obtém o nome do arquivo sem a extensão para usar como nome do PDF
+        csv_filename = os.path.basename(csv_path)
+        pdf_filename = os.path.splitext(csv_filename)[0] + ".pdf"
+
+        # Caminho completo para salvar o PDF na pasta de saída
+        pdf_path = os.path.join(pdf_dir, pdf_filename)
 
-        # Calcula a largura total da tabela e a largura da página
-        table_width = len(df.columns) * 40  # 40 é a largura da célula definida
-        page_width = pdf.w  # Largura da página
+        # Carrega o CSV com os valores já convertidos em texto (sem pandas: as carteiras são pequenas)
+        cabecalhos, valores = ler_csv_como_texto(csv_path)
+
+        # Cria um objeto PDF em modo paisagem (landscape)
+        pdf = FPDF(orientation='L')  # 'L' para paisagem
+        pdf.set_auto_page_break(auto=True, margin=15)
+        pdf.add_page()
+        CsvParaPdf._cabecalho_relatorio(pdf, title)
 
         # Calcula a posição x centralizada para a tabela
-        x_position = (page_width - table_width) / 2
+        table_width = len(cabecalhos) * LARGURA_CELULA
+        x_position = (pdf.w - table_width) / 2
 
         # Cria cabeçalho em negrito e com fundo cinza claro
         pdf.set_fill_color(230, 230, 230)  # Cor cinza claro para o fundo
         pdf.set_font("Times", "B", 12)  # Fonte em negrito para o cabeçalho
         pdf.set_x(x_position)  # Define a posição x centralizada para o cabeçalho
-        for header in df.columns:
-            pdf.cell(40, 10, str(header), 1, 0, "C", True)  # Adiciona borda e fundo
+        for header in cabecalhos:
+            pdf.cell(LARGURA_CELULA, ALTURA_CELULA, header, 1, 0, "C", True)  # Adiciona borda e fundo
         pdf.ln()
 
-        # Define novamente a posição x para o centro da página
-        x_position = (page_width - table_width) / 2
-
-        # Cria os registros centralizados
+        # Cria os registros centralizados, com negrito na primeira coluna
         pdf.set_fill_color(255, 255, 255)  # Restaura a cor branca para as linhas
-        for _, row in df.iterrows():
-            pdf.set_x(x_position)  # Define a posição x centralizada para os dados
-            for i, datum in enumerate(row):
-                if i == 0:
-                    pdf.set_font("Times", "B", 12)  # Aplica negrito na primeira coluna
-                else:
-                    pdf.set_font("Times", "", 12)  # Restaura a fonte padrão para outras colunas
-                pdf.cell(40, 10, str(datum), 1, 0, "C")
-            pdf.ln()
+        estilos = [ESTILO_PRIMEIRA_COLUNA] + [ESTILO_DEMAIS_COLUNAS] * (len(cabecalhos) - 1)
+        CsvParaPdf._desenhar_linhas(pdf, valores, x_position, estilos)
 
         # Salva o PDF no diretório especificado
         pdf.output(pdf_path)
+        return pdf_path, len(valores)
+
+    @staticmethod
+    def create_pdf_from_csv(csv_path, pdf_dir, title):
+        logging.info(f"Iniciando a criação dos PDFs a partir dos arquivos presentes no diretório {csv_path}")
+        pdf_path, _ = CsvParaPdf._criar_pdf(csv_path, pdf_dir, title)
         logging.info("PDFs gerados com sucesso!")
+        return pdf_path
+
+    @staticmethod
+    def _larguras_colunas(pdf: FPDF, amostra: "pandas.DataFrame", largura_disponivel: float) -> tuple:
+        """
+        Calcula a largura de cada coluna a partir do cabeçalho e dos textos mais longos da
+        amostra. Se a tabela não couber na página, as larguras são reduzidas proporcionalmente e
+        o número máximo de caracteres de cada coluna passa a limitar os textos.
+        """
+        import numpy as np
+
+        larguras, maiores = [], []
+        for coluna in amostra.columns:
+            textos = amostra[coluna]
+            # Mede apenas os textos mais longos da coluna, e não todas as células da amostra
+            candidatos = textos.iloc[np.argsort(-textos.str.len().to_numpy(), kind="stable")[:20]].tolist()
+            pdf.set_font("Arial", "", FONTE_TABELA_PAGINADA)
+            largura = max([pdf.get_string_width(texto) for texto in candidatos] + [0])
+            pdf.set_font("Arial", "B", FONTE_TABELA_PAGINADA)
+            largura = max(largura, pdf.get_string_width(str(coluna)))
+            larguras.append(max(largura + 2 * ESPACAMENTO_CELULA, LARGURA_MINIMA_COLUNA))
+            maiores.append(max([len(texto) for texto in candidatos] + [len(str(coluna))]))
+
+        larguras = np.array(larguras)
+        if larguras.sum() <= largura_disponivel:
+            return larguras.tolist(), [None] * len(larguras)
+        escala = largura_disponivel / larguras.sum()
+        limites = [max(1, int(maior * escala)) for maior in maiores]
+        return (larguras * escala).tolist(), limites
+
+    @staticmethod
+    def _blocos_texto(fonte: Union[str, "pandas.DataFrame"], colunas: Optional[list], linhas_por_bloco: int):
+        """Percorre a tabela em blocos de linhas, com os valores como texto (vazio para ausentes)."""
+        import pandas as pd
+
+        if isinstance(fonte, pd.DataFrame):
+            tabela = fonte if colunas is None else fonte[colunas]
+            for inicio in range(0, len(tabela), linhas_por_bloco):
+                bloco = tabela.iloc[inicio:inicio + linhas_por_bloco]
+                yield bloco.astype(str).where(bloco.notna(), "")
+        else:
+            yield from pd.read_csv(fonte, usecols=colunas, dtype=str, keep_default_na=False,
+                                   chunksize=linhas_por_bloco)
+
+    @staticmethod
+    def create_pdf_paginado(
+            fonte: Union[str, "pandas.DataFrame"],
+            pdf_path: str,
+            title: str,
+            colunas: Optional[list] = None,
+            linhas_por_bloco: int = LINHAS_POR_BLOCO,
+            linhas_amostra: int = LINHAS_AMOSTRA,
+    ) -> tuple:
+        """
+        Gera um relatório em PDF com uma tabela paginada de qualquer número de linhas e colunas
+        (ex.: apêndice com todo o universo triado).
+
+        A tabela é lida em blocos de `linhas_por_bloco` linhas e desenhada página a página, com o
+        cabeçalho repetido em cada página; as larguras das colunas são calculadas uma única vez,
+        a partir das primeiras `linhas_amostra` linhas. A memória usada na leitura não cresce com
+        o número de linhas, e o tempo cresce linearmente com ele.
+
+        Parâmetros:
+        fonte (str or pandas.DataFrame): Caminho do CSV ou DataFrame com a tabela.
+        pdf_path (str): Caminho do PDF gerado.
+        title (str): Título do relatório.
+        colunas (list): Colunas incluídas; por padrão, todas.
+        linhas_por_bloco (int): Número de linhas lidas e convertidas em texto de cada vez.
+        linhas_amostra (int): Número de linhas usadas para calcular as larguras das colunas.
+
+        Retorna:
+        tuple: Caminho do PDF e número de linhas da tabela.
+        """
+        # O pandas é importado apenas pela tabela paginada; os PDFs das recomendações não o usam
+        import pandas as pd
+
+        blocos = CsvParaPdf._blocos_texto(fonte, colunas, linhas_por_bloco)
+        if isinstance(fonte, pd.DataFrame):
+            amostra = next(CsvParaPdf._blocos_texto(fonte.head(linhas_amostra), colunas, linhas_amostra), None)
+        else:
+            amostra = pd.read_csv(fonte, usecols=colunas, dtype=str, keep_default_na=False, nrows=linhas_amostra)
 
-    def gerar_pdf_de_csv(self):
+        pdf = _PdfTabela(orientation='L')
+        pdf.set_margins(MARGEM_LATERAL, 10, MARGEM_LATERAL)
+        pdf.set_auto_page_break(auto=True, margin=15)
+        pdf.add_page()
+        CsvParaPdf._cabecalho_relatorio(pdf, title)
+
+        cabecalhos = [str(coluna) for coluna in amostra.columns]
+        larguras, limites = CsvParaPdf._larguras_colunas(pdf, amostra, pdf.w - 2 * MARGEM_LATERAL)
+        x_position = (pdf.w - sum(larguras)) / 2
+        estilos = [ESTILO_PRIMEIRA_COLUNA] + [ESTILO_DEMAIS_COLUNAS] * (len(cabecalhos) - 1)
+
+        def cabecalho() -> None:
+            # Cabeçalho em negrito e com fundo cinza claro, repetido no topo de cada página
+            pdf.set_fill_color(230, 230, 230)
+            pdf.set_font("Arial", "B", FONTE_TABELA_PAGINADA)
+            pdf.set_x(x_position)
+            for texto, largura, limite in zip(cabecalhos, larguras, limites):
+                pdf.cell(largura, ALTURA_LINHA_PAGINADA, texto[:limite], 1, 0, "C", True)
+            pdf.ln()
+            pdf.set_fill_color(255, 255, 255)
+
+        cabecalho()
+        linhas = 0
+        for bloco in blocos:
+            for coluna, limite in zip(bloco.columns, limites):
+                if limite is not None:
+                    bloco[coluna] = bloco[coluna].str.slice(0, limite)
+            CsvParaPdf._desenhar_linhas(pdf, bloco.to_numpy().tolist(), x_position, estilos, larguras,
+                                        ALTURA_LINHA_PAGINADA, "Arial", FONTE_TABELA_PAGINADA, cabecalho)
+            linhas += len(bloco)
+
+        pdf.output(pdf_path)
+        return pdf_path, linhas
+
+    def gerar_pdf_paginado(self, fonte: Union[str, "pandas.DataFrame"], nome_do_arquivo: str, title: str,
+                           colunas: Optional[list] = None, data: Optional[str] = None) -> str:
+        """
+        Gera em `03_final/pdf/` o relatório paginado de uma tabela (ver `create_pdf_paginado`).
+
+        Parâmetros:
+        fonte (str or pandas.DataFrame): Caminho do CSV ou DataFrame com a tabela.
+        nome_do_arquivo (str): Nome do PDF, sem a data e a extensão (ex.: 'universo_acoes_').
+        title (str): Título do relatório.
+        colunas (list): Colunas incluídas; por padrão, todas.
+        data (str): Data do nome do arquivo no formato dd_mm_yyyy; por padrão, a data atual.
+
+        Retorna:
+        str: Caminho do PDF gerado.
+        """
+        data_atual = data or datetime.now().strftime("%d_%m_%Y")
+        pdf_path = f"{self.dfinal}pdf/{nome_do_arquivo}{data_atual}.pdf"
+        with self.metricas.etapa(f"pdf.{nome_do_arquivo.rstrip('_')}") as etapa:
+            pdf_path, etapa.linhas_saida = self.create_pdf_paginado(fonte, pdf_path, title, colunas=colunas)
+            etapa.bytes = os.path.getsize(pdf_path)
+        self.logger.info(f"Relatório paginado com {etapa.linhas_saida} linhas gerado em {pdf_path}")
+        return pdf_path
+
+    @staticmethod
+    def pendentes(csv_dir: str, pdf_dir: str) -> list:
+        """
+        Lista os CSVs cujo PDF não existe ou é mais antigo que o CSV (arquivos novos ou alterados).
+
+        Parâmetros:
+        csv_dir (str): Diretório dos CSVs.
+        pdf_dir (str): Diretório dos PDFs.
+
+        Retorna:
+        list: Nomes dos CSVs a renderizar, em ordem alfabética.
+        """
+        pendentes = []
+        for csv_file in sorted(f for f in os.listdir(csv_dir) if f.endswith(".csv")):
+            pdf_path = os.path.join(pdf_dir, os.path.splitext(csv_file)[0] + ".pdf")
+            if not os.path.exists(pdf_path) or \
+                    os.path.getmtime(pdf_path) < os.path.getmtime(os.path.join(csv_dir, csv_file)):
+                pendentes.append(csv_file)
+        return pendentes
+
+    def _coletar_renderizacoes(self, resultados: list) -> list:
+        """
+        Obtém o resultado de cada renderização, registrando as métricas dos PDFs gerados; a falha
+        de um CSV é registrada no log sem descartar os demais.
+
+        Parâmetros:
+        resultados (list): Pares (caminho do CSV, função sem argumentos que devolve o resultado de
+            `_renderizar`).
+
+        Retorna:
+        list: Caminhos dos PDFs gerados.
+        """
+        gerados = []
+        for csv_path, resultado in resultados:
+            try:
+                pdf_path, segundos, linhas = resultado()
+            except Exception as e:
+                self.logger.error(f"Erro ao gerar o PDF de {csv_path}: {e}")
+                self.metricas.incrementar("falhas_pdf")
+                continue
+            self.metricas.observar("renderizacao_pdf_segundos", segundos)
+            self.metricas.incrementar("linhas_pdf", linhas)
+            gerados.append(pdf_path)
+        return gerados
 
+    def gerar_pdf_de_csv(self, processos: Optional[int] = None, forcar: bool = False) -> list:
+        """
+        Gera os PDFs dos CSVs de recomendação novos ou alterados desde o último PDF gerado.
+
+        Os relatórios são independentes e, havendo mais de um pendente, são renderizados em um
+        pool de processos. Um CSV que não pode ser renderizado é registrado no log (e no contador
+        `falhas_pdf`), sem descartar os demais PDFs.
+
+        Parâmetros:
+        processos (int): Número de processos; por padrão, um por núcleo (1 = no próprio processo).
+        forcar (bool): Se verdadeiro, renderiza todos os CSVs, mesmo os que já possuem PDF atualizado.
+
+        Retorna:
+        list: Caminhos dos PDFs gerados.
+        """
         # Diretório onde estão os arquivos CSV (na raiz do projeto)
         csv_dir = f"{self.dfinal}csv/"
         pdf_dir = f"{self.dfinal}pdf/"
 
-        data_atual = datetime.now().strftime("%d_%m_%Y")
-
-        # Mapeia os títulos com base nos nomes dos arquivos CSV
-        title_map = {
-            f"recomendacao_magic_form_{data_atual}.csv": "As Melhores Ações\nCom Melhor Custo/Benefício.\nSegundo: "
-                                                         "Método"
-                                                         "Magic Formula",
-            f"recomendacao_ben_grahan_{data_atual}.csv": "As Melhores Ações\nCom Melhor Custo/Benefício.\nSegundo: "
-                                                         "Benjamin Graham",
-            f"recomendacao_decio_bazin_{data_atual}.csv": "As Melhores Ações\nCom Melhor Custo/Benefício.\nSegundo: "
-                                                          "Método Décio Bazin"
-        }
+        gerados = []
         try:
-            # Lista todos os arquivos CSV na pasta /dados/final/
-            csv_files = [f for f in os.listdir(csv_dir) if f.endswith(".csv")]
+            # Lista os arquivos CSV da pasta /dados/final/ que precisam de um novo PDF
+            if forcar:
+                csv_files = sorted(f for f in os.listdir(csv_dir) if f.endswith(".csv"))
+            else:
+                csv_files = self.pendentes(csv_dir, pdf_dir)
+            self.logger.info(f"{len(csv_files)} PDF(s) a gerar a partir do diretório {csv_dir}")
+            tarefas = [(os.path.join(csv_dir, csv_file), pdf_dir, self.titulo_do_arquivo(csv_file))
+                       for csv_file in csv_files]
 
-            # Para cada arquivo CSV, gera um PDF correspondente
-            for csv_file in csv_files:
-                csv_path = os.path.join(csv_dir, csv_file)
-
-                # Obtém o título correspondente ao nome do arquivo CSV
-                title = title_map.get(csv_file, "")
-
-                # Cria o PDF em modo paisagem a partir do arquivo CSV
-                self.create_pdf_from_csv(csv_path, pdf_dir, title)
+            with self.metricas.etapa("pdf", len(tarefas)) as etapa:
+                processos = min(processos or os.cpu_count() or 1, len(tarefas))
+                if processos > 1:
+                    with ProcessPoolExecutor(max_workers=processos) as executor:
+                        futuros = [executor.submit(_renderizar, *tarefa) for tarefa in tarefas]
+                        resultados = [(tarefa[0], futuro.result) for tarefa, futuro in zip(tarefas, futuros)]
+                        gerados = self._coletar_renderizacoes(resultados)
+                else:
+                    resultados = [(tarefa[0], functools.partial(_renderizar, *tarefa)) for tarefa in tarefas]
+                    gerados = self._coletar_renderizacoes(resultados)
+                etapa.linhas_saida = len(gerados)
+                etapa.bytes = sum(os.path.getsize(pdf_path) for pdf_path in gerados)
+            self.logger.info(f"{len(gerados)} PDF(s) gerado(s) em {pdf_dir}")
         except Exception as e:
-            logging.error(f'Erro ao retornar os arquivos do diretório {csv_dir}": {e}')
\ No newline at end of file
+            logging.error(f'Erro ao retornar os arquivos do diretório {csv_dir}": {e}')
+        return gerados
@@ -0,0 +1,345 @@
+import logging
+import os
+import re
+import shutil
+from datetime import date, datetime
+from typing import Optional, Union
+
+import pandas as pd
+
+from armazenamento import EXTENSOES, ler_tabela, localizar_tabela, salvar_tabela
+
+# Diretório padrão do histórico de snapshots
+DIRETORIO_HISTORICO = "./dados/04_historico/"
+
+# Coluna do ticker em cada tipo de papel
+COLUNAS_PAPEL = {
+    "acoes": "nome_papel",
+    "fiis": "fii",
+}
+
+# Colunas do índice: data do snapshot, ticker e partição (caminho relativo, sem extensão)
+COLUNAS_INDICE = ["dt_snapshot", "papel", "parte"]
+
+# Diretório dos consolidados diários gravados pela coleta (`<tipo>_consolidados_<dd_mm_yyyy>`)
+DIRETORIO_PROCESSADOS = "./dados/02_processados/"
+
+
+def _normalizar_data(valor: Union[str, date, datetime, None]) -> Optional[str]:
+    """
+    Converte uma data para o formato ISO (yyyy-mm-dd), usado nas partições e no índice.
+
+    Parâmetros:
+    valor (str, date or datetime): Data como objeto, texto ISO ou texto dd/mm/yyyy (ou dd_mm_yyyy).
+
+    Retorna:
+    str: Data no formato yyyy-mm-dd, ou None se o valor for None.
+    """
+    if valor is None:
+        return None
+    if isinstance(valor, str) and ("/" in valor or "_" in valor):
+        return pd.to_datetime(valor.replace("_", "/"), format="%d/%m/%Y").strftime("%Y-%m-%d")
+    return pd.Timestamp(valor).strftime("%Y-%m-%d")
+
+
+class HistoricoSnapshots:
+    """
+    Histórico de snapshots diários do dataset consolidado, particionado por data.
+
+    Cada gravação cria uma nova partição (`<tipo>/dt_snapshot=<yyyy-mm-dd>/parte_<n>`) e
+    nunca altera as anteriores. Um índice (data, ticker, partição) permite que as consultas
+    leiam apenas as partições necessárias. Os arquivos usam o formato de `armazenamento`
+    (Feather/Parquet com pyarrow, CSV sem ele).
+
+    Atributos:
+    diretorio (str): Diretório raiz do histórico.
+    tipo (str): Tipo de papel ('acoes' ou 'fiis').
+    coluna_papel (str): Coluna do ticker no dataset.
+    formato (str): Formato dos arquivos gravados; por padrão, o de `armazenamento`.
+    """
+
+    def __init__(
+            self,
+            tipo: str = "acoes",
+            diretorio: str = DIRETORIO_HISTORICO,
+            coluna_papel: Optional[str] = None,
+            formato: Optional[str] = None,
+    ) -> None:
+        """
+        Inicializa o histórico, criando o diretório do tipo se necessário.
+
+        Parâmetros:
+        tipo (str): Tipo de papel ('acoes' ou 'fiis').
+        diretorio (str): Diretório raiz do histórico.
+        coluna_papel (str): Coluna do ticker; por padrão, 'nome_papel' (ações) ou 'fii' (FIIs).
+        formato (str): Formato dos arquivos ('feather', 'parquet' ou 'csv').
+        """
+        if tipo not in COLUNAS_PAPEL:
+            raise ValueError(f"Tipo '{tipo}' inválido. Os tipos válidos são 'acoes' ou 'fiis'.")
+
+        self.logger = logging.getLogger(__name__)
+        self.diretorio = diretorio
+        self.tipo = tipo
+        self.coluna_papel = coluna_papel or COLUNAS_PAPEL[tipo]
+        self.formato = formato
+        self._diretorio_tipo = os.path.join(self.diretorio, self.tipo)
+        self._caminho_indice = os.path.join(self._diretorio_tipo, "indice")
+        self._indice = None
+        os.makedirs(self._diretorio_tipo, exist_ok=True)
+
+    @property
+    def indice(self) -> pd.DataFrame:
+        """
+        Índice do histórico, carregado do disco na primeira consulta.
+
+        Retorna:
+        pandas.DataFrame: Colunas `dt_snapshot`, `papel` e `parte`, em ordem de gravação.
+        """
+        if self._indice is None:
+            if localizar_tabela(self._caminho_indice) is None:
+                self._indice = pd.DataFrame(columns=COLUNAS_INDICE, dtype=object)
+            else:
+                self._indice = ler_tabela(self._caminho_indice).astype({"dt_snapshot": str, "papel": str})
+        return self._indice
+
+    def datas(self) -> list:
+        """
+        Retorna as datas que possuem snapshot.
+
+        Retorna:
+        list: Datas no formato yyyy-mm-dd, em ordem crescente.
+        """
+        return sorted(self.indice["dt_snapshot"].unique().tolist())
+
+    def gravar(self, df: pd.DataFrame, data: Union[str, date, datetime, None] = None) -> str:
+        """
+        Acrescenta um snapshot ao histórico como uma nova partição da data.
+
+        Parâmetros:
+        df (pandas.DataFrame): Dataset consolidado, com a coluna do ticker.
+        data (str, date or datetime): Data do snapshot; por padrão, a data atual.
+
+        Retorna:
+        str: Caminho do arquivo da partição gravada.
+        """
+        if self.coluna_papel not in df.columns:
+            raise KeyError(f"Coluna '{self.coluna_papel}' ausente do dataset.")
+
+        data, parte = self._nova_parte(data)
+        caminho = salvar_tabela(df, os.path.join(self._diretorio_tipo, parte), formato=self.formato)
+        self._indexar(data, parte, df[self.coluna_papel], caminho)
+        return caminho
+
+    def gravar_arquivo(self, caminho_tabela: str, data: Union[str, date, datetime, None] = None) -> str:
+        """
+        Acrescenta ao histórico um dataset consolidado já gravado em disco (por exemplo, pela
+        coleta em fluxo), copiando o arquivo para a nova partição sem carregá-lo em memória.
+        Apenas a coluna do ticker é lida, para o índice.
+
+        Parâmetros:
+        caminho_tabela (str): Caminho do arquivo gravado por `armazenamento`, com ou sem extensão.
+        data (str, date or datetime): Data do snapshot; por padrão, a data atual.
+
+        Retorna:
+        str: Caminho do arquivo da partição gravada.
+        """
+        encontrado = localizar_tabela(caminho_tabela)
+        if encontrado is None:
+            raise FileNotFoundError(f"Tabela '{caminho_tabela}' não encontrada.")
+        papeis = ler_tabela(encontrado, colunas=[self.coluna_papel])[self.coluna_papel]
+
+        data, parte = self._nova_parte(data)
+        caminho = os.path.join(self._diretorio_tipo, parte) + os.path.splitext(encontrado)[1]
+        shutil.copyfile(encontrado, caminho)
+        self._indexar(data, parte, papeis, caminho)
+        return caminho
+
+    def _nova_parte(self, data: Union[str, date, datetime, None]) -> tuple:
+        data = _normalizar_data(data or datetime.now())
+        num_parte = self.indice.loc[self.indice["dt_snapshot"] == data, "parte"].nunique()
+        os.makedirs(os.path.join(self._diretorio_tipo, f"dt_snapshot={data}"), exist_ok=True)
+        return data, f"dt_snapshot={data}/parte_{num_parte:04d}"
+
+    def _indexar(self, data: str, parte: str, papeis: pd.Series, caminho: str) -> None:
+        novas = pd.DataFrame({
+            "dt_snapshot": data,
+            "papel": papeis.astype(str).to_numpy(),
+            "parte": parte,
+        })
+        self._indice = pd.concat([self.indice, novas], ignore_index=True)
+        salvar_tabela(self._indice, self._caminho_indice, formato=self.formato)
+        self.logger.info(f"Snapshot de {data} gravado em '{caminho}' ({len(novas)} papéis).")
+
+    def _ler_partes(self, partes: list, data_por_parte: dict, colunas: Optional[list]) -> pd.DataFrame:
+        if colunas is not None and self.coluna_papel not in colunas:
+            colunas = [self.coluna_papel] + list(colunas)
+
+        dfs = []
+        for parte in partes:
+            df = ler_tabela(os.path.join(self._diretorio_tipo, parte), colunas=colunas)
+            df.insert(0, "dt_snapshot", data_por_parte[parte])
+            dfs.append(df)
+        if not dfs:
+            return pd.DataFrame(columns=["dt_snapshot"] + (colunas or [self.coluna_papel]))
+        return pd.concat(dfs, ignore_index=True)
+
+    def consultar_papel(
+            self,
+            papel: str,
+            inicio: Union[str, date, datetime, None] = None,
+            fim: Union[str, date, datetime, None] = None,
+            colunas: Optional[list] = None,
+    ) -> pd.DataFrame:
+        """
+        Retorna a série histórica de um ticker em um intervalo de datas.
+
+        Apenas as partições em que o ticker aparece dentro do intervalo são lidas. Quando a
+        mesma data possui mais de um snapshot, prevalece o último gravado.
+
+        Parâmetros:
+        papel (str): Ticker (ex.: 'PETR4').
+        inicio (str, date or datetime): Data inicial, inclusive; por padrão, sem limite.
+        fim (str, date or datetime): Data final, inclusive; por padrão, sem limite.
+        colunas (list): Colunas a carregar; por padrão, todas.
+
+        Retorna:
+        pandas.DataFrame: Uma linha por data, com a coluna `dt_snapshot`, em ordem crescente.
+        """
+        inicio, fim = _normalizar_data(inicio), _normalizar_data(fim)
+        indice = self.indice
+        filtro = indice["papel"] == papel
+        if inicio is not None:
+            filtro &= indice["dt_snapshot"] >= inicio
+        if fim is not None:
+            filtro &= indice["dt_snapshot"] <= fim
+
+        selecionadas = indice.loc[filtro]
+        data_por_parte = dict(zip(selecionadas["parte"], selecionadas["dt_snapshot"]))
+        df = self._ler_partes(list(data_por_parte), data_por_parte, colunas)
+
+        df = df[df[self.coluna_papel].astype(str) == papel]
+        df = df.drop_duplicates(subset="dt_snapshot", keep="last")
+        return df.sort_values("dt_snapshot", kind="stable").reset_index(drop=True)
+
+    def universo_em(self, data: Union[str, date, datetime], colunas: Optional[list] = None) -> pd.DataFrame:
+        """
+        Retorna o universo de papéis conforme o último snapshot gravado até a data informada.
+
+        Apenas as partições dessa data são lidas; se houver mais de um snapshot no dia,
+        prevalece o último gravado para cada ticker.
+
+        Parâmetros:
+        data (str, date or datetime): Data de referência, inclusive.
+        colunas (list): Colunas a carregar; por padrão, todas.
+
+        Retorna:
+        pandas.DataFrame: Uma linha por ticker, com a coluna `dt_snapshot`.
+        """
+        data = _normalizar_data(data)
+        anteriores = self.indice.loc[self.indice["dt_snapshot"] <= data, "dt_snapshot"]
+        if anteriores.empty:
+            return self._ler_partes([], {}, colunas)
+
+        data_snapshot = anteriores.max()
+        partes = self.indice.loc[self.indice["dt_snapshot"] == data_snapshot, "parte"].unique().tolist()
+        df = self._ler_partes(partes, dict.fromkeys(partes, data_snapshot), colunas)
+
+        df = df.drop_duplicates(subset=self.coluna_papel, keep="last")
+        return df.reset_index(drop=True)
+
+    def painel(
+            self,
+            inicio: Union[str, date, datetime, None] = None,
+            fim: Union[str, date, datetime, None] = None,
+            colunas: Optional[list] = None,
+    ) -> pd.DataFrame:
+        """
+        Retorna todos os snapshots de um intervalo de datas em uma única tabela (formato longo).
+
+        Apenas as partições do intervalo são lidas; quando a mesma data possui mais de um
+        snapshot, prevalece o último gravado para cada ticker.
+
+        Parâmetros:
+        inicio (str, date or datetime): Data inicial, inclusive; por padrão, sem limite.
+        fim (str, date or datetime): Data final, inclusive; por padrão, sem limite.
+        colunas (list): Colunas a carregar; por padrão, todas.
+
+        Retorna:
+        pandas.DataFrame: Uma linha por data e ticker, com a coluna `dt_snapshot`, em ordem de data.
+        """
+        inicio, fim = _normalizar_data(inicio), _normalizar_data(fim)
+        indice = self.indice.drop_duplicates(subset="parte")
+        filtro = pd.Series(True, index=indice.index)
+        if inicio is not None:
+            filtro &= indice["dt_snapshot"] >= inicio
+        if fim is not None:
+            filtro &= indice["dt_snapshot"] <= fim
+
+        selecionadas = indice.loc[filtro]
+        data_por_parte = dict(zip(selecionadas["parte"], selecionadas["dt_snapshot"]))
+        df = self._ler_partes(list(data_por_parte), data_por_parte, colunas)
+
+        df = df.drop_duplicates(subset=["dt_snapshot", self.coluna_papel], keep="last")
+        return df.sort_values("dt_snapshot", kind="stable").reset_index(drop=True)
+
+
+def consolidados_diarios(tipo: str = "acoes", diretorio: str = DIRETORIO_PROCESSADOS) -> dict:
+    """
+    Localiza os consolidados diários que a coleta grava em `02_processados`
+    (`<tipo>_consolidados_<dd_mm_yyyy>`), inclusive os anteriores ao histórico particionado.
+
+    Parâmetros:
+    tipo (str): Tipo de papel ('acoes' ou 'fiis').
+    diretorio (str): Diretório dos consolidados.
+
+    Retorna:
+    dict: Caminho (sem extensão) do consolidado de cada data (yyyy-mm-dd), em ordem de data.
+    """
+    extensoes = "|".join(re.escape(extensao) for extensao in EXTENSOES.values())
+    padrao = re.compile(rf"^{re.escape(tipo)}_consolidados_(\d{{2}}_\d{{2}}_\d{{4}})(?:{extensoes})$")
+    datas = {}
+    for nome in os.listdir(diretorio) if os.path.isdir(diretorio) else []:
+        correspondencia = padrao.match(nome)
+        if correspondencia:
+            data = _normalizar_data(correspondencia.group(1))
+            datas[data] = os.path.join(diretorio, f"{tipo}_consolidados_{correspondencia.group(1)}")
+    return dict(sorted(datas.items()))
+
+
+def painel_dos_consolidados(
+        tipo: str = "acoes",
+        diretorio: str = DIRETORIO_PROCESSADOS,
+        inicio: Union[str, date, datetime, None] = None,
+        fim: Union[str, date, datetime, None] = None,
+        colunas: Optional[list] = None,
+) -> pd.DataFrame:
+    """
+    Monta um painel no formato de `HistoricoSnapshots.painel` a partir dos consolidados
+    diários de `02_processados`, para usar as datas coletadas antes do histórico particionado.
+
+    Parâmetros:
+    tipo (str): Tipo de papel ('acoes' ou 'fiis').
+    diretorio (str): Diretório dos consolidados.
+    inicio (str, date or datetime): Data inicial, inclusive; por padrão, sem limite.
+    fim (str, date or datetime): Data final, inclusive; por padrão, sem limite.
+    colunas (list): Colunas a carregar; por padrão, todas.
+
+    Retorna:
+    pandas.DataFrame: Uma linha por data e ticker, com a coluna `dt_snapshot`, em ordem de data.
+    """
+    coluna_papel = COLUNAS_PAPEL[tipo]
+    if colunas is not None and coluna_papel not in colunas:
+        colunas = [coluna_papel] + list(colunas)
+    inicio, fim = _normalizar_data(inicio), _normalizar_data(fim)
+
+    dfs = []
+    for data, caminho in consolidados_diarios(tipo, diretorio).items():
+        if (inicio is not None and data < inicio) or (fim is not None and data > fim):
+            continue
+        df = ler_tabela(caminho, colunas=colunas)
+        df.insert(0, "dt_snapshot", data)
+        dfs.append(df)
+    if not dfs:
+        return pd.DataFrame(columns=["dt_snapshot"] + (colunas or [coluna_papel]))
+    df = pd.concat(dfs, ignore_index=True)
+    return df.drop_duplicates(subset=["dt_snapshot", coluna_papel], keep="last").reset_index(drop=True)
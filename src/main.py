@@ -1,65 +1,137 @@
+"""Linha de comando do pipeline de análise de ações e FIIs.
+
+Subcomandos:
+    scrape   coleta os indicadores e grava o dataset tratado em dados/02_processados;
+    screen   executa os modelos de triagem sobre o dataset de uma data;
+    report   gera os PDFs das recomendações (e, opcionalmente, do universo triado);
+    run-all  executa as três etapas em sequência (padrão quando nenhum subcomando é informado).
+
+Cada etapa é importada apenas quando executada: `--help`, `screen` e `report` não carregam o
+scraping (requests, bs4, lxml), e `--help` não carrega nenhuma dependência pesada.
+Exemplos:
+    python src/main.py
+    python src/main.py scrape --tipo fiis --somente-listagem
+    python src/main.py screen --data 17_10_2026 --por-setor Setor
+    python src/main.py report --pdf-universo --diretorio /tmp/dados/
+"""
+import argparse
+import importlib
 import logging
+import sys
 from datetime import datetime
 
-import pandas as pd
+# Etapas executadas por cada subcomando, na ordem
+ETAPAS = {
+    "scrape": ("coleta",),
+    "screen": ("triagem",),
+    "report": ("relatorio",),
+    "run-all": ("coleta", "triagem", "relatorio"),
+}
 
-from scraping.scraping import Scraping
-from gerar_pdf import CsvParaPdf
-from modelos import MagicForm, ModelBazin, ModelGrahan
-from util import Utils
 
-if __name__ == "__main__":
-    
-    data_atual = datetime.now().strftime("%d_%m_%Y")
-    mes_atual = datetime.now().month
-    ano_atual = datetime.now().year
-    
-    tipo_papel = "acoes" # Tipo de papel pode assumir os tipos ('acoes' ou 'fiis').
-    
-    d_base = "./dados/"
-    d_extraidos = f"{d_base}01_extraidos/"
-    d_processados = f"{d_base}02_processados/"
-    dfinal = f"{d_base}03_final/"
-    
-    scraping = Scraping()
-
-    if scraping:
-        Utils.criar_diretorios()
-        lista_papeis = scraping.retornar_lista_papeis(tipo=tipo_papel, diretorio=d_extraidos,
-                                                      nome_do_arquivo=f'lista_de_{tipo_papel}_')
-
-        # Descomentar a linha abaixo se dejar usar a lista de papeis salvos no lugar de extrair novamente.
-        # dados_papeis = scraping.coleta_indicadores_de_ativos(f"{d_extraidos}lista_de_{tipo_papel}_{data_atual}.csv")
-        dados_papeis = scraping.coleta_indicadores_de_ativos(lista_papeis)
-        
-        dados_processados = scraping.salvar_dataframe_como_csv(dados_papeis, tipo_papel,
-                                                               diretorio=d_processados,
-                                                               nome_do_arquivo=f'{tipo_papel}_consolidados_')
-        
-        # Filtrando apenas os registros que a data de cotação está atualizada, para trabalhar apenas com as ações ATIVAS
-        dados_filtrados = pd.read_csv(f"{d_processados}{tipo_papel}_consolidados_{data_atual}.csv")
-        dados_filtrados['dt_ult_cot'] = pd.to_datetime(dados_filtrados['dt_ult_cot'], format='%d/%m/%Y',
-                                                       errors='coerce')
-        dados_filtrados = dados_filtrados.dropna(subset=['dt_ult_cot'])
-
-        dados_filtrados = dados_filtrados[(dados_filtrados['dt_ult_cot'].dt.month == mes_atual) &
-                                          (dados_filtrados['dt_ult_cot'].dt.year == ano_atual)]
-
-        scraping.salvar_dataframe_como_csv(dados_filtrados, tipo_papel, diretorio=d_processados,
-                                           nome_do_arquivo=f'{tipo_papel}_consolidados_tratados_')
-
-        dados_filtrados_renomeado = Utils.renomear_colunas(dados_filtrados, tipo_papel)
-
-        scraping.salvar_dataframe_como_csv(dados_filtrados_renomeado, tipo_papel, diretorio=d_processados,
-                                           nome_do_arquivo=f'{tipo_papel}_consolidados_tratados_renomeados_')
-        
-        if tipo_papel == "acoes":
-            ModelGrahan().model_grahan()
-            MagicForm().magic_form()
-            ModelBazin().model_bazin()
-            CsvParaPdf().gerar_pdf_de_csv()
-            logging.info(f"Processamento dos dados de {tipo_papel} finalizado!")
+def _data(valor: str) -> str:
+    """Valida uma data no formato dd_mm_yyyy usado nos nomes dos arquivos."""
+    try:
+        datetime.strptime(valor, "%d_%m_%Y")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"data inválida '{valor}' (use dd_mm_yyyy)")
+    return valor
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    """
+    Monta o parser da linha de comando, com as opções agrupadas por etapa.
+
+    Retorna:
+    argparse.ArgumentParser: Parser com os subcomandos scrape, screen, report e run-all.
+    """
+    comum = argparse.ArgumentParser(add_help=False)
+    comum.add_argument("--tipo", choices=("acoes", "fiis"), default="acoes", help="tipo de papel (padrão: acoes)")
+    comum.add_argument("--diretorio", default="./dados/", help="diretório base dos dados (padrão: ./dados/)")
+    comum.add_argument("--prometheus", metavar="ARQUIVO",
+                       help="arquivo .prom do textfile collector do node_exporter para exportar as métricas")
+
+    data = argparse.ArgumentParser(add_help=False)
+    data.add_argument("--data", type=_data, help="data do dataset coletado, em dd_mm_yyyy (padrão: hoje)")
+
+    coleta = argparse.ArgumentParser(add_help=False)
+    grupo = coleta.add_argument_group("coleta")
+    grupo.add_argument("--max-concorrencia", type=int, default=8,
+                       help="páginas de detalhes baixadas simultaneamente (1 = sequencial)")
+    grupo.add_argument("--processos-parse", type=int, default=0,
+                       help="processos que extraem as páginas de detalhes (0 = sem pool de processos)")
+    grupo.add_argument("--requisicoes-por-segundo", type=float, default=4.0,
+                       help="taxa inicial de requisições, ajustada automaticamente (0 = sem limite)")
+    grupo.add_argument("--rajada", type=int, default=8, help="requisições liberadas de uma vez pelo limitador")
+    grupo.add_argument("--sem-cache", action="store_true", help="não reaproveita as páginas baixadas anteriormente")
+    grupo.add_argument("--offline", action="store_true", help="usa apenas as páginas em cache")
+    grupo.add_argument("--somente-listagem", action="store_true",
+                       help="monta o consolidado apenas a partir da página de listagem")
+    grupo.add_argument("--incremental", action="store_true",
+                       help="coleta apenas os detalhes com balanço novo ou mais antigos que --max-idade-fundamentos")
+    grupo.add_argument("--max-idade-fundamentos", type=int, default=30,
+                       help="idade máxima, em dias, dos fundamentos reaproveitados no modo incremental")
+    grupo.add_argument("--sem-retomada", action="store_true", help="não retoma uma coleta interrompida na mesma data")
+    grupo.add_argument("--formato", choices=("feather", "parquet", "csv"),
+                       help="formato dos datasets (padrão: feather se o pyarrow estiver instalado)")
+    grupo.add_argument("--sem-historico", action="store_true", help="não acrescenta o consolidado ao histórico")
+    grupo.add_argument("--sem-fluxo", action="store_true",
+                       help="na coleta completa, grava o consolidado de uma vez em vez de em blocos")
+
+    triagem = argparse.ArgumentParser(add_help=False)
+    grupo = triagem.add_argument_group("triagem")
+    grupo.add_argument("--por-setor", choices=("Setor", "Subsetor"),
+                       help="grava também os primeiros colocados de cada setor ou subsetor")
+
+    relatorio = argparse.ArgumentParser(add_help=False)
+    grupo = relatorio.add_argument_group("relatório")
+    grupo.add_argument("--processos-pdf", type=int, help="processos que renderizam os PDFs (padrão: um por núcleo)")
+    grupo.add_argument("--pdf-universo", action="store_true",
+                       help="gera também o apêndice em PDF com todo o universo triado")
+    grupo.add_argument("--forcar", action="store_true", help="gera novamente os PDFs já atualizados")
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="comando", metavar="{scrape,screen,report,run-all}")
+    subparsers.add_parser("scrape", parents=[comum, coleta], help="coleta e trata os indicadores")
+    subparsers.add_parser("screen", parents=[comum, data, triagem], help="executa os modelos de triagem")
+    subparsers.add_parser("report", parents=[comum, data, relatorio], help="gera os relatórios em PDF")
+    subparsers.add_parser("run-all", parents=[comum, coleta, triagem, relatorio], help="executa todas as etapas")
+    return parser
+
+
+def main(argv=None) -> None:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] not in ETAPAS and argv[0] not in ("-h", "--help"):
+        # Sem subcomando, mantém o comportamento anterior: executa o pipeline completo
+        argv = ["run-all"] + argv
+    opcoes = criar_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    from etapas import Contexto
+    from metricas import Metricas
+    from util import Utils
+
+    # Tempos por etapa, latência por ticker, bytes baixados e linhas de entrada/saída de cada etapa
+    metricas = Metricas(rotulos={"tipo": opcoes.tipo})
+    contexto = Contexto(opcoes, metricas)
+    Utils.criar_diretorios(contexto.d_base)
+
+    dados = None
+    for nome in ETAPAS[opcoes.comando]:
+        etapa = importlib.import_module(f"etapas.{nome}")
+        if nome == "coleta":
+            dados = etapa.executar(contexto)
         else:
-                logging.info(f"Processamento dos dados de {tipo_papel} finalizado!")
-    else:
-        logging.info("Erro ao realizar o processamento dos dados")
+            # No run-all, a triagem e o relatório reaproveitam o dataset já carregado pela coleta
+            etapa.executar(contexto, dados)
+
+    # Relatório da execução em JSON e, opcionalmente, no formato textfile do Prometheus
+    sufixo = "" if opcoes.comando == "run-all" else f"_{opcoes.comando}"
+    metricas.salvar_json(f"{contexto.d_metricas}metricas_{contexto.tipo}{sufixo}_{contexto.data}.json")
+    if opcoes.prometheus:
+        metricas.salvar_prometheus(opcoes.prometheus)
+    logging.info(f"Processamento dos dados de {contexto.tipo} finalizado!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+import json
+import math
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+# Percentis calculados para cada série de observações (ex.: latência por ticker)
+PERCENTIS = (50, 95, 99)
+
+# Prefixo das métricas exportadas no formato textfile do Prometheus
+PREFIXO_PROMETHEUS = "analise_mercado"
+
+
+def escapar_rotulo(valor) -> str:
+    """
+    Escapa o valor de um rótulo no formato de exposição de texto do Prometheus
+    (barra invertida, aspas duplas e quebra de linha).
+
+    Parâmetros:
+    valor: Valor do rótulo, convertido em texto.
+
+    Retorna:
+    str: Valor escapado, sem as aspas delimitadoras.
+    """
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Etapa:
+    """
+    Span de tempo de uma etapa do pipeline, usado como gerenciador de contexto por
+    `Metricas.etapa`.
+
+    Atributos:
+    nome (str): Nome da etapa (ex.: 'coleta_detalhes', 'modelo.ben_grahan').
+    inicio (float): Início da etapa, em segundos desde o início da execução.
+    duracao (float): Duração da etapa, em segundos (None enquanto em andamento).
+    linhas_entrada (int): Linhas recebidas pela etapa, se informado.
+    linhas_saida (int): Linhas produzidas pela etapa, se informado.
+    bytes (int): Bytes lidos ou gravados pela etapa, se informado.
+    """
+
+    def __init__(self, metricas: "Metricas", nome: str, linhas_entrada: Optional[int] = None) -> None:
+        self._metricas = metricas
+        self.nome = nome
+        self.inicio = None
+        self.duracao = None
+        self.linhas_entrada = linhas_entrada
+        self.linhas_saida = None
+        self.bytes = None
+        self.erro = None
+
+    def __enter__(self) -> "Etapa":
+        self._relogio = time.perf_counter()
+        self.inicio = self._relogio - self._metricas.relogio_inicial
+        return self
+
+    def __exit__(self, tipo_erro, *exc) -> None:
+        self.duracao = time.perf_counter() - self._relogio
+        if tipo_erro is not None:
+            self.erro = tipo_erro.__name__
+        self._metricas._registrar_etapa(self)
+
+    def como_dict(self) -> dict:
+        return {
+            "etapa": self.nome,
+            "inicio_s": round(self.inicio, 6),
+            "duracao_s": round(self.duracao, 6),
+            "linhas_entrada": self.linhas_entrada,
+            "linhas_saida": self.linhas_saida,
+            "bytes": self.bytes,
+            "erro": self.erro,
+        }
+
+
+class Metricas:
+    """
+    Coletor de métricas de uma execução do pipeline: spans de tempo por etapa, séries de
+    observações (com percentis p50/p95/p99) e contadores.
+
+    Uma única instância é compartilhada por `Scraping`, `MotorTriagem` e `CsvParaPdf`; ao
+    final, `salvar_json` grava o relatório da execução e `salvar_prometheus` grava as
+    métricas no formato textfile do Prometheus (node_exporter). É seguro para uso por
+    várias threads.
+
+    Atributos:
+    rotulos (dict): Rótulos fixos da execução (ex.: tipo de papel), incluídos nos relatórios.
+    """
+
+    def __init__(self, rotulos: Optional[dict] = None) -> None:
+        """
+        Inicializa um coletor vazio.
+
+        Parâmetros:
+        rotulos (dict): Rótulos fixos da execução (ex.: {'tipo': 'acoes'}).
+        """
+        self.rotulos = dict(rotulos or {})
+        self.relogio_inicial = time.perf_counter()
+        self.data_inicio = datetime.now()
+        self._trava = threading.Lock()
+        self._etapas = []
+        self._observacoes = {}
+        self._contadores = {}
+
+    def etapa(self, nome: str, linhas_entrada: Optional[int] = None) -> Etapa:
+        """
+        Cria um span de tempo para uma etapa, a ser usado com `with`. As linhas de saída e
+        os bytes podem ser informados no objeto devolvido antes do fim do bloco.
+
+        Parâmetros:
+        nome (str): Nome da etapa.
+        linhas_entrada (int): Linhas recebidas pela etapa.
+
+        Retorna:
+        Etapa: Span da etapa.
+        """
+        return Etapa(self, nome, linhas_entrada)
+
+    def _registrar_etapa(self, etapa: Etapa) -> None:
+        with self._trava:
+            self._etapas.append(etapa)
+
+    def observar(self, serie: str, valor: float) -> None:
+        """
+        Acrescenta uma observação a uma série (ex.: latência de cada ticker, em segundos).
+
+        Parâmetros:
+        serie (str): Nome da série.
+        valor (float): Valor observado.
+
+        Retorna:
+        None
+        """
+        with self._trava:
+            self._observacoes.setdefault(serie, []).append(valor)
+
+    def incrementar(self, contador: str, valor: float = 1) -> None:
+        """
+        Soma um valor a um contador (ex.: bytes baixados).
+
+        Parâmetros:
+        contador (str): Nome do contador.
+        valor (float): Valor a somar.
+
+        Retorna:
+        None
+        """
+        with self._trava:
+            self._contadores[contador] = self._contadores.get(contador, 0) + valor
+
+    @staticmethod
+    def _resumir_serie(valores: list) -> dict:
+        # Percentis com interpolação linear (como `numpy.percentile`), sem importar o numpy, que
+        # os subcomandos sem pandas (ex.: report) não carregariam
+        amostras = sorted(float(valor) for valor in valores)
+        resumo = {"quantidade": len(amostras), "soma": math.fsum(amostras), "max": amostras[-1]}
+        for percentil in PERCENTIS:
+            posicao = percentil / 100 * (len(amostras) - 1)
+            inferior = math.floor(posicao)
+            superior = min(inferior + 1, len(amostras) - 1)
+            resumo[f"p{percentil}"] = amostras[inferior] + (amostras[superior] - amostras[inferior]) * (posicao - inferior)
+        return resumo
+
+    def _agregar_etapas(self) -> dict:
+        agregadas = {}
+        for etapa in self._etapas:
+            agregada = agregadas.setdefault(etapa.nome, {
+                "execucoes": 0, "duracao_s": 0.0, "linhas_entrada": None, "linhas_saida": None, "bytes": None,
+            })
+            agregada["execucoes"] += 1
+            agregada["duracao_s"] += etapa.duracao
+            for campo in ("linhas_entrada", "linhas_saida", "bytes"):
+                valor = getattr(etapa, campo)
+                if valor is not None:
+                    agregada[campo] = (agregada[campo] or 0) + valor
+        for agregada in agregadas.values():
+            agregada["duracao_s"] = round(agregada["duracao_s"], 6)
+        return agregadas
+
+    def relatorio(self) -> dict:
+        """
+        Monta o relatório da execução.
+
+        Retorna:
+        dict: Rótulos, início e duração da execução, etapas agregadas por nome, spans na ordem
+        de conclusão, resumo de cada série (quantidade, soma, máximo, p50, p95, p99) e contadores.
+        """
+        with self._trava:
+            return {
+                "rotulos": self.rotulos,
+                "inicio": self.data_inicio.isoformat(timespec="seconds"),
+                "duracao_total_s": round(time.perf_counter() - self.relogio_inicial, 6),
+                "etapas": self._agregar_etapas(),
+                "spans": [etapa.como_dict() for etapa in self._etapas],
+                "series": {serie: self._resumir_serie(valores) for serie, valores in self._observacoes.items()},
+                "contadores": dict(self._contadores),
+            }
+
+    def salvar_json(self, caminho: str) -> str:
+        """
+        Grava o relatório da execução em JSON.
+
+        Parâmetros:
+        caminho (str): Caminho do arquivo.
+
+        Retorna:
+        str: Caminho do arquivo gravado.
+        """
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            json.dump(self.relatorio(), arquivo, ensure_ascii=False, indent=2)
+        return caminho
+
+    def como_prometheus(self) -> str:
+        """
+        Formata as métricas no formato de exposição de texto do Prometheus.
+
+        Retorna:
+        str: Métricas das etapas (gauges), séries (summaries com quantis) e contadores.
+        """
+        relatorio = self.relatorio()
+
+        def rotulos(**extras) -> str:
+            todos = {**relatorio["rotulos"], **extras}
+            if not todos:
+                return ""
+            pares = ",".join(f'{chave}="{escapar_rotulo(valor)}"' for chave, valor in todos.items())
+            return "{" + pares + "}"
+
+        linhas = []
+
+        def metrica(nome: str, tipo: str, descricao: str, amostras: list) -> None:
+            linhas.append(f"# HELP {PREFIXO_PROMETHEUS}_{nome} {descricao}")
+            linhas.append(f"# TYPE {PREFIXO_PROMETHEUS}_{nome} {tipo}")
+            for sufixo, rotulos_amostra, valor in amostras:
+                linhas.append(f"{PREFIXO_PROMETHEUS}_{nome}{sufixo}{rotulos_amostra} {valor}")
+
+        metrica("execucao_inicio_timestamp_segundos", "gauge", "Início da execução (epoch).",
+                [("", rotulos(), self.data_inicio.timestamp())])
+        metrica("execucao_duracao_segundos", "gauge", "Duração total da execução.",
+                [("", rotulos(), relatorio["duracao_total_s"])])
+
+        etapas = relatorio["etapas"]
+        metrica("etapa_duracao_segundos", "gauge", "Duração de cada etapa do pipeline.",
+                [("", rotulos(etapa=nome), dados["duracao_s"]) for nome, dados in etapas.items()])
+        for campo, descricao in (("linhas_entrada", "Linhas recebidas por etapa."),
+                                 ("linhas_saida", "Linhas produzidas por etapa."),
+                                 ("bytes", "Bytes lidos ou gravados por etapa.")):
+            amostras = [("", rotulos(etapa=nome), dados[campo]) for nome, dados in etapas.items()
+                        if dados[campo] is not None]
+            if amostras:
+                metrica(f"etapa_{campo}", "gauge", descricao, amostras)
+
+        for serie, resumo in relatorio["series"].items():
+            amostras = [("", rotulos(quantile=f"{percentil / 100:g}"), resumo[f"p{percentil}"])
+                        for percentil in PERCENTIS]
+            amostras += [("_sum", rotulos(), resumo["soma"]), ("_count", rotulos(), resumo["quantidade"])]
+            metrica(serie, "summary", f"Distribuição da série {serie}.", amostras)
+
+        for contador, valor in relatorio["contadores"].items():
+            metrica(contador, "gauge", f"Total de {contador} na execução.", [("", rotulos(), valor)])
+        return "\n".join(linhas) + "\n"
+
+    def salvar_prometheus(self, caminho: str) -> str:
+        """
+        Grava as métricas no formato textfile do Prometheus. O arquivo é escrito em um
+        temporário e renomeado, para que o coletor nunca leia um arquivo incompleto.
+
+        Parâmetros:
+        caminho (str): Caminho do arquivo (.prom), normalmente no diretório do textfile collector.
+
+        Retorna:
+        str: Caminho do arquivo gravado.
+        """
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+        temporario = f"{caminho}.tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            arquivo.write(self.como_prometheus())
+        os.replace(temporario, caminho)
+        return caminho
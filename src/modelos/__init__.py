@@ -3,3 +3,7 @@
 from .magicform import MagicForm
 from .decio_bazin import ModelBazin
 from .ben_grahan import ModelGrahan
+from .motor import MotorTriagem
+from .regras import RegraInvalidaError, RegraTriagem
+from .selecao import top_k, top_k_como_pandas, top_k_por_grupo
+from .varredura import carteiras_por_combinacao, varrer_parametros
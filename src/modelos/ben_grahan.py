@@ -1,7 +1,9 @@
 import pandas as pd
 import logging
 from datetime import datetime
+from armazenamento import ler_tabela
 from util import Utils
+from .regras import RegraTriagem
 
 
 class ModelGrahan:
@@ -21,47 +23,39 @@ class ModelGrahan:
         self.d_processados = f"{self.d_base}02_processados/"
         self.dfinal = f"{self.d_base}03_final/"
 
+    # Conjunto de regras do modelo (modelos/estrategias/ben_grahan.json)
+    REGRA = RegraTriagem.padrao("ben_grahan")
+
+    # Colunas numéricas usadas pelo modelo, convertidas antes da seleção
+    COLUNAS_NUMERICAS = REGRA.colunas_numericas
+
+    @staticmethod
+    def selecionar(tabela: pd.DataFrame) -> pd.DataFrame:
+        """
+        Aplica os filtros de Benjamin Graham sobre o dataset já tratado (colunas numéricas
+        convertidas e 'Div. Yield' em fração decimal), sem alterar o DataFrame recebido.
+
+        Parâmetros:
+        tabela (pandas.DataFrame): Dataset de ações com as colunas renomeadas.
+
+        Retorna:
+        pandas.DataFrame: Carteira recomendada, já formatada para gravação.
+        """
+        return ModelGrahan.REGRA.selecionar(tabela)
+
     def model_grahan(self):
         try:
             self.logger.info(f"Iniciando filtro de ações com base no modelo de Benjamin Graham")
             data_atual = datetime.now().strftime("%d_%m_%Y")
 
-            file_path = f'{self.d_processados}acoes_consolidados_tratados_renomeados_{data_atual}.csv'
-            tabela = pd.read_csv(file_path)
-
-            # Lista de colunas a serem tratadas
-            colunas_para_tratar = ["P/L", "LPA", "Cotação", "P/VP", "VPA",
-                                   "Vol $ méd (2m)"]
+            file_path = f'{self.d_processados}acoes_consolidados_tratados_renomeados_{data_atual}'
+            tabela = ler_tabela(file_path)
 
             # Aplicar limpeza e conversão de colunas
-            tabela = Utils.limpar_e_converter_colunas(tabela, colunas_para_tratar)
+            tabela = Utils.limpar_e_converter_colunas(tabela, self.COLUNAS_NUMERICAS)
             tabela = Utils.tratar_coluna_div_yield(tabela)
 
-            # - filtro adicional
-            tabela = tabela[tabela["P/L"] > 0]  # Lucro positivo
-
-            # definições de valores para filtros
-            constante = 22.5
-            liq_esperada = 1000000
-            tabela["LPA"] = tabela["Cotação"] / tabela["P/L"]
-            tabela["VPA"] = tabela["Cotação"] / tabela["P/VP"]
-            tabela["VI"] = round((constante * tabela["LPA"] * tabela["VPA"]) ** (1 / 2), 2)
-
-            # - filtro de valores segundo Benjamim Grahan
-            tabela = tabela[tabela["Vol $ méd (2m)"] > liq_esperada]  # Liquidez
-            tabela = tabela[tabela["Cotação"] < tabela["VI"]]  # Valor Intrinseco
-
-            # Tratamento do "Div. Yield"
-            por_cem = 100
-            tabela["Div. Yield"] = round(tabela["Div. Yield"] * por_cem, 2)
-
-            # ordenar valores mais relevantes
-            tabela = tabela.sort_values("VI")
-
-            tabela = tabela.head(10)[["Papel", "Cotação", "VI", "Div. Yield"]]
-
-            colunas_para_formatar = ['Cotação', 'VI', 'Div. Yield']
-            tabela = Utils.formatar_como_moeda(tabela, colunas_para_formatar)
+            tabela = self.selecionar(tabela)
 
             # salvando carteira em csv
             tabela.to_csv(f"{self.dfinal}csv/recomendacao_ben_grahan_{data_atual}.csv", index=False)
@@ -1,6 +1,8 @@
 import pandas as pd
 import logging
+from armazenamento import ler_tabela
 from util import Utils
+from .regras import RegraTriagem
 from datetime import datetime
 
 
@@ -20,49 +22,38 @@ class ModelBazin:
         self.d_processados = f"{self.d_base}02_processados/"
         self.dfinal = f"{self.d_base}03_final/"
 
-    def model_bazin(self):
-        try:
-            self.logger.info(f"Iniciando filtro de ações com base no modelo de Decio Bazin")
-            data_atual = datetime.now().strftime("%d_%m_%Y")
-            file_path = f'{self.d_processados}acoes_consolidados_tratados_renomeados_{data_atual}.csv'
-
-            tabela = pd.read_csv(file_path)
-
-            # Lista de colunas a serem tratadas
-            colunas_para_tratar = ["Cotação", "P/EBIT", "Vol $ méd (2m)",
-                                   "Div Br/ Patrim", "P/L"]
+    # Conjunto de regras do modelo (modelos/estrategias/decio_bazin.json)
+    REGRA = RegraTriagem.padrao("decio_bazin")
 
-            tabela = Utils.limpar_e_converter_colunas(tabela, colunas_para_tratar)
-            tabela = Utils.tratar_coluna_div_yield(tabela)
+    # Colunas numéricas usadas pelo modelo, convertidas antes da seleção
+    COLUNAS_NUMERICAS = REGRA.colunas_numericas
 
-            # definições de valores para filtros
-            liq_esperada = 1000000
-            dy_esperado = 0.06
-            tabela["3xEBIT"] = 3 * (tabela["Cotação"] / tabela["P/EBIT"])
-            tabela["Lucro"] = tabela["Cotação"] * tabela["Div. Yield"]
-            tabela["Preço Justo"] = round(tabela["Lucro"] / dy_esperado, 2)
+    @staticmethod
+    def selecionar(tabela: pd.DataFrame) -> pd.DataFrame:
+        """
+        Aplica os filtros de Décio Bazin sobre o dataset já tratado (colunas numéricas
+        convertidas e 'Div. Yield' em fração decimal), sem alterar o DataFrame recebido.
 
-            # - filtro de valores segundo Décio Bazin
-            tabela = tabela[tabela["Vol $ méd (2m)"] > liq_esperada]  # Liquidez
-            tabela = tabela[tabela["Div. Yield"] > dy_esperado]  # Cash Div. Yield
-            tabela = tabela[tabela["Div Br/ Patrim"] < tabela["3xEBIT"]]  # Endividamento
-            tabela = tabela[tabela["Preço Justo"] > tabela["Cotação"]]  # Preço Justo
+        Parâmetros:
+        tabela (pandas.DataFrame): Dataset de ações com as colunas renomeadas.
 
-            # filtro adicional
-            tabela = tabela[tabela["P/L"] > 0]  # Lucro positivo
+        Retorna:
+        pandas.DataFrame: Carteira recomendada, já formatada para gravação.
+        """
+        return ModelBazin.REGRA.selecionar(tabela)
 
-            # Tratamento do "Div.Div. Yield"
-            por_cem = 100
-            tabela["Div. Yield"] = round(tabela["Div. Yield"] * por_cem, 2)
+    def model_bazin(self):
+        try:
+            self.logger.info(f"Iniciando filtro de ações com base no modelo de Decio Bazin")
+            data_atual = datetime.now().strftime("%d_%m_%Y")
+            file_path = f'{self.d_processados}acoes_consolidados_tratados_renomeados_{data_atual}'
 
-            # ordenar por valores mais relevantes
-            tabela = tabela.sort_values("Preço Justo")
+            tabela = ler_tabela(file_path)
 
-            # gerar carteira
-            tabela = tabela.head(10)[["Papel", "Cotação", "Preço Justo", "Div. Yield"]]
+            tabela = Utils.limpar_e_converter_colunas(tabela, self.COLUNAS_NUMERICAS)
+            tabela = Utils.tratar_coluna_div_yield(tabela)
 
-            colunas_para_formatar = ['Cotação', 'Preço Justo', 'Div. Yield']
-            tabela = Utils.formatar_como_moeda(tabela, colunas_para_formatar)
+            tabela = self.selecionar(tabela)
 
             tabela.to_csv(f"{self.dfinal}csv/recomendacao_decio_bazin_{data_atual}.csv", index=False)
 
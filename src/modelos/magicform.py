@@ -3,7 +3,9 @@ from typing import Optional
 import pandas as pd
 import logging
 
+from armazenamento import ler_tabela
 from util import Utils
+from .regras import RegraTriagem
 from datetime import datetime
 
 
@@ -24,43 +26,40 @@ class MagicForm:
         self.d_processados = f"{self.d_base}02_processados/"
         self.dfinal = f"{self.d_base}03_final/"
 
+    # Conjunto de regras do modelo (modelos/estrategias/magic_form.json)
+    REGRA = RegraTriagem.padrao("magic_form")
+
+    # Colunas numéricas usadas pelo modelo, convertidas antes da seleção
+    COLUNAS_NUMERICAS = REGRA.colunas_numericas
+
+    @staticmethod
+    def selecionar(tabela: pd.DataFrame) -> pd.DataFrame:
+        """
+        Aplica a Magic Formula sobre o dataset já tratado (colunas numéricas convertidas),
+        sem alterar o DataFrame recebido.
+
+        Parâmetros:
+        tabela (pandas.DataFrame): Dataset de ações com as colunas renomeadas.
+
+        Retorna:
+        pandas.DataFrame: Carteira recomendada, já formatada para gravação.
+        """
+        return MagicForm.REGRA.selecionar(tabela)
+
     def magic_form(self) -> Optional[bool]:
 
         try:
             self.logger.info(f"Iniciando filtro de ações com base no modelo de Magic Form")
             data_atual = datetime.now().strftime("%d_%m_%Y")
-            file_path = f'{self.d_processados}acoes_consolidados_tratados_renomeados_{data_atual}.csv'
+            file_path = f'{self.d_processados}acoes_consolidados_tratados_renomeados_{data_atual}'
 
-            tabela = pd.read_csv(file_path)
-
-            # Lista de colunas a serem tratadas
-            colunas_para_tratar = ["ROIC", "Cotação", "Vol $ méd (2m)", "EV / EBIT"]
+            tabela = ler_tabela(file_path)
 
             # Chamando os métodos estáticos diretamente pela classe, sem a necessidade de instanciar
-            tabela = Utils.limpar_e_converter_colunas(tabela, colunas_para_tratar)
+            tabela = Utils.limpar_e_converter_colunas(tabela, self.COLUNAS_NUMERICAS)
             tabela = Utils.tratar_coluna_div_yield(tabela)
 
-            # filtrar colunas
-            tabela = tabela[["Papel", "Cotação", "EV / EBIT", "ROIC", "Vol $ méd (2m)"]]
-
-            # construção da carteira
-            tabela = tabela[tabela["Vol $ méd (2m)"] > 1000000]
-            tabela = tabela[tabela["EV / EBIT"] > 0]
-            tabela = tabela[tabela["ROIC"] > 0]
-
-            # rankear indices
-            tabela["ranking_ev_ebit"] = tabela["EV / EBIT"].rank(ascending=True)
-            tabela["ranking_ev_roic"] = tabela["ROIC"].rank(ascending=False)
-            tabela["ranking_final"] = tabela["ranking_ev_roic"] + tabela["ranking_ev_ebit"]
-
-            # - ordenar valores mais relevantes
-            tabela = tabela.sort_values("ranking_final")
-            tabela = tabela.head(10)[
-                ["Papel", "Cotação", "EV / EBIT", "ROIC", "Vol $ méd (2m)", "ranking_final"]
-            ]
-
-            colunas_para_formatar = ['Cotação', 'EV / EBIT', 'ROIC', 'Vol $ méd (2m)']
-            tabela = Utils.formatar_como_moeda(tabela, colunas_para_formatar)
+            tabela = self.selecionar(tabela)
 
             tabela.to_csv(f"{self.dfinal}csv/recomendacao_magic_form_{data_atual}.csv", index=False)
             self.logger.info(f"Finalizando filtro de ações com base no modelo de Magic Form")
@@ -0,0 +1,234 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Optional, Union
+
+import pandas as pd
+
+from armazenamento import ler_tabela
+from metricas import Metricas
+from util import Utils
+from .ben_grahan import ModelGrahan
+from .decio_bazin import ModelBazin
+from .magicform import MagicForm
+from .regras import RegraTriagem
+from .varredura import varrer_parametros
+
+# Modelos executados por padrão, na ordem em que eram chamados pelo main.py
+MODELOS_PADRAO = {
+    "ben_grahan": ModelGrahan,
+    "magic_form": MagicForm,
+    "decio_bazin": ModelBazin,
+}
+
+
+class MotorTriagem:
+    """
+    Motor de triagem que carrega e trata o dataset de ações uma única vez e executa sobre
+    ele qualquer número de modelos registrados.
+
+    As colunas numéricas são convertidas na carga e mantidas em arrays somente leitura,
+    compartilhados por todos os modelos; cada modelo recebe o mesmo DataFrame e devolve a
+    sua carteira sem alterá-lo, o que permite executá-los em threads paralelas.
+
+    Atributos:
+    dados (pandas.DataFrame): Dataset tratado, com as colunas numéricas somente leitura.
+    modelos (dict): Modelos registrados (nome -> função de seleção).
+    regras (dict): Conjuntos de regras dos modelos declarativos (nome -> RegraTriagem).
+    metricas (Metricas): Coletor de métricas (spans da preparação e de cada modelo).
+    """
+
+    def __init__(
+            self,
+            dados: Union[pd.DataFrame, str],
+            logger_level: int = logging.INFO,
+            registrar_padrao: bool = True,
+            metricas: Optional[Metricas] = None,
+    ) -> None:
+        """
+        Inicializa o motor com o dataset de ações.
+
+        Parâmetros:
+        dados (pandas.DataFrame or str): Dataset com as colunas renomeadas, ou caminho do arquivo
+            (com ou sem extensão).
+        logger_level (int): Nível de registro do logger.
+        registrar_padrao (bool): Se verdadeiro, registra os modelos Graham, Magic Formula e Bazin.
+        metricas (Metricas): Coletor de métricas compartilhado com as demais etapas; se omitido,
+            um novo é criado.
+        """
+        self.logger_level = logger_level
+        self.logger = Utils.log_config(logger_level=self.logger_level)
+
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+        self.logger = logging.getLogger(__name__)
+
+        self.metricas = metricas or Metricas()
+        self.modelos = {}
+        self.regras = {}
+        self.colunas_numericas = []
+        self.dados = None
+        if registrar_padrao:
+            for nome, modelo in MODELOS_PADRAO.items():
+                self.registrar(nome, modelo.selecionar, modelo.COLUNAS_NUMERICAS)
+                self.regras[nome] = modelo.REGRA
+
+        if isinstance(dados, str):
+            self.logger.info(f"Carregando dataset de triagem de {dados}")
+            dados = ler_tabela(dados)
+        with self.metricas.etapa("modelos.preparacao", len(dados)) as etapa:
+            self.dados = self.preparar(dados, self.colunas_numericas)
+            etapa.linhas_saida = len(self.dados)
+
+    def registrar(self, nome: str, selecionar: Callable[[pd.DataFrame], pd.DataFrame],
+                  colunas_numericas: Optional[list] = None) -> None:
+        """
+        Registra um modelo de triagem.
+
+        Parâmetros:
+        nome (str): Nome do modelo, usado no nome do arquivo de recomendação.
+        selecionar (callable): Função que recebe o dataset tratado e devolve a carteira,
+            sem alterar o DataFrame recebido.
+        colunas_numericas (list): Colunas que o modelo precisa convertidas para float.
+
+        Retorna:
+        None
+        """
+        self.modelos[nome] = selecionar
+        novas = [col for col in colunas_numericas or [] if col not in self.colunas_numericas]
+        self.colunas_numericas.extend(novas)
+        if novas and self.dados is not None:
+            self.dados = self.preparar(self.dados, novas, tratar_div_yield=False)
+
+    def registrar_regra(self, regra: Union[RegraTriagem, dict, str]) -> RegraTriagem:
+        """
+        Registra um modelo descrito por um conjunto de regras declarativas.
+
+        Parâmetros:
+        regra (RegraTriagem, dict or str): Conjunto de regras, já compilado, como dict ou como
+            caminho de um arquivo JSON/YAML.
+
+        Retorna:
+        RegraTriagem: Conjunto de regras registrado.
+        """
+        if isinstance(regra, str):
+            regra = RegraTriagem.de_arquivo(regra)
+        elif isinstance(regra, dict):
+            regra = RegraTriagem(regra)
+        self.registrar(regra.nome, regra.selecionar, regra.colunas_numericas)
+        self.regras[regra.nome] = regra
+        return regra
+
+    @staticmethod
+    def preparar(dados: pd.DataFrame, colunas: list, tratar_div_yield: bool = True) -> pd.DataFrame:
+        """
+        Converte as colunas informadas e a coluna 'Div. Yield' (em fração decimal), tornando
+        somente leitura os arrays de todas as colunas numéricas.
+
+        Parâmetros:
+        dados (pandas.DataFrame): Dataset com as colunas renomeadas.
+        colunas (list): Colunas a converter para float.
+        tratar_div_yield (bool): Se verdadeiro, converte 'Div. Yield' para fração decimal.
+
+        Retorna:
+        pandas.DataFrame: Novo DataFrame com o dataset tratado.
+        """
+        dados = Utils.limpar_e_converter_colunas(dados.copy(), colunas)
+        if tratar_div_yield and "Div. Yield" in dados.columns:
+            dados = Utils.tratar_coluna_div_yield(dados)
+
+        arrays = {}
+        for coluna in dados.columns:
+            valores = dados[coluna].to_numpy(copy=True)
+            if pd.api.types.is_numeric_dtype(valores):
+                valores.flags.writeable = False
+            arrays[coluna] = valores
+        return pd.DataFrame(arrays, index=dados.index, copy=False)
+
+    def executar(self, nomes: Optional[list] = None, paralelo: bool = True,
+                 max_threads: Optional[int] = None) -> dict:
+        """
+        Executa os modelos registrados sobre o dataset carregado.
+
+        Parâmetros:
+        nomes (list): Modelos a executar; por padrão, todos os registrados.
+        paralelo (bool): Se verdadeiro, executa os modelos em threads paralelas.
+        max_threads (int): Número máximo de threads; por padrão, uma por modelo.
+
+        Retorna:
+        dict: Carteira de cada modelo (nome -> DataFrame), na ordem de registro.
+        """
+        nomes = list(nomes or self.modelos)
+
+        def executar_modelo(nome: str) -> pd.DataFrame:
+            self.logger.info(f"Executando modelo de triagem '{nome}'")
+            with self.metricas.etapa(f"modelo.{nome}", len(self.dados)) as etapa:
+                carteira = self.modelos[nome](self.dados)
+                etapa.linhas_saida = len(carteira)
+            return carteira
+
+        if paralelo and len(nomes) > 1:
+            with ThreadPoolExecutor(max_workers=max_threads or len(nomes)) as executor:
+                carteiras = list(executor.map(executar_modelo, nomes))
+        else:
+            carteiras = [executar_modelo(nome) for nome in nomes]
+
+        return dict(zip(nomes, carteiras))
+
+    def executar_por_grupo(self, coluna_grupo: str = "Setor", nomes: Optional[list] = None,
+                           limite: Optional[int] = None) -> dict:
+        """
+        Executa os modelos declarativos devolvendo os primeiros colocados de cada grupo (ex.:
+        setor), com todos os grupos selecionados de uma vez (ver `RegraTriagem.selecionar_por_grupo`).
+
+        Parâmetros:
+        coluna_grupo (str): Coluna que define os grupos ('Setor' ou 'Subsetor').
+        nomes (list): Modelos a executar; por padrão, todos os que possuem conjunto de regras.
+        limite (int): Número de papéis por grupo; por padrão, o `limite` de cada modelo.
+
+        Retorna:
+        dict: Carteiras por grupo de cada modelo (nome -> DataFrame).
+        """
+        carteiras = {}
+        for nome in nomes or list(self.regras):
+            if nome not in self.regras:
+                raise KeyError(f"Modelo '{nome}' não possui conjunto de regras para seleção por grupo.")
+            with self.metricas.etapa(f"modelo.{nome}.{coluna_grupo.lower()}", len(self.dados)) as etapa:
+                carteiras[nome] = self.regras[nome].selecionar_por_grupo(self.dados, coluna_grupo, limite=limite)
+                etapa.linhas_saida = len(carteiras[nome])
+        return carteiras
+
+    def varrer(self, grades: dict, limites: tuple = (10,)) -> pd.DataFrame:
+        """
+        Avalia os modelos para todas as combinações das grades de parâmetros sobre o dataset
+        carregado, sem relê-lo ou tratá-lo novamente (ver `varredura.varrer_parametros`).
+
+        Parâmetros:
+        grades (dict): Grade de cada modelo (nome do modelo -> {parâmetro: valores}).
+        limites (tuple): Tamanhos de carteira (top-N) avaliados para cada combinação.
+
+        Retorna:
+        pandas.DataFrame: Uma linha por papel selecionado em cada combinação e limite.
+        """
+        return varrer_parametros(self.dados, grades, limites=limites)
+
+    def salvar(self, carteiras: dict, diretorio: str, data: Optional[str] = None) -> list:
+        """
+        Grava as carteiras como `recomendacao_<nome>_<data>.csv`.
+
+        Parâmetros:
+        carteiras (dict): Resultado de `executar`.
+        diretorio (str): Diretório de saída (ex.: './dados/03_final/csv/').
+        data (str): Data no formato dd_mm_yyyy; por padrão, a data atual.
+
+        Retorna:
+        list: Caminhos dos arquivos gravados.
+        """
+        data = data or datetime.now().strftime("%d_%m_%Y")
+        caminhos = []
+        for nome, carteira in carteiras.items():
+            caminho = os.path.join(diretorio, f"recomendacao_{nome}_{data}.csv")
+            carteira.to_csv(caminho, index=False)
+            caminhos.append(caminho)
+        self.logger.info(f"{len(caminhos)} carteiras gravadas em {diretorio}")
+        return caminhos
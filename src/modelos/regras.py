@@ -0,0 +1,526 @@
+import ast
+import json
+import os
+import re
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from util import Utils
+from .selecao import top_k, top_k_como_pandas, top_k_por_grupo
+
+try:
+    import yaml
+except ImportError:  # PyYAML é opcional; sem ele as regras são lidas apenas em JSON
+    yaml = None
+
+# Diretório dos conjuntos de regras dos modelos padrão
+DIRETORIO_ESTRATEGIAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "estrategias")
+
+# Nomes de colunas fora do padrão de identificadores são escritos entre crases: `P/L`
+_PADRAO_COLUNA = re.compile(r"`([^`]+)`")
+
+
+def _rank(valores: np.ndarray) -> np.ndarray:
+    """
+    Ranking crescente ao longo do último eixo, com empates pela média das posições e NaN
+    mantido, como `pandas.Series.rank()`. Para ranking decrescente, use `rank(-coluna)`.
+    Com arrays 2D (uma linha por combinação de parâmetros), cada linha é ranqueada à parte.
+    """
+    valores = np.asarray(valores, dtype="float64")
+    tamanho = valores.shape[-1] if valores.ndim else 0
+    if tamanho == 0:
+        return valores.copy()
+
+    # A ordenação estável coloca os NaN ao final de cada linha
+    ordem = np.argsort(valores, axis=-1, kind="stable")
+    ordenados = np.take_along_axis(valores, ordem, axis=-1)
+    posicoes = np.arange(tamanho)
+    inicio_grupo = np.ones(ordenados.shape, dtype=bool)
+    inicio_grupo[..., 1:] = ordenados[..., 1:] != ordenados[..., :-1]
+    fim_grupo = np.ones(ordenados.shape, dtype=bool)
+    fim_grupo[..., :-1] = inicio_grupo[..., 1:]
+    # Primeira e última posição do grupo de empates de cada elemento
+    inicios = np.maximum.accumulate(np.where(inicio_grupo, posicoes, 0), axis=-1)
+    fins = np.minimum.accumulate(np.where(fim_grupo, posicoes, tamanho - 1)[..., ::-1], axis=-1)[..., ::-1]
+    medias = (inicios + fins) / 2 + 1
+    medias[np.isnan(ordenados)] = np.nan
+
+    ranking = np.empty_like(valores)
+    np.put_along_axis(ranking, ordem, medias, axis=-1)
+    return ranking
+
+
+# Funções disponíveis nas expressões das regras
+FUNCOES = {
+    "round": np.round,
+    "abs": np.abs,
+    "sqrt": np.sqrt,
+    "log": np.log,
+    "minimo": np.fmin,
+    "maximo": np.fmax,
+    "rank": _rank,
+}
+
+_OPERADORES_PERMITIDOS = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Compare, ast.BoolOp, ast.Call, ast.Name, ast.Load,
+    ast.Constant, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.FloorDiv, ast.USub, ast.UAdd,
+    ast.Not, ast.Invert, ast.BitAnd, ast.BitOr, ast.And, ast.Or, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq,
+    ast.NotEq,
+)
+
+
+class RegraInvalidaError(ValueError):
+    """Conjunto de regras com expressão inválida ou referência desconhecida."""
+
+
+class _OperadoresVetoriais(ast.NodeTransformer):
+    """Reescreve `and`, `or`, `not` e comparações encadeadas como operações elemento a elemento."""
+
+    def visit_BoolOp(self, no: ast.BoolOp) -> ast.AST:
+        self.generic_visit(no)
+        operador = ast.BitAnd() if isinstance(no.op, ast.And) else ast.BitOr()
+        resultado = no.values[0]
+        for valor in no.values[1:]:
+            resultado = ast.BinOp(left=resultado, op=operador, right=valor)
+        return resultado
+
+    def visit_UnaryOp(self, no: ast.UnaryOp) -> ast.AST:
+        self.generic_visit(no)
+        if isinstance(no.op, ast.Not):
+            return ast.UnaryOp(op=ast.Invert(), operand=no.operand)
+        return no
+
+    def visit_Compare(self, no: ast.Compare) -> ast.AST:
+        self.generic_visit(no)
+        if len(no.ops) == 1:
+            return no
+        termos = [no.left] + no.comparators
+        comparacoes = [ast.Compare(left=esquerda, ops=[operador], comparators=[direita])
+                       for esquerda, operador, direita in zip(termos, no.ops, termos[1:])]
+        return self.visit_BoolOp(ast.BoolOp(op=ast.And(), values=comparacoes))
+
+
+class Expressao:
+    """
+    Expressão de uma regra, compilada para avaliação vetorizada sobre arrays numpy.
+
+    A sintaxe é a de expressões Python: operadores aritméticos, comparações, `and`/`or`/`not`
+    (aplicados elemento a elemento) e as funções de `FUNCOES`. Nomes de colunas que não são
+    identificadores válidos são escritos entre crases (ex.: `Vol $ méd (2m)` > liq_esperada).
+
+    Atributos:
+    texto (str): Expressão original.
+    nomes (list): Colunas e parâmetros referenciados pela expressão.
+    """
+
+    def __init__(self, texto: str) -> None:
+        """
+        Valida e compila a expressão.
+
+        Parâmetros:
+        texto (str): Expressão da regra.
+        """
+        self.texto = texto
+        self._apelidos = {}
+
+        def apelidar(correspondencia: re.Match) -> str:
+            nome = correspondencia.group(1)
+            return self._apelidos.setdefault(nome, f"_coluna_{len(self._apelidos)}")
+
+        codigo = _PADRAO_COLUNA.sub(apelidar, texto)
+        try:
+            arvore = ast.parse(codigo, mode="eval")
+        except SyntaxError as e:
+            raise RegraInvalidaError(f"Expressão inválida '{texto}': {e.msg}") from e
+
+        for no in ast.walk(arvore):
+            if not isinstance(no, _OPERADORES_PERMITIDOS):
+                raise RegraInvalidaError(f"Construção não permitida em '{texto}': {type(no).__name__}")
+            if isinstance(no, ast.Call) and not (isinstance(no.func, ast.Name) and no.func.id in FUNCOES):
+                raise RegraInvalidaError(f"Função não permitida em '{texto}'. Funções válidas: {', '.join(FUNCOES)}.")
+            if isinstance(no, ast.Constant) and not isinstance(no.value, (int, float, bool)):
+                raise RegraInvalidaError(f"Constante não numérica em '{texto}': {no.value!r}")
+
+        chamadas = {no.func.id for no in ast.walk(arvore) if isinstance(no, ast.Call)}
+        originais = {apelido: nome for nome, apelido in self._apelidos.items()}
+        self.nomes = list(dict.fromkeys(
+            originais.get(no.id, no.id) for no in ast.walk(arvore)
+            if isinstance(no, ast.Name) and no.id not in chamadas
+        ))
+        arvore = ast.fix_missing_locations(_OperadoresVetoriais().visit(arvore))
+        self._codigo = compile(arvore, f"<regra: {texto}>", "eval")
+
+    def avaliar(self, valores: dict):
+        """
+        Avalia a expressão.
+
+        Parâmetros:
+        valores (dict): Colunas (nome -> array) e parâmetros (nome -> número) referenciados.
+
+        Retorna:
+        numpy.ndarray or float: Resultado da expressão.
+        """
+        escopo = dict(FUNCOES)
+        for nome in self.nomes:
+            escopo[self._apelidos.get(nome, nome)] = valores[nome]
+        with np.errstate(all="ignore"):
+            return eval(self._codigo, {"__builtins__": {}}, escopo)
+
+
+class RegraTriagem:
+    """
+    Modelo de triagem descrito por um conjunto de regras declarativas (dict, JSON ou YAML).
+
+    As etapas são aplicadas nesta ordem:
+        - calculos: colunas derivadas (ex.: VI de Graham), calculadas sobre todos os papéis;
+        - filtros: condições combinadas em uma única máscara booleana;
+        - pontuacao: colunas calculadas apenas sobre os papéis aprovados (ex.: `rank`);
+        - ordenar_por / crescente / limite: ordenação e corte dos primeiros colocados;
+        - formatacao: colunas recalculadas sobre a carteira (ex.: Div. Yield em %);
+        - colunas / moeda: colunas da carteira e as formatadas como moeda.
+
+    As expressões podem usar as colunas do dataset, as colunas já calculadas e os valores de
+    `parametros`. A avaliação é feita sobre arrays numpy, sem cópias intermediárias do DataFrame.
+
+    Exemplo:
+        {
+            "nome": "ben_grahan",
+            "parametros": {"constante": 22.5, "liq_esperada": 1000000},
+            "calculos": {"VI": "round((constante * `Cotação` ** 2 / (`P/L` * `P/VP`)) ** 0.5, 2)"},
+            "filtros": ["`P/L` > 0", "`Vol $ méd (2m)` > liq_esperada", "`Cotação` < VI"],
+            "ordenar_por": "VI",
+            "limite": 10,
+            "colunas": ["Papel", "Cotação", "VI"]
+        }
+
+    Atributos:
+    nome (str): Nome do modelo, usado no nome do arquivo de recomendação.
+    parametros (dict): Valores padrão dos parâmetros das expressões.
+    colunas_numericas (list): Colunas do dataset que precisam estar convertidas para float.
+    """
+
+    def __init__(self, especificacao: dict) -> None:
+        """
+        Valida e compila o conjunto de regras.
+
+        Parâmetros:
+        especificacao (dict): Conjunto de regras (ver a documentação da classe).
+        """
+        desconhecidas = set(especificacao) - {
+            "nome", "descricao", "parametros", "calculos", "filtros", "pontuacao", "ordenar_por", "crescente",
+            "limite", "formatacao", "colunas", "moeda", "colunas_numericas",
+        }
+        if desconhecidas:
+            raise RegraInvalidaError(f"Chaves desconhecidas no conjunto de regras: {', '.join(sorted(desconhecidas))}")
+        if "nome" not in especificacao:
+            raise RegraInvalidaError("O conjunto de regras deve ter um 'nome'.")
+
+        self.especificacao = especificacao
+        self.nome = especificacao["nome"]
+        self.descricao = especificacao.get("descricao", "")
+        self.parametros = dict(especificacao.get("parametros", {}))
+        self.calculos = {nome: Expressao(texto) for nome, texto in especificacao.get("calculos", {}).items()}
+        self.filtros = [Expressao(texto) for texto in especificacao.get("filtros", [])]
+        # Os filtros são fundidos em uma única expressão, avaliada de uma vez
+        self.mascara_fundida = Expressao(" & ".join(f"({filtro.texto})" for filtro in self.filtros)) \
+            if self.filtros else None
+        self.pontuacao = {nome: Expressao(texto) for nome, texto in especificacao.get("pontuacao", {}).items()}
+        self.ordenar_por = especificacao.get("ordenar_por")
+        self.crescente = especificacao.get("crescente", True)
+        self.limite = especificacao.get("limite")
+        self.formatacao = {nome: Expressao(texto) for nome, texto in especificacao.get("formatacao", {}).items()}
+        self.colunas = especificacao.get("colunas")
+        self.moeda = especificacao.get("moeda", [])
+
+        calculadas = set(self.calculos) | set(self.pontuacao)
+        referenciadas = [
+            nome
+            for expressoes in (self.calculos.values(), self.filtros, self.pontuacao.values(), self.formatacao.values())
+            for expressao in expressoes for nome in expressao.nomes
+        ]
+        self.colunas_dataset = list(dict.fromkeys(
+            nome for nome in referenciadas + [self.ordenar_por] + list(self.colunas or [])
+            if nome is not None and nome not in calculadas and nome not in self.parametros
+        ))
+        # Colunas que definem a seleção (sem as de formatação e apresentação da carteira)
+        self.colunas_criterio = list(dict.fromkeys(
+            nome
+            for expressoes in (self.calculos.values(), self.filtros, self.pontuacao.values())
+            for expressao in expressoes for nome in expressao.nomes
+            if nome not in calculadas and nome not in self.parametros
+        ))
+        if self.ordenar_por is not None and self.ordenar_por not in calculadas:
+            self.colunas_criterio = list(dict.fromkeys(self.colunas_criterio + [self.ordenar_por]))
+        self.colunas_numericas = especificacao.get(
+            "colunas_numericas", [col for col in self.colunas_dataset if col not in ("Papel", "Div. Yield")])
+
+    @classmethod
+    def de_arquivo(cls, caminho: str) -> "RegraTriagem":
+        """
+        Carrega um conjunto de regras de um arquivo JSON ou YAML (.yaml/.yml, requer PyYAML).
+
+        Parâmetros:
+        caminho (str): Caminho do arquivo.
+
+        Retorna:
+        RegraTriagem: Conjunto de regras compilado.
+        """
+        with open(caminho, encoding="utf-8") as arquivo:
+            if os.path.splitext(caminho)[1] in (".yaml", ".yml"):
+                if yaml is None:
+                    raise ImportError(f"PyYAML não instalado; não é possível ler '{caminho}'.")
+                return cls(yaml.safe_load(arquivo))
+            return cls(json.load(arquivo))
+
+    @classmethod
+    def padrao(cls, nome: str) -> "RegraTriagem":
+        """
+        Carrega um dos conjuntos de regras distribuídos em `DIRETORIO_ESTRATEGIAS`.
+
+        Parâmetros:
+        nome (str): Nome do modelo (ex.: 'ben_grahan').
+
+        Retorna:
+        RegraTriagem: Conjunto de regras compilado.
+        """
+        return cls.de_arquivo(os.path.join(DIRETORIO_ESTRATEGIAS, f"{nome}.json"))
+
+    @staticmethod
+    def _valores(tabela: pd.DataFrame, colunas: list, parametros: dict) -> dict:
+        valores = dict(parametros)
+        for coluna in colunas:
+            if coluna not in valores:
+                if coluna not in tabela.columns:
+                    raise RegraInvalidaError(f"Coluna '{coluna}' não encontrada no dataset.")
+                valores[coluna] = tabela[coluna].to_numpy()
+        return valores
+
+    def calcular(self, tabela: pd.DataFrame, parametros: Optional[dict] = None) -> dict:
+        """
+        Calcula as colunas derivadas e a máscara dos filtros sobre todos os papéis.
+
+        Parâmetros:
+        tabela (pandas.DataFrame): Dataset tratado (colunas numéricas convertidas e 'Div. Yield'
+            em fração decimal).
+        parametros (dict): Valores que substituem os parâmetros padrão.
+
+        Retorna:
+        dict: Colunas do dataset e calculadas (nome -> array), com a máscara em '_mascara'.
+        """
+        valores = self._valores(tabela, self.colunas_dataset, {**self.parametros, **(parametros or {})})
+        return self._calcular_valores(valores, len(tabela))
+
+    def _calcular_valores(self, valores: dict, forma) -> dict:
+        for nome, expressao in self.calculos.items():
+            valores[nome] = expressao.avaliar(valores)
+        if self.mascara_fundida is None:
+            valores["_mascara"] = np.ones(forma, dtype=bool)
+        else:
+            valores["_mascara"] = np.asarray(self.mascara_fundida.avaliar(valores), dtype=bool)
+        return valores
+
+    def _classificar_em_lote(self, valores: dict, forma: tuple, limite: Optional[int],
+                             ordem: Optional[np.ndarray] = None) -> tuple:
+        """
+        Classifica cada linha de matrizes (lotes x papéis) de forma independente: a máscara, a
+        pontuação e a ordenação são aplicadas por linha, com empates desfeitos pela posição ou,
+        com `ordem`, como em `selecionar` sobre os papéis nessa ordem (ver `_desempatar`).
+        """
+        mascara = np.broadcast_to(valores.pop("_mascara"), forma)
+        quantidade = mascara.sum(axis=1)
+
+        # A pontuação (ex.: `rank`) considera apenas os papéis aprovados em cada linha
+        for nome, expressao in self.pontuacao.items():
+            entradas = {
+                chave: np.where(mascara, valores[chave], np.nan)
+                if isinstance(valores[chave], np.ndarray) and valores[chave].dtype.kind == "f" else valores[chave]
+                for chave in expressao.nomes
+            }
+            valores[nome] = expressao.avaliar(entradas)
+
+        limite = self.limite if limite is None else limite
+        limite = forma[1] if limite is None else min(int(limite), forma[1])
+        if self.ordenar_por is None:
+            criterio = np.zeros(forma)
+        else:
+            criterio = np.broadcast_to(np.asarray(valores[self.ordenar_por], dtype="float64"), forma)
+        # Seleção parcial dos primeiros colocados entre os aprovados de cada linha (NaN ao final)
+        posicoes = top_k(criterio, limite, self.crescente, mascara)
+        valores_criterio = np.where(posicoes >= 0, np.take_along_axis(criterio, np.maximum(posicoes, 0), axis=1),
+                                    np.nan)
+        if ordem is not None:
+            self._desempatar(posicoes, valores_criterio, criterio, mascara, ordem)
+        return posicoes, quantidade, valores_criterio
+
+    def _desempatar(self, posicoes: np.ndarray, valores_criterio: np.ndarray, criterio: np.ndarray,
+                    mascara: np.ndarray, ordem: np.ndarray) -> None:
+        """
+        Refaz, no lugar, a seleção das linhas cujo resultado depende da ordem dos empates, com os
+        aprovados na ordem dada por `ordem` e a mesma regra de `selecionar` (`top_k_como_pandas`).
+        """
+        preenchidas = posicoes >= 0
+        if self.ordenar_por is None:
+            refazer = np.ones(len(posicoes), dtype=bool)
+        else:
+            # Mesmas condições de `top_k_como_pandas`: NaN selecionado, empate entre os
+            # selecionados ou empate com o último selecionado fora da carteira
+            nulos = (preenchidas & np.isnan(valores_criterio)).any(axis=1)
+            internos = (valores_criterio[:, 1:] == valores_criterio[:, :-1]).any(axis=1)
+            ultimo = valores_criterio[np.arange(len(posicoes)), np.maximum(preenchidas.sum(axis=1) - 1, 0)]
+            empatados = ((criterio == ultimo[:, None]) & mascara).sum(axis=1)
+            no_corte = empatados > (valores_criterio == ultimo[:, None]).sum(axis=1)
+            refazer = nulos | internos | no_corte
+
+        limite = posicoes.shape[1]
+        for linha in np.flatnonzero(refazer):
+            aprovados = np.flatnonzero(mascara[linha])
+            aprovados = aprovados[np.argsort(ordem[linha, aprovados], kind="stable")]
+            if self.ordenar_por is None:
+                selecionados = aprovados[:limite]
+            else:
+                selecionados = aprovados[top_k_como_pandas(criterio[linha, aprovados], limite, self.crescente)]
+            posicoes[linha] = -1
+            posicoes[linha, :selecionados.size] = selecionados
+            valores_criterio[linha] = np.nan
+            valores_criterio[linha, :selecionados.size] = criterio[linha, selecionados]
+
+    def posicoes_em_grade(self, tabela: pd.DataFrame, grade: dict, limite: Optional[int] = None) -> tuple:
+        """
+        Avalia o conjunto de regras para várias combinações de parâmetros de uma só vez.
+
+        Cada parâmetro da grade é tratado como uma coluna (K, 1), que o numpy propaga contra as
+        colunas do dataset (N,): os cálculos, a máscara dos filtros e a pontuação viram matrizes
+        (K, N), uma linha por combinação, sem repetir a leitura ou o tratamento do dataset. Os
+        empates na ordenação são desfeitos pela ordem do dataset.
+
+        Parâmetros:
+        tabela (pandas.DataFrame): Dataset tratado (colunas numéricas convertidas e 'Div. Yield'
+            em fração decimal).
+        grade (dict): Valores de cada parâmetro (nome -> sequência com K valores, um por combinação).
+        limite (int): Número de papéis selecionados por combinação; por padrão, o `limite` do conjunto.
+
+        Retorna:
+        tuple: (posicoes, quantidade, criterio), com a matriz (K, limite) das posições dos papéis
+        selecionados no dataset, em ordem (-1 nas vagas não preenchidas), o número de papéis
+        aprovados pelos filtros em cada combinação e a matriz (K, limite) com os valores da
+        coluna de ordenação dos selecionados.
+        """
+        desconhecidos = set(grade) - set(self.parametros)
+        if desconhecidos:
+            raise RegraInvalidaError(f"Parâmetros desconhecidos para '{self.nome}': {', '.join(sorted(desconhecidos))}")
+        colunas = {nome: np.asarray(valores, dtype="float64").reshape(-1, 1) for nome, valores in grade.items()}
+        combinacoes = len(next(iter(colunas.values()))) if colunas else 1
+        valores = self.calcular(tabela, colunas)
+        return self._classificar_em_lote(valores, (combinacoes, len(tabela)), limite)
+
+    def posicoes_em_painel(self, painel: dict, limite: Optional[int] = None,
+                           parametros: Optional[dict] = None, ordem: Optional[np.ndarray] = None) -> tuple:
+        """
+        Avalia o conjunto de regras sobre um painel de snapshots (datas x papéis) de uma só vez.
+
+        Cada coluna do painel é uma matriz (D, T), com uma linha por data e NaN para os papéis
+        ausentes do snapshot da data (que nunca são aprovados). Os cálculos e a máscara são
+        avaliados sobre o painel inteiro; a pontuação e a ordenação, por data. Sem `ordem`, os
+        empates são desfeitos pela coluna do painel; com ela, a seleção de cada data é a de
+        `selecionar` sobre o snapshot da data, inclusive nos empates.
+
+        Parâmetros:
+        painel (dict): Matrizes (D, T) das colunas em `colunas_criterio` (nome -> array).
+        limite (int): Número de papéis selecionados por data; por padrão, o `limite` do conjunto.
+        parametros (dict): Valores que substituem os parâmetros padrão.
+        ordem (numpy.ndarray): Matriz (D, T) com a ordem dos papéis nas linhas de cada snapshot
+            (valores crescentes; os dos papéis ausentes são ignorados).
+
+        Retorna:
+        tuple: (posicoes, quantidade, criterio), como em `posicoes_em_grade`, com uma linha por data
+        e as posições referentes às colunas (papéis) do painel.
+        """
+        ausentes = [coluna for coluna in self.colunas_criterio if coluna not in painel]
+        if ausentes:
+            raise RegraInvalidaError(f"Colunas ausentes do painel para '{self.nome}': {', '.join(ausentes)}")
+        valores = {**self.parametros, **(parametros or {})}
+        valores.update({coluna: painel[coluna] for coluna in self.colunas_criterio})
+        forma = np.shape(painel[self.colunas_criterio[0]]) if self.colunas_criterio else (0, 0)
+        return self._classificar_em_lote(self._calcular_valores(valores, forma), forma, limite, ordem)
+
+    def _aprovados(self, tabela: pd.DataFrame, parametros: Optional[dict]) -> tuple:
+        """Calcula a máscara e a pontuação, devolvendo as posições e os valores dos aprovados."""
+        valores = self.calcular(tabela, parametros)
+        posicoes = np.flatnonzero(valores.pop("_mascara"))
+        aprovados = {nome: valor[posicoes] if isinstance(valor, np.ndarray) else valor
+                     for nome, valor in valores.items()}
+        for nome, expressao in self.pontuacao.items():
+            aprovados[nome] = expressao.avaliar(aprovados)
+        criterio = np.zeros(posicoes.size) if self.ordenar_por is None else aprovados[self.ordenar_por]
+        return posicoes, aprovados, criterio
+
+    def _montar_carteira(self, tabela: pd.DataFrame, posicoes: np.ndarray, aprovados: dict,
+                         ordem: np.ndarray) -> pd.DataFrame:
+        """Monta a carteira com os aprovados em `ordem`, aplicando a formatação e as colunas do conjunto."""
+        carteira = {nome: valor[ordem] if isinstance(valor, np.ndarray) else valor for nome, valor in aprovados.items()}
+        for nome, expressao in self.formatacao.items():
+            carteira[nome] = expressao.avaliar(carteira)
+
+        colunas = self.colunas or self.colunas_dataset + list(self.calculos) + list(self.pontuacao)
+        resultado = pd.DataFrame({coluna: carteira[coluna] for coluna in colunas},
+                                 index=tabela.index[posicoes[ordem]])
+        return Utils.formatar_como_moeda(resultado, self.moeda)
+
+    def selecionar(self, tabela: pd.DataFrame, parametros: Optional[dict] = None) -> pd.DataFrame:
+        """
+        Aplica o conjunto de regras sobre o dataset tratado, sem alterar o DataFrame recebido.
+
+        Os primeiros colocados são obtidos por seleção parcial (`selecao.top_k_como_pandas`), sem
+        ordenar todos os aprovados, e os empates ficam na ordem de `sort_values` + `head`, a dos
+        modelos originais.
+
+        Parâmetros:
+        tabela (pandas.DataFrame): Dataset tratado (colunas numéricas convertidas e 'Div. Yield'
+            em fração decimal).
+        parametros (dict): Valores que substituem os parâmetros padrão.
+
+        Retorna:
+        pandas.DataFrame: Carteira recomendada, já formatada para gravação.
+        """
+        posicoes, aprovados, criterio = self._aprovados(tabela, parametros)
+        if self.ordenar_por is None:
+            ordem = np.arange(posicoes.size)[:self.limite]
+        else:
+            ordem = top_k_como_pandas(criterio, self.limite, self.crescente)
+        return self._montar_carteira(tabela, posicoes, aprovados, ordem)
+
+    def selecionar_por_grupo(self, tabela: pd.DataFrame, coluna_grupo: str = "Setor",
+                             parametros: Optional[dict] = None, limite: Optional[int] = None) -> pd.DataFrame:
+        """
+        Seleciona os primeiros colocados de cada grupo (ex.: setor ou subsetor) em uma única
+        passagem (`selecao.top_k_por_grupo`), sem uma ordenação por grupo.
+
+        Os filtros e a pontuação são os do mercado inteiro (ex.: o `rank` da Magic Formula
+        considera todos os aprovados); apenas o corte dos primeiros colocados é feito por grupo.
+
+        Parâmetros:
+        tabela (pandas.DataFrame): Dataset tratado, com a coluna do grupo.
+        coluna_grupo (str): Coluna que define os grupos ('Setor' ou 'Subsetor').
+        parametros (dict): Valores que substituem os parâmetros padrão.
+        limite (int): Número de papéis por grupo; por padrão, o `limite` do conjunto.
+
+        Retorna:
+        pandas.DataFrame: Carteiras de todos os grupos, com a coluna do grupo à esquerda, em
+        ordem alfabética de grupo e de classificação dentro de cada grupo.
+        """
+        if coluna_grupo not in tabela.columns:
+            raise RegraInvalidaError(f"Coluna '{coluna_grupo}' não encontrada no dataset.")
+
+        posicoes, aprovados, criterio = self._aprovados(tabela, parametros)
+        limite = self.limite if limite is None else limite
+        limite = posicoes.size if limite is None else limite
+        grupos = tabela[coluna_grupo].to_numpy()[posicoes]
+        _, selecionadas = top_k_por_grupo(criterio, grupos, limite, self.crescente)
+
+        ordem = selecionadas[selecionadas >= 0]
+        carteira = self._montar_carteira(tabela, posicoes, aprovados, ordem)
+        if coluna_grupo not in carteira.columns:
+            carteira.insert(0, coluna_grupo, grupos[ordem])
+        return carteira
@@ -0,0 +1,182 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+def menores_k(chave: np.ndarray, k: int, mascara: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Seleciona, em cada linha, as posições dos k menores valores da chave, em ordem, sem ordenar
+    a linha inteira.
+
+    A ordem é a de uma ordenação estável: papéis aprovados pela máscara primeiro, depois os
+    valores válidos em ordem crescente, NaN ao final e empates desfeitos pela posição. Uma
+    seleção parcial (`numpy.partition`, O(N) por linha) encontra o k-ésimo valor de cada linha,
+    e apenas os candidatos até ele são ordenados, em um único `lexsort` para todas as linhas.
+
+    Parâmetros:
+    chave (numpy.ndarray): Valores a ordenar, com forma (N,) ou (linhas, N).
+    k (int): Número de posições selecionadas por linha.
+    mascara (numpy.ndarray): Papéis aprovados, com a forma da chave; por padrão, todos. Os não
+        aprovados nunca são selecionados.
+
+    Retorna:
+    numpy.ndarray: Com chave 1D, as posições selecionadas (até k); com chave 2D, a matriz
+    (linhas, k) das posições, com -1 nas vagas sem papel aprovado.
+    """
+    chave = np.asarray(chave, dtype="float64")
+    unidimensional = chave.ndim == 1
+    chave = np.atleast_2d(chave)
+    linhas, tamanho = chave.shape
+    mascara = np.ones(chave.shape, dtype=bool) if mascara is None else np.broadcast_to(mascara, chave.shape)
+    k = max(0, min(int(k), tamanho))
+
+    nulos = np.isnan(chave)
+    # Níveis da ordenação: 0 = aprovado com valor, 1 = aprovado com NaN, 2 = não aprovado
+    nivel = np.where(mascara, nulos.astype(np.int8), np.int8(2))
+    if 0 < k < tamanho:
+        # Codificação monotônica da ordem (aprovados com NaN -> +inf, não aprovados -> NaN) para
+        # que a seleção parcial encontre o k-ésimo valor; os empates com ele continuam candidatos
+        codificada = np.where(nivel == 0, chave, np.where(nivel == 1, np.inf, np.nan))
+        limiar = np.take_along_axis(np.partition(codificada, k - 1, axis=1), np.full((linhas, 1), k - 1), axis=1)
+        candidatos = (codificada <= limiar) | np.isnan(limiar)
+    else:
+        candidatos = np.ones(chave.shape, dtype=bool)
+
+    linha, coluna = np.nonzero(candidatos)
+    ordem = np.lexsort((coluna, np.where(nulos[linha, coluna], 0, chave[linha, coluna]), nivel[linha, coluna], linha))
+    linha, coluna = linha[ordem], coluna[ordem]
+    # Posição de cada candidato dentro da sua linha, para manter apenas os k primeiros
+    inicio_linha = np.searchsorted(linha, np.arange(linhas))
+    posicao = np.arange(linha.size) - inicio_linha[linha]
+    manter = (posicao < k) & (nivel[linha, coluna] < 2)
+
+    posicoes = np.full((linhas, k), -1, dtype=np.intp)
+    posicoes[linha[manter], posicao[manter]] = coluna[manter]
+    if unidimensional:
+        return posicoes[0][posicoes[0] >= 0]
+    return posicoes
+
+
+def top_k(chave: np.ndarray, k: Optional[int] = None, crescente: bool = True,
+          mascara: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Posições dos k primeiros colocados pela chave, com NaN ao final e empates desfeitos pela
+    posição (a mesma ordem de `sort_values(kind="stable")` seguido de `head(k)`), sem ordenar
+    o universo inteiro.
+
+    Parâmetros:
+    chave (numpy.ndarray): Valores da coluna de ordenação, com forma (N,) ou (linhas, N).
+    k (int): Número de colocados; por padrão, todos.
+    crescente (bool): Se verdadeiro, os menores valores primeiro.
+    mascara (numpy.ndarray): Papéis elegíveis; por padrão, todos.
+
+    Retorna:
+    numpy.ndarray: Posições selecionadas (ver `menores_k`).
+    """
+    chave = np.asarray(chave, dtype="float64")
+    k = chave.shape[-1] if k is None else k
+    return menores_k(chave if crescente else -chave, k, mascara)
+
+
+def ordenar_como_pandas(chave: np.ndarray, crescente: bool = True) -> np.ndarray:
+    """
+    Posições que ordenam a chave exatamente como `pandas.Series.sort_values` (quicksort sobre
+    os valores válidos, com NaN ao final), para que os empates fiquem na mesma ordem.
+
+    Parâmetros:
+    chave (numpy.ndarray): Valores a ordenar, com forma (N,).
+    crescente (bool): Se verdadeiro, os menores valores primeiro.
+
+    Retorna:
+    numpy.ndarray: Posições em ordem.
+    """
+    chave = np.asarray(chave, dtype="float64")
+    nulos = np.isnan(chave)
+    validos = np.flatnonzero(~nulos)
+    valores = chave[validos]
+    if not crescente:
+        valores, validos = valores[::-1], validos[::-1]
+    ordem = validos[valores.argsort(kind="quicksort")]
+    if not crescente:
+        ordem = ordem[::-1]
+    return np.r_[ordem, np.flatnonzero(nulos)].astype(np.intp)
+
+
+def top_k_como_pandas(chave: np.ndarray, k: Optional[int] = None, crescente: bool = True) -> np.ndarray:
+    """
+    Posições dos k primeiros colocados na mesma ordem de `sort_values()` seguido de `head(k)`,
+    inclusive nos empates, usada pelas carteiras publicadas.
+
+    A seleção parcial de `top_k` é usada sempre que o resultado não depende da ordem dos
+    empates. Quando há empates entre os selecionados ou no k-ésimo valor, a ordem do quicksort
+    do pandas depende de todos os valores, e a chave inteira é ordenada (`ordenar_como_pandas`).
+
+    Parâmetros:
+    chave (numpy.ndarray): Valores da coluna de ordenação, com forma (N,).
+    k (int): Número de colocados; por padrão, todos.
+    crescente (bool): Se verdadeiro, os menores valores primeiro.
+
+    Retorna:
+    numpy.ndarray: Posições selecionadas, em ordem.
+    """
+    chave = np.asarray(chave, dtype="float64")
+    validos = chave[~np.isnan(chave)]
+    if k is not None and k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k is None or k >= validos.size:
+        return ordenar_como_pandas(chave, crescente)[:k]
+
+    selecionadas = top_k(chave, k, crescente)
+    valores = chave[selecionadas]
+    empate_interno = np.unique(valores).size < valores.size
+    empate_no_corte = np.count_nonzero(validos == valores[-1]) > np.count_nonzero(valores == valores[-1])
+    if empate_interno or empate_no_corte:
+        return ordenar_como_pandas(chave, crescente)[:k]
+    return selecionadas
+
+
+def top_k_por_grupo(chave: np.ndarray, grupos, k: int, crescente: bool = True,
+                    mascara: Optional[np.ndarray] = None) -> tuple:
+    """
+    Seleciona os k primeiros colocados de cada grupo (ex.: setor) em uma única passagem.
+
+    Os papéis são distribuídos em uma matriz (grupos x maior grupo), preenchida com posições
+    não elegíveis, e a seleção parcial de `menores_k` é aplicada a todas as linhas de uma vez,
+    sem uma ordenação por grupo.
+
+    Parâmetros:
+    chave (numpy.ndarray): Valores da coluna de ordenação, com forma (N,).
+    grupos (array-like): Grupo de cada papel (ex.: a coluna 'Setor'); papéis sem grupo (NaN)
+        são ignorados.
+    k (int): Número de colocados por grupo.
+    crescente (bool): Se verdadeiro, os menores valores primeiro.
+    mascara (numpy.ndarray): Papéis elegíveis; por padrão, todos.
+
+    Retorna:
+    tuple: (nomes, posicoes), com os grupos em ordem alfabética e a matriz (grupos, até k) das
+    posições selecionadas em cada um, com -1 nas vagas não preenchidas.
+    """
+    chave = np.asarray(chave, dtype="float64")
+    codigos, nomes = pd.factorize(pd.Series(grupos).to_numpy(), sort=True)
+    elegiveis = codigos >= 0 if mascara is None else (codigos >= 0) & np.asarray(mascara, dtype=bool)
+    tamanhos = np.bincount(codigos[codigos >= 0], minlength=len(nomes))
+    if len(nomes) == 0:
+        return np.asarray(nomes), np.empty((0, max(0, int(k))), dtype=np.intp)
+
+    # Posição de cada papel dentro do seu grupo, preservando a ordem do dataset
+    presentes = np.flatnonzero(codigos >= 0)
+    ordem = presentes[np.argsort(codigos[presentes], kind="stable")]
+    inicio_grupo = np.r_[0, np.cumsum(tamanhos)[:-1]]
+    coluna = np.arange(ordem.size) - inicio_grupo[codigos[ordem]]
+
+    origem = np.full((len(nomes), tamanhos.max()), -1, dtype=np.intp)
+    origem[codigos[ordem], coluna] = ordem
+    matriz_chave = np.full(origem.shape, np.nan)
+    matriz_chave[codigos[ordem], coluna] = chave[ordem]
+    matriz_mascara = np.zeros(origem.shape, dtype=bool)
+    matriz_mascara[codigos[ordem], coluna] = elegiveis[ordem]
+
+    selecionadas = top_k(matriz_chave, k, crescente, matriz_mascara)
+    posicoes = np.where(selecionadas >= 0, np.take_along_axis(origem, np.maximum(selecionadas, 0), axis=1), -1)
+    return np.asarray(nomes), posicoes
@@ -0,0 +1,121 @@
+import itertools
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .regras import RegraTriagem
+
+# Número máximo de elementos (combinações x papéis) das matrizes avaliadas de uma vez
+MAX_ELEMENTOS_BLOCO = 4_000_000
+
+
+def expandir_grade(grade: dict) -> dict:
+    """
+    Expande uma grade de parâmetros no produto cartesiano dos valores.
+
+    Parâmetros:
+    grade (dict): Valores de cada parâmetro (ex.: {'constante': [20, 22.5], 'liq_esperada': [5e5, 1e6]}).
+
+    Retorna:
+    dict: Valores de cada parâmetro por combinação (nome -> array com uma posição por combinação).
+    """
+    nomes = list(grade)
+    combinacoes = list(itertools.product(*(np.atleast_1d(grade[nome]) for nome in nomes)))
+    return {nome: np.array([combinacao[i] for combinacao in combinacoes], dtype="float64")
+            for i, nome in enumerate(nomes)}
+
+
+def varrer_parametros(dados: pd.DataFrame, grades: dict, limites: tuple = (10,), regras: Optional[dict] = None,
+                      coluna_papel: str = "Papel", max_elementos: int = MAX_ELEMENTOS_BLOCO) -> pd.DataFrame:
+    """
+    Avalia os modelos de triagem para todas as combinações das grades de parâmetros sobre um
+    único dataset em memória.
+
+    As combinações de cada modelo são avaliadas em blocos por `RegraTriagem.posicoes_em_grade`,
+    que propaga os parâmetros contra as colunas do dataset (uma linha de matriz por combinação);
+    os diferentes cortes de `limites` reaproveitam a mesma ordenação.
+
+    Parâmetros:
+    dados (pandas.DataFrame): Dataset tratado (ex.: `MotorTriagem.dados`).
+    grades (dict): Grade de cada modelo (nome do modelo -> {parâmetro: valores}), ex.:
+        {'ben_grahan': {'constante': [20, 22.5, 25], 'liq_esperada': [5e5, 1e6]},
+         'decio_bazin': {'dy_esperado': np.arange(0.04, 0.09, 0.01)}}.
+    limites (tuple): Tamanhos de carteira (top-N) avaliados para cada combinação.
+    regras (dict): Conjuntos de regras por nome de modelo; por padrão, `RegraTriagem.padrao(nome)`.
+    coluna_papel (str): Coluna com o código do papel.
+    max_elementos (int): Número máximo de elementos (combinações x papéis) avaliados por bloco.
+
+    Retorna:
+    pandas.DataFrame: Tabela no formato longo, com uma linha por papel selecionado: modelo,
+    combinacao, os parâmetros do modelo, limite, aprovados (papéis aprovados pelos filtros),
+    posicao (1 = primeiro colocado), o papel, a coluna de ordenação (criterio) e o seu valor.
+    Combinações sem nenhum papel aprovado (carteira vazia) têm uma única linha, com posicao,
+    papel e valor NaN; `carteiras_por_combinacao` agrupa os papéis de cada combinação em uma tupla.
+    """
+    regras = regras or {}
+    limites = sorted({int(limite) for limite in limites})
+    papeis = dados[coluna_papel].to_numpy()
+    tabelas = []
+
+    for nome_modelo, grade in grades.items():
+        regra = regras.get(nome_modelo) or RegraTriagem.padrao(nome_modelo)
+        combinacoes = expandir_grade(grade)
+        total = len(next(iter(combinacoes.values()))) if combinacoes else 1
+        por_bloco = max(1, max_elementos // max(1, len(dados)))
+
+        for inicio in range(0, total, por_bloco):
+            bloco = {nome: valores[inicio:inicio + por_bloco] for nome, valores in combinacoes.items()}
+            posicoes, aprovados, criterio = regra.posicoes_em_grade(dados, bloco, limite=limites[-1])
+
+            # Combinações sem nenhum papel aprovado, mantidas com uma linha vazia
+            vazias = np.flatnonzero(posicoes[:, 0] < 0) if posicoes.shape[1] else np.arange(len(posicoes))
+            for limite in limites:
+                linha, coluna = np.nonzero(posicoes[:, :limite] >= 0)
+                if vazias.size:
+                    ordem = np.argsort(np.r_[linha, vazias], kind="stable")
+                    linha = np.r_[linha, vazias][ordem]
+                    coluna = np.r_[coluna, np.full(vazias.size, -1)][ordem]
+                preenchida = coluna >= 0
+                selecionados = posicoes[linha, np.maximum(coluna, 0)]
+                tabela = {
+                    "modelo": nome_modelo,
+                    "combinacao": inicio + linha,
+                }
+                for nome, padrao in regra.parametros.items():
+                    tabela[nome] = bloco[nome][linha] if nome in bloco else padrao
+                tabela["limite"] = limite
+                tabela["aprovados"] = aprovados[linha]
+                tabela["posicao"] = np.where(preenchida, coluna + 1, np.nan) if vazias.size else coluna + 1
+                tabela[coluna_papel] = np.where(preenchida, papeis[selecionados], np.nan)
+                tabela["criterio"] = regra.ordenar_por
+                tabela["valor_criterio"] = np.where(preenchida, criterio[linha, np.maximum(coluna, 0)], np.nan)
+                tabelas.append(pd.DataFrame(tabela))
+
+    if not tabelas:
+        return pd.DataFrame(columns=["modelo", "combinacao", "limite", "aprovados", "posicao", coluna_papel,
+                                     "criterio", "valor_criterio"])
+    return pd.concat(tabelas, ignore_index=True)
+
+
+def carteiras_por_combinacao(varredura: pd.DataFrame, coluna_papel: str = "Papel") -> pd.DataFrame:
+    """
+    Resume o resultado de `varrer_parametros` com uma linha por combinação e limite.
+
+    Parâmetros:
+    varredura (pandas.DataFrame): Resultado de `varrer_parametros`.
+    coluna_papel (str): Coluna com o código do papel.
+
+    Retorna:
+    pandas.DataFrame: Modelo, combinação, parâmetros, limite, aprovados e a tupla de papéis
+    selecionados, na ordem de classificação (vazia para as combinações sem papel aprovado).
+    """
+    chaves = [coluna for coluna in varredura.columns
+              if coluna not in ("posicao", coluna_papel, "criterio", "valor_criterio")]
+    ordenada = varredura.sort_values(["modelo", "combinacao", "limite", "posicao"], kind="stable")
+    agrupada = ordenada.groupby(chaves, sort=False, dropna=False)
+    resumo = agrupada[coluna_papel].agg(tuple).rename("papeis").reset_index()
+    # A linha das carteiras vazias não tem posição
+    vazias = agrupada["posicao"].count().to_numpy() == 0
+    resumo["papeis"] = [() if vazia else papeis for papeis, vazia in zip(resumo["papeis"], vazias)]
+    return resumo
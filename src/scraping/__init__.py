@@ -1,3 +1,7 @@
 """saída de classe
 """
-from .scraping import Scraping
\ No newline at end of file
+from .scraping import Scraping
+from .sessao import SessaoHttp
+from .cache import CacheHttp
+from .limitador import LimitadorTaxa
+from .falhas import FilaFalhas, LayoutDesconhecidoError
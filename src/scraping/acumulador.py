@@ -0,0 +1,78 @@
+import pandas as pd
+
+
+class AcumuladorColunar:
+    """
+    Acumula os indicadores de cada ticker em listas por coluna e materializa um único
+    DataFrame ao final da coleta.
+
+    Os registros são agrupados pelo mapeamento de colunas (ações ou FIIs); cada grupo
+    mantém uma lista por coluna do dataset, preenchida com None quando o indicador não
+    está presente na página. A ordem de inserção é preservada no DataFrame final.
+
+    Atributos:
+    colunas_extras (tuple): Colunas adicionais, informadas em `adicionar`, ao final do dataset.
+    """
+
+    def __init__(self, colunas_extras: tuple = ("datetime_exec",)) -> None:
+        """
+        Inicializa um acumulador vazio.
+
+        Parâmetros:
+        colunas_extras (tuple): Colunas adicionais, informadas em `adicionar`, ao final do dataset.
+        """
+        self.colunas_extras = tuple(colunas_extras)
+        self._grupos = {}
+        self._total = 0
+
+    def __len__(self) -> int:
+        return self._total
+
+    def adicionar(self, financial_data: dict, metadata_cols: dict, **extras) -> None:
+        """
+        Adiciona os indicadores de um ticker.
+
+        Parâmetros:
+        financial_data (dict): Mapeamento título -> valor extraído da página de detalhes.
+        metadata_cols (dict): Mapeamento título -> nome da coluna no dataset.
+        extras: Valores das colunas adicionais (ex.: datetime_exec).
+
+        Retorna:
+        None
+        """
+        grupo = self._grupos.get(id(metadata_cols))
+        if grupo is None:
+            colunas = list(metadata_cols.values()) + list(self.colunas_extras)
+            grupo = {
+                "titulos": list(metadata_cols.keys()),
+                "colunas": colunas,
+                "valores": {coluna: [] for coluna in colunas},
+                "posicoes": [],
+            }
+            self._grupos[id(metadata_cols)] = grupo
+
+        valores = grupo["valores"]
+        for titulo, coluna in zip(grupo["titulos"], grupo["colunas"]):
+            valores[coluna].append(financial_data.get(titulo))
+        for coluna in self.colunas_extras:
+            valores[coluna].append(extras.get(coluna))
+        grupo["posicoes"].append(self._total)
+        self._total += 1
+
+    def para_dataframe(self) -> pd.DataFrame:
+        """
+        Materializa os registros acumulados em um único DataFrame.
+
+        Retorna:
+        pandas.DataFrame: DataFrame com uma linha por ticker, na ordem de inserção.
+        """
+        if not self._grupos:
+            return pd.DataFrame()
+
+        dfs = [
+            pd.DataFrame(grupo["valores"], columns=grupo["colunas"], index=grupo["posicoes"])
+            for grupo in self._grupos.values()
+        ]
+        if len(dfs) == 1:
+            return dfs[0].reset_index(drop=True)
+        return pd.concat(dfs).sort_index().reset_index(drop=True)
@@ -0,0 +1,207 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Diretório padrão do cache de respostas HTTP
+DIRETORIO_CACHE = "./dados/00_cache/"
+
+# Tempo de vida (em segundos) das respostas em cache por endpoint do Fundamentus.
+# As listagens mudam ao longo do pregão; as páginas de detalhes, raramente.
+TTLS_POR_ENDPOINT = {
+    "resultado.php": 15 * 60,
+    "detalhes.php": 12 * 60 * 60,
+}
+
+# Cabeçalhos da resposta preservados junto ao conteúdo em cache
+HEADERS_PRESERVADOS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class CacheAusenteError(requests.ConnectionError):
+    """Lançada no modo offline quando a URL requisitada não está no cache."""
+
+
+class CacheHttp:
+    """
+    Cache em disco de respostas HTTP, endereçado pelo hash da URL.
+
+    Cada entrada é composta pelo corpo da resposta (`<hash>.body`) e por um arquivo de
+    metadados (`<hash>.json`) com a URL, o instante do armazenamento e os cabeçalhos
+    necessários para revalidação condicional (ETag/Last-Modified).
+
+    Atributos:
+    diretorio (str): Diretório onde as entradas são gravadas.
+    ttls (dict): Tempo de vida, em segundos, por trecho de URL (endpoint).
+    ttl_padrao (int): Tempo de vida das URLs que não casam com nenhum endpoint.
+    modo_offline (bool): Se verdadeiro, responde apenas a partir do cache, sem acessar a rede.
+    """
+
+    def __init__(
+            self,
+            diretorio: str = DIRETORIO_CACHE,
+            ttls: Optional[dict] = None,
+            ttl_padrao: int = 60 * 60,
+            modo_offline: bool = False,
+    ) -> None:
+        """
+        Inicializa o cache, criando o diretório se necessário.
+
+        Parâmetros:
+        diretorio (str): Diretório onde as entradas são gravadas.
+        ttls (dict): Tempo de vida, em segundos, por trecho de URL (endpoint).
+        ttl_padrao (int): Tempo de vida das URLs que não casam com nenhum endpoint.
+        modo_offline (bool): Se verdadeiro, responde apenas a partir do cache, sem acessar a rede.
+        """
+        self.diretorio = diretorio
+        self.ttls = dict(TTLS_POR_ENDPOINT if ttls is None else ttls)
+        self.ttl_padrao = ttl_padrao
+        self.modo_offline = modo_offline
+        os.makedirs(self.diretorio, exist_ok=True)
+
+    @staticmethod
+    def _chave(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _caminhos(self, url: str) -> tuple:
+        chave = self._chave(url)
+        base = os.path.join(self.diretorio, chave[:2], chave)
+        return f"{base}.body", f"{base}.json"
+
+    def ttl(self, url: str) -> int:
+        """
+        Retorna o tempo de vida aplicável à URL, priorizando o endpoint mais específico.
+
+        Parâmetros:
+        url (str): URL da requisição.
+
+        Retorna:
+        int: Tempo de vida em segundos.
+        """
+        for endpoint in sorted(self.ttls, key=len, reverse=True):
+            if endpoint in url:
+                return self.ttls[endpoint]
+        return self.ttl_padrao
+
+    def ler(self, url: str) -> Optional[dict]:
+        """
+        Lê a entrada em cache de uma URL.
+
+        Parâmetros:
+        url (str): URL da requisição.
+
+        Retorna:
+        dict: Metadados da entrada acrescidos do corpo em `conteudo`, ou None se ausente.
+        """
+        caminho_corpo, caminho_meta = self._caminhos(url)
+        try:
+            with open(caminho_meta, encoding="utf-8") as arquivo:
+                entrada = json.load(arquivo)
+            with open(caminho_corpo, "rb") as arquivo:
+                entrada["conteudo"] = arquivo.read()
+        except (OSError, ValueError):
+            return None
+        return entrada
+
+    def gravar(self, url: str, resposta: requests.Response) -> None:
+        """
+        Grava uma resposta bem-sucedida no cache de forma atômica.
+
+        Parâmetros:
+        url (str): URL da requisição.
+        resposta (requests.Response): Resposta a ser armazenada.
+
+        Retorna:
+        None
+        """
+        caminho_corpo, caminho_meta = self._caminhos(url)
+        os.makedirs(os.path.dirname(caminho_corpo), exist_ok=True)
+        metadados = {
+            "url": url,
+            "armazenado_em": time.time(),
+            "encoding": resposta.encoding,
+            "headers": {nome: resposta.headers[nome] for nome in HEADERS_PRESERVADOS if nome in resposta.headers},
+        }
+        self._gravar_atomico(caminho_corpo, resposta.content)
+        self._gravar_atomico(caminho_meta, json.dumps(metadados).encode("utf-8"))
+
+    def renovar(self, url: str, entrada: dict) -> None:
+        """
+        Reinicia o tempo de vida de uma entrada revalidada pelo servidor (HTTP 304).
+
+        Parâmetros:
+        url (str): URL da requisição.
+        entrada (dict): Entrada lida por `ler`.
+
+        Retorna:
+        None
+        """
+        _, caminho_meta = self._caminhos(url)
+        metadados = {chave: valor for chave, valor in entrada.items() if chave != "conteudo"}
+        metadados["armazenado_em"] = time.time()
+        self._gravar_atomico(caminho_meta, json.dumps(metadados).encode("utf-8"))
+
+    @staticmethod
+    def _gravar_atomico(caminho: str, dados: bytes) -> None:
+        # Arquivo temporário exclusivo do processo e da thread, para gravações simultâneas da mesma URL
+        caminho_tmp = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(caminho_tmp, "wb") as arquivo:
+            arquivo.write(dados)
+        os.replace(caminho_tmp, caminho)
+
+    def esta_valida(self, url: str, entrada: dict) -> bool:
+        """
+        Indica se a entrada ainda está dentro do tempo de vida do seu endpoint.
+
+        Parâmetros:
+        url (str): URL da requisição.
+        entrada (dict): Entrada lida por `ler`.
+
+        Retorna:
+        bool: True se a entrada pode ser usada sem consultar o servidor.
+        """
+        return time.time() - entrada["armazenado_em"] < self.ttl(url)
+
+    @staticmethod
+    def headers_condicionais(entrada: dict) -> dict:
+        """
+        Monta os cabeçalhos de revalidação condicional a partir de uma entrada.
+
+        Parâmetros:
+        entrada (dict): Entrada lida por `ler`.
+
+        Retorna:
+        dict: Cabeçalhos If-None-Match/If-Modified-Since disponíveis.
+        """
+        headers = CaseInsensitiveDict(entrada.get("headers", {}))
+        condicionais = {}
+        if "ETag" in headers:
+            condicionais["If-None-Match"] = headers["ETag"]
+        if "Last-Modified" in headers:
+            condicionais["If-Modified-Since"] = headers["Last-Modified"]
+        return condicionais
+
+    @staticmethod
+    def como_resposta(url: str, entrada: dict) -> requests.Response:
+        """
+        Reconstrói um objeto `requests.Response` a partir de uma entrada do cache.
+
+        Parâmetros:
+        url (str): URL da requisição.
+        entrada (dict): Entrada lida por `ler`.
+
+        Retorna:
+        requests.Response: Resposta equivalente à original, com status 200.
+        """
+        resposta = requests.Response()
+        resposta.status_code = 200
+        resposta.url = url
+        resposta._content = entrada["conteudo"]
+        resposta.headers = CaseInsensitiveDict(entrada.get("headers", {}))
+        resposta.encoding = entrada.get("encoding")
+        resposta.from_cache = True
+        return resposta
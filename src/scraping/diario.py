@@ -0,0 +1,129 @@
+import json
+import logging
+import os
+import threading
+from typing import Optional
+
+# Diretório padrão dos diários de execução
+DIRETORIO_EXECUCOES = "./dados/00_execucoes/"
+
+
+class DiarioExecucao:
+    """
+    Diário de uma execução de coleta, usado para retomar execuções interrompidas.
+
+    Cada ticker coletado é acrescentado imediatamente ao arquivo `<id_execucao>.jsonl`
+    (uma linha JSON por ticker, com os indicadores extraídos e o datetime_exec). Ao ser
+    reaberto com o mesmo id, o diário devolve os tickers já concluídos, que não precisam
+    ser baixados novamente. Uma linha incompleta, gravada durante uma interrupção, é
+    removida do arquivo antes de novos registros. Quando a coleta termina, `concluir` arquiva o diário, de modo que uma nova
+    execução com o mesmo id começa do zero.
+
+    Atributos:
+    id_execucao (str): Identificador da execução (ex.: 'acoes_17_10_2026').
+    diretorio (str): Diretório dos diários.
+    caminho (str): Caminho do arquivo do diário.
+    """
+
+    def __init__(self, id_execucao: str, diretorio: str = DIRETORIO_EXECUCOES) -> None:
+        """
+        Abre o diário da execução, carregando os registros já gravados.
+
+        Parâmetros:
+        id_execucao (str): Identificador da execução.
+        diretorio (str): Diretório dos diários.
+        """
+        self.logger = logging.getLogger(__name__)
+        self.id_execucao = id_execucao
+        self.diretorio = diretorio
+        self.caminho = os.path.join(diretorio, f"{id_execucao}.jsonl")
+        self._trava = threading.Lock()
+        os.makedirs(diretorio, exist_ok=True)
+
+        self._registros = self._carregar()
+        if self._registros:
+            self.logger.info(f"Retomando a execução '{id_execucao}': {len(self._registros)} tickers já coletados")
+        self._arquivo = open(self.caminho, "a", encoding="utf-8")
+
+    def _carregar(self) -> dict:
+        registros = {}
+        if not os.path.exists(self.caminho):
+            return registros
+        fim_completo = 0
+        with open(self.caminho, "rb") as arquivo:
+            for linha in arquivo:
+                if not linha.endswith(b"\n"):
+                    break
+                fim_completo += len(linha)
+                try:
+                    registro = json.loads(linha)
+                except ValueError:
+                    continue
+                registros[registro["ticker"]] = registro
+
+        # Descarta a linha incompleta de uma interrupção; caso contrário, o próximo registro
+        # seria acrescentado a ela e perdido na retomada seguinte
+        if fim_completo < os.path.getsize(self.caminho):
+            self.logger.warning(f"Descartando a linha incompleta no fim do diário '{self.caminho}'")
+            os.truncate(self.caminho, fim_completo)
+        return registros
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._registros
+
+    def __len__(self) -> int:
+        return len(self._registros)
+
+    def obter(self, ticker: str) -> Optional[dict]:
+        """
+        Retorna o registro de um ticker já coletado.
+
+        Parâmetros:
+        ticker (str): Código do papel.
+
+        Retorna:
+        dict: Registro com as chaves `ticker`, `tipo`, `dados` e `datetime_exec`, ou None.
+        """
+        return self._registros.get(ticker)
+
+    def registrar(self, ticker: str, tipo: str, financial_data: dict, datetime_exec: str) -> None:
+        """
+        Grava no diário um ticker concluído.
+
+        Parâmetros:
+        ticker (str): Código do papel.
+        tipo (str): Tipo do papel ('acoes' ou 'fiis'), que define o mapeamento de colunas.
+        financial_data (dict): Indicadores extraídos da página de detalhes.
+        datetime_exec (str): Momento da coleta.
+
+        Retorna:
+        None
+        """
+        registro = {"ticker": ticker, "tipo": tipo, "dados": financial_data, "datetime_exec": datetime_exec}
+        linha = json.dumps(registro, ensure_ascii=False) + "\n"
+        with self._trava:
+            self._arquivo.write(linha)
+            self._arquivo.flush()
+            os.fsync(self._arquivo.fileno())
+            self._registros[ticker] = registro
+
+    def fechar(self) -> None:
+        """Fecha o arquivo do diário, mantendo-o para uma retomada."""
+        if not self._arquivo.closed:
+            self._arquivo.close()
+
+    def concluir(self) -> None:
+        """
+        Fecha e arquiva o diário (`<id_execucao>.concluido.jsonl`) ao final de uma coleta completa.
+
+        Retorna:
+        None
+        """
+        self.fechar()
+        os.replace(self.caminho, os.path.join(self.diretorio, f"{self.id_execucao}.concluido.jsonl"))
+
+    def __enter__(self) -> "DiarioExecucao":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
@@ -0,0 +1,112 @@
+import pandas as pd
+import requests
+
+from .cache import CacheAusenteError
+
+
+class LayoutDesconhecidoError(TypeError):
+    """Lançada quando a página de detalhes não traz os indicadores de uma ação ou de um FII."""
+
+
+def classificar_falha(erro: Exception) -> tuple:
+    """
+    Classifica a exceção lançada na coleta de um ticker.
+
+    Parâmetros:
+    erro (Exception): Exceção capturada.
+
+    Retorna:
+    tuple: (motivo, transitoria), onde motivo é 'timeout', 'conexao', 'http_<status>',
+    'ausente_no_cache', 'layout_desconhecido' ou 'erro_inesperado', e transitoria indica
+    se uma nova tentativa pode ter sucesso.
+    """
+    if isinstance(erro, CacheAusenteError):
+        return "ausente_no_cache", False
+    if isinstance(erro, requests.Timeout):
+        return "timeout", True
+    if isinstance(erro, requests.HTTPError):
+        status = erro.response.status_code if erro.response is not None else 0
+        return f"http_{status}", status == 429 or status >= 500
+    if isinstance(erro, requests.ConnectionError):
+        return "conexao", True
+    if isinstance(erro, LayoutDesconhecidoError):
+        return "layout_desconhecido", False
+    return "erro_inesperado", False
+
+
+class FilaFalhas:
+    """
+    Lista de tickers cuja coleta falhou (dead letter), com o motivo de cada falha.
+
+    Cada ticker aparece uma única vez, com a falha mais recente e o número de tentativas;
+    tickers recuperados em uma nova tentativa são removidos da fila.
+    """
+
+    def __init__(self) -> None:
+        self._falhas = {}
+
+    def __len__(self) -> int:
+        return len(self._falhas)
+
+    def __iter__(self):
+        return iter(self._falhas.values())
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._falhas
+
+    def adicionar(self, ticker: str, erro: Exception) -> dict:
+        """
+        Registra a falha de um ticker.
+
+        Parâmetros:
+        ticker (str): Código do papel.
+        erro (Exception): Exceção lançada na coleta.
+
+        Retorna:
+        dict: Registro com ticker, motivo, detalhe, transitoria e tentativas.
+        """
+        motivo, transitoria = classificar_falha(erro)
+        tentativas = self._falhas[ticker]["tentativas"] + 1 if ticker in self._falhas else 1
+        registro = {
+            "ticker": ticker,
+            "motivo": motivo,
+            "detalhe": f"{type(erro).__name__}: {erro}",
+            "transitoria": transitoria,
+            "tentativas": tentativas,
+        }
+        self._falhas[ticker] = registro
+        return registro
+
+    def remover(self, ticker: str) -> None:
+        self._falhas.pop(ticker, None)
+
+    def transitorias(self) -> list:
+        """
+        Retorna os tickers cujas falhas podem ser resolvidas com uma nova tentativa.
+
+        Retorna:
+        list: Tickers com falhas transitórias, na ordem em que falharam.
+        """
+        return [falha["ticker"] for falha in self._falhas.values() if falha["transitoria"]]
+
+    def por_motivo(self) -> dict:
+        """
+        Conta as falhas por motivo.
+
+        Retorna:
+        dict: Mapeamento motivo -> número de tickers.
+        """
+        contagem = {}
+        for falha in self._falhas.values():
+            contagem[falha["motivo"]] = contagem.get(falha["motivo"], 0) + 1
+        return contagem
+
+    def como_dataframe(self) -> pd.DataFrame:
+        """
+        Retorna as falhas como DataFrame, para gravação junto aos dados processados.
+
+        Retorna:
+        pandas.DataFrame: Uma linha por ticker descartado.
+        """
+        return pd.DataFrame(list(self._falhas.values()),
+                            columns=["ticker", "motivo", "detalhe", "transitoria", "tentativas"])
@@ -0,0 +1,208 @@
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Coluna com a data do último balanço (ações) ou informe trimestral (FIIs) processado
+COLUNAS_BALANCO = {
+    "acoes": "dt_ult_balanco_proc",
+    "fiis": "dt_ult_informe_trim",
+}
+
+# Coluna com a data em que a página de detalhes de cada ticker foi coletada na base
+COLUNA_COLETA = "dt_coleta_detalhes"
+
+# Fundamentos da base comparados com os valores da listagem para detectar um balanço novo.
+# Valor None: a listagem traz a mesma coluna; tupla: valor implícito (cotação / múltiplo).
+FUNDAMENTOS_LISTAGEM = {
+    "acoes": {
+        "vlr_patrim_liq": None,
+        "vlr_ind_lpa": ("vlr_cot", "vlr_ind_p_sobre_l"),
+        "vlr_ind_vpa": ("vlr_cot", "vlr_ind_p_sobre_vp"),
+    },
+    "fiis": {
+        "vlr_vp_sobre_cota": ("vlr_cot", "vlr_p_sobre_vp"),
+    },
+}
+
+# Erro máximo de arredondamento dos valores da listagem, exibidos com duas casas decimais
+ARREDONDAMENTO_LISTAGEM = 0.005
+
+# Colunas que variam com a cotação: proporcionais (preço / fundamento), inversas
+# (fundamento / preço) e proporcionais ao valor da firma (EV / fundamento)
+COLUNAS_PRECO = {
+    "acoes": {
+        "proporcionais": [
+            "vlr_mercado", "vlr_ind_p_sobre_l", "vlr_ind_p_sobre_vp", "vlr_ind_p_sobre_ebit", "vlr_ind_psr",
+            "vlr_ind_p_sobre_ativ", "vlr_ind_p_sobre_cap_giro", "vlr_ind_p_sobre_ativ_circ_liq",
+        ],
+        "inversas": ["vlr_ind_div_yield"],
+        "valor_firma": ["vlr_ind_ev_sobre_ebit", "vlr_ind_ev_sobre_ebitda"],
+    },
+    "fiis": {
+        "proporcionais": ["vlr_mercado", "vlr_p_sobre_vp"],
+        "inversas": ["vlr_div_yield", "vlr_ffo_yield"],
+        "valor_firma": [],
+    },
+}
+
+
+def prazo_proximo_balanco(datas_balanco: pd.Series) -> pd.Series:
+    """
+    Calcula a data limite de divulgação do balanço seguinte a cada data informada.
+
+    O balanço seguinte é o do fim do trimestre subsequente; o prazo é de 45 dias após o
+    fim do trimestre (ITR) ou de 90 dias quando o trimestre seguinte encerra o exercício (DFP).
+
+    Parâmetros:
+    datas_balanco (pandas.Series): Datas do último balanço processado (datetime64).
+
+    Retorna:
+    pandas.Series: Data limite de divulgação do balanço seguinte (NaT quando a data é nula).
+    """
+    proximo = datas_balanco + pd.offsets.QuarterEnd(1)
+    dias_prazo = np.where(proximo.dt.month == 12, 90, 45)
+    return proximo + pd.to_timedelta(dias_prazo, unit="D")
+
+
+def classificar_desatualizados(
+        base: pd.DataFrame,
+        listagem: pd.DataFrame,
+        tipo: str,
+        coluna_papel: str,
+        max_idade_dias: int,
+        tolerancia: float = 0.01,
+        hoje: Optional[datetime] = None,
+) -> dict:
+    """
+    Identifica os tickers da listagem cuja página de detalhes precisa ser coletada novamente.
+
+    Um ticker é coletado quando:
+    - não está na base ('novo');
+    - a coleta na base tem mais de `max_idade_dias` dias ('idade');
+    - o prazo de divulgação do balanço seguinte ao da base já passou e a página não foi
+      coletada desde então ('prazo_balanco');
+    - os fundamentos da listagem (patrimônio líquido, LPA/VPA implícitos nos múltiplos)
+      divergem dos da base, indicando que um balanço novo foi processado ('balanco_novo').
+
+    Parâmetros:
+    base (pandas.DataFrame): Base de fundamentos com tipos convertidos e a coluna `dt_coleta_detalhes`.
+    listagem (pandas.DataFrame): Listagem do dia com tipos convertidos.
+    tipo (str): Tipo de papel ('acoes' ou 'fiis').
+    coluna_papel (str): Coluna do ticker.
+    max_idade_dias (int): Idade máxima, em dias, de uma coleta da página de detalhes.
+    tolerancia (float): Diferença relativa a partir da qual um fundamento é considerado alterado.
+    hoje (datetime): Data de referência; por padrão, a data atual.
+
+    Retorna:
+    dict: Mapeamento ticker -> motivo, na ordem da listagem.
+    """
+    hoje = pd.Timestamp(hoje or datetime.now()).normalize()
+    papeis = listagem[coluna_papel]
+    base = base.drop_duplicates(subset=coluna_papel, keep="last").set_index(coluna_papel).reindex(papeis)
+    na_base = base[COLUNA_COLETA].notna().to_numpy()
+
+    coleta = pd.to_datetime(base[COLUNA_COLETA], format="%Y-%m-%d", errors="coerce")
+    idade = ((hoje - coleta) > pd.Timedelta(days=max_idade_dias)).to_numpy()
+
+    balanco = pd.to_datetime(base[COLUNAS_BALANCO[tipo]], format="%d/%m/%Y", errors="coerce")
+    prazo = prazo_proximo_balanco(balanco)
+    prazo_vencido = ((prazo <= hoje) & (coleta < prazo)).to_numpy()
+
+    divergente = np.zeros(len(papeis), dtype=bool)
+    for coluna, origem in FUNDAMENTOS_LISTAGEM[tipo].items():
+        if coluna not in base.columns:
+            continue
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if origem is None:
+                if coluna not in listagem.columns:
+                    continue
+                atual = listagem[coluna].to_numpy(dtype="float64")
+                limite = tolerancia
+            else:
+                numerador, denominador = origem
+                if numerador not in listagem.columns or denominador not in listagem.columns:
+                    continue
+                valores_num = listagem[numerador].to_numpy(dtype="float64")
+                valores_den = listagem[denominador].to_numpy(dtype="float64")
+                atual = valores_num / valores_den
+                # O valor implícito herda o erro de arredondamento do múltiplo e da cotação
+                limite = tolerancia + ARREDONDAMENTO_LISTAGEM * (1 / np.abs(valores_num) + 1 / np.abs(valores_den))
+            anterior = base[coluna].to_numpy(dtype="float64")
+            diferenca = np.abs(atual - anterior) / np.maximum(np.abs(anterior), 1e-9)
+        comparaveis = np.isfinite(atual) & np.isfinite(anterior)
+        divergente |= comparaveis & (diferenca > limite)
+
+    motivos = {}
+    for papel, existe, velho, vencido, novo_balanco in zip(papeis, na_base, idade, prazo_vencido, divergente):
+        if not existe:
+            motivos[papel] = "novo"
+        elif velho:
+            motivos[papel] = "idade"
+        elif vencido:
+            motivos[papel] = "prazo_balanco"
+        elif novo_balanco:
+            motivos[papel] = "balanco_novo"
+    return motivos
+
+
+def atualizar_precos(base: pd.DataFrame, listagem: pd.DataFrame, tipo: str, coluna_papel: str,
+                     data_listagem: Optional[str] = None) -> pd.DataFrame:
+    """
+    Atualiza os registros da base com as cotações da listagem.
+
+    Os múltiplos que dependem da cotação são recalculados pela variação do preço (P/L,
+    P/VP, valor de mercado, ... proporcionalmente; Div. Yield inversamente; EV/EBIT e
+    EV/EBITDA pela variação do valor da firma, mantida a dívida líquida). Em seguida, os
+    valores presentes na listagem, calculados pela própria fonte, prevalecem.
+
+    A listagem não traz a data da última cotação. Com `data_listagem`, os papéis cuja cotação
+    na listagem difere da cotação da base (negociados depois da coleta da base) recebem essa
+    data em `dt_ult_cot`; os demais mantêm a data da base.
+
+    Parâmetros:
+    base (pandas.DataFrame): Registros da base com tipos convertidos, um por ticker.
+    listagem (pandas.DataFrame): Listagem do dia com tipos convertidos, nas colunas do dataset.
+    tipo (str): Tipo de papel ('acoes' ou 'fiis').
+    coluna_papel (str): Coluna do ticker.
+    data_listagem (str): Data da listagem no formato dd/mm/yyyy de `dt_ult_cot`; por padrão,
+        `dt_ult_cot` não é alterada.
+
+    Retorna:
+    pandas.DataFrame: Registros atualizados, na ordem de `base`.
+    """
+    atualizado = base.copy()
+    precos = listagem.drop_duplicates(subset=coluna_papel).set_index(coluna_papel)
+    cotacao_nova = atualizado[coluna_papel].map(precos["vlr_cot"]).to_numpy(dtype="float64")
+    cotacao_anterior = atualizado["vlr_cot"].to_numpy(dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fator = np.where(np.isfinite(cotacao_nova), cotacao_nova / cotacao_anterior, 1.0)
+    if data_listagem is not None and "dt_ult_cot" in atualizado.columns:
+        negociados = np.isfinite(cotacao_nova) & (cotacao_nova != cotacao_anterior)
+        atualizado["dt_ult_cot"] = atualizado["dt_ult_cot"].where(~negociados, data_listagem)
+
+    colunas = COLUNAS_PRECO[tipo]
+    mercado_anterior = atualizado["vlr_mercado"].to_numpy(dtype="float64") if "vlr_mercado" in atualizado else None
+    for coluna in colunas["proporcionais"]:
+        if coluna in atualizado.columns:
+            atualizado[coluna] = atualizado[coluna].to_numpy(dtype="float64") * fator
+    for coluna in colunas["inversas"]:
+        if coluna in atualizado.columns:
+            atualizado[coluna] = atualizado[coluna].to_numpy(dtype="float64") / fator
+
+    if "vlr_firma" in atualizado.columns and mercado_anterior is not None:
+        firma_anterior = atualizado["vlr_firma"].to_numpy(dtype="float64")
+        firma_nova = atualizado["vlr_mercado"].to_numpy(dtype="float64") + (firma_anterior - mercado_anterior)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fator_firma = firma_nova / firma_anterior
+        atualizado["vlr_firma"] = firma_nova
+        for coluna in colunas["valor_firma"]:
+            if coluna in atualizado.columns:
+                atualizado[coluna] = atualizado[coluna].to_numpy(dtype="float64") * fator_firma
+
+    for coluna in precos.columns:
+        if coluna in atualizado.columns and coluna != "datetime_exec":
+            valores = atualizado[coluna_papel].map(precos[coluna])
+            atualizado[coluna] = valores.where(valores.notna(), atualizado[coluna])
+    return atualizado
@@ -0,0 +1,183 @@
+import math
+import threading
+import time
+from typing import Optional
+
+# Códigos de status que indicam que o servidor está limitando as requisições
+STATUS_CONGESTIONAMENTO = (429, 503)
+
+
+class LimitadorTaxa:
+    """
+    Limitador de taxa adaptativo (token bucket com ajuste AIMD), compartilhado por todas as
+    requisições de uma sessão.
+
+    Cada requisição consome um token; os tokens são repostos à taxa atual, em requisições
+    por segundo, até o limite da rajada. A taxa é ajustada pelas respostas: respostas 429/503,
+    timeouts ou latência acima de `limite_latencia` vezes a latência de referência reduzem a
+    taxa multiplicativamente (no máximo uma vez a cada `intervalo_reducao` segundos); respostas
+    saudáveis a aumentam aditivamente, cerca de `incremento` requisições por segundo a cada
+    segundo, até `taxa_maxima`. O método `relatorio` informa a vazão efetiva alcançada.
+
+    É seguro para uso por várias threads.
+
+    Atributos:
+    taxa (float): Taxa atual, em requisições por segundo.
+    rajada (int): Número máximo de requisições liberadas de uma vez.
+    taxa_minima (float): Limite inferior da taxa.
+    taxa_maxima (float): Limite superior da taxa.
+    """
+
+    def __init__(
+            self,
+            requisicoes_por_segundo: float = 2.0,
+            rajada: int = 4,
+            taxa_minima: float = 0.2,
+            taxa_maxima: Optional[float] = None,
+            incremento: float = 0.2,
+            fator_reducao: float = 0.5,
+            limite_latencia: float = 2.0,
+            intervalo_reducao: float = 1.0,
+    ) -> None:
+        """
+        Inicializa o limitador com o balde cheio.
+
+        Parâmetros:
+        requisicoes_por_segundo (float): Taxa inicial, em requisições por segundo.
+        rajada (int): Capacidade do balde de tokens.
+        taxa_minima (float): Limite inferior da taxa após as reduções.
+        taxa_maxima (float): Limite superior da taxa; por padrão, o dobro da taxa inicial.
+        incremento (float): Aumento aditivo da taxa, em requisições por segundo a cada segundo saudável.
+        fator_reducao (float): Fator multiplicativo aplicado à taxa em cada redução.
+        limite_latencia (float): Razão entre a latência recente e a de referência que dispara uma redução.
+        intervalo_reducao (float): Intervalo mínimo, em segundos, entre duas reduções.
+        """
+        if requisicoes_por_segundo <= 0:
+            raise ValueError("A taxa de requisições por segundo deve ser positiva.")
+
+        self.taxa = float(requisicoes_por_segundo)
+        self.rajada = max(1, int(rajada))
+        self.taxa_minima = min(float(taxa_minima), self.taxa)
+        self.taxa_maxima = float(taxa_maxima) if taxa_maxima is not None else 2 * self.taxa
+        self.incremento = incremento
+        self.fator_reducao = fator_reducao
+        self.limite_latencia = limite_latencia
+        self.intervalo_reducao = intervalo_reducao
+
+        self._trava = threading.Lock()
+        self._tokens = float(self.rajada)
+        self._ultima_reposicao = time.monotonic()
+        self._ultima_reducao = float("-inf")
+        self._latencia_recente = None
+        self._latencia_referencia = None
+
+        self._inicio = None
+        self._fim = None
+        self._requisicoes = 0
+        self._respostas = 0
+        self._congestionamentos = 0
+        self._reducoes = 0
+        self._espera_total = 0.0
+        self._latencia_total = 0.0
+        self._taxa_min_atingida = self.taxa
+
+    def _repor(self, agora: float) -> None:
+        self._tokens = min(self.rajada, self._tokens + (agora - self._ultima_reposicao) * self.taxa)
+        self._ultima_reposicao = agora
+
+    def adquirir(self) -> float:
+        """
+        Aguarda até haver um token disponível e o consome.
+
+        Retorna:
+        float: Tempo de espera, em segundos.
+        """
+        espera_total = 0.0
+        while True:
+            with self._trava:
+                agora = time.monotonic()
+                self._repor(agora)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self._requisicoes += 1
+                    self._espera_total += espera_total
+                    if self._inicio is None:
+                        self._inicio = agora
+                    return espera_total
+                espera = (1 - self._tokens) / self.taxa
+            time.sleep(espera)
+            espera_total += espera
+
+    def _reduzir(self, agora: float) -> None:
+        if agora - self._ultima_reducao < self.intervalo_reducao:
+            return
+        self._repor(agora)
+        self.taxa = max(self.taxa_minima, self.taxa * self.fator_reducao)
+        self._tokens = min(self._tokens, 1.0)
+        self._ultima_reducao = agora
+        self._reducoes += 1
+        self._taxa_min_atingida = min(self._taxa_min_atingida, self.taxa)
+
+    def registrar(self, status: Optional[int], latencia: float) -> None:
+        """
+        Ajusta a taxa conforme o resultado de uma requisição.
+
+        Parâmetros:
+        status (int): Código de status da resposta; None quando a requisição falhou por timeout.
+        latencia (float): Duração da requisição, em segundos.
+
+        Retorna:
+        None
+        """
+        with self._trava:
+            agora = time.monotonic()
+            self._fim = agora
+            self._respostas += 1
+            self._latencia_total += latencia
+
+            congestionado = status is None or status in STATUS_CONGESTIONAMENTO
+            if status is not None:
+                # Média móvel exponencial da latência recente
+                recente = latencia if self._latencia_recente is None else 0.8 * self._latencia_recente + 0.2 * latencia
+                self._latencia_recente = recente
+                if self._respostas >= 5:
+                    # A referência acompanha quedas imediatamente e altas lentamente, para que uma
+                    # mudança permanente de patamar não reduza a taxa indefinidamente
+                    referencia = self._latencia_referencia
+                    if referencia is None or recente < referencia:
+                        self._latencia_referencia = recente
+                    else:
+                        self._latencia_referencia = referencia + 0.02 * (recente - referencia)
+                    congestionado |= recente > self.limite_latencia * self._latencia_referencia
+
+            if congestionado:
+                self._congestionamentos += 1
+                self._reduzir(agora)
+            else:
+                self._repor(agora)
+                self.taxa = min(self.taxa_maxima, self.taxa + self.incremento / self.taxa)
+
+    def relatorio(self) -> dict:
+        """
+        Resume o comportamento do limitador desde a primeira requisição.
+
+        Retorna:
+        dict: Requisições, duração, vazão efetiva (requisições por segundo), taxa atual e mínima
+        atingida, reduções, respostas congestionadas, espera e latência médias e a concorrência
+        sugerida (taxa atual x latência média, pela lei de Little).
+        """
+        with self._trava:
+            duracao = (self._fim or time.monotonic()) - self._inicio if self._inicio is not None else 0.0
+            latencia_media = self._latencia_total / self._respostas if self._respostas else 0.0
+            return {
+                "requisicoes": self._requisicoes,
+                "duracao_s": round(duracao, 3),
+                "vazao_efetiva": round(self._requisicoes / duracao, 3) if duracao > 0 else 0.0,
+                "taxa_atual": round(self.taxa, 3),
+                "taxa_minima_atingida": round(self._taxa_min_atingida, 3),
+                "reducoes": self._reducoes,
+                "congestionamentos": self._congestionamentos,
+                "espera_media_s": round(self._espera_total / self._requisicoes, 4) if self._requisicoes else 0.0,
+                "latencia_media_s": round(latencia_media, 4),
+                "concorrencia_sugerida": max(1, math.ceil(self.taxa * latencia_media)),
+            }
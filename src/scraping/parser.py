@@ -0,0 +1,96 @@
+from typing import Iterable, Union
+
+import lxml.html
+from lxml import etree
+
+# Tabelas de indicadores da página de detalhes do Fundamentus
+_XPATH_TABELAS_INDICADORES = etree.XPath(
+    "//table[contains(concat(' ', normalize-space(@class), ' '), ' w728 ')]"
+)
+
+
+def _renomear_titulos_duplicados(headings: list) -> list:
+    """
+    Acrescenta o sufixo '_1' aos títulos repetidos de uma linha.
+
+    Nas tabelas de resultados, a mesma linha traz o valor dos últimos 12 meses e dos
+    últimos 3 meses com o mesmo título; a primeira ocorrência (12 meses) recebe o sufixo.
+    Só é chamada para as poucas linhas que de fato possuem títulos repetidos.
+
+    Parâmetros:
+    headings (list): Títulos extraídos da linha.
+
+    Retorna:
+    list: Títulos com as ocorrências repetidas renomeadas.
+    """
+    for header in headings:
+        if headings.count(header) > 1:
+            headings[headings.index(header)] = header + "_1"
+    return headings
+
+
+def extrair_pares_indicadores(html_content: Union[str, bytes], variation_headings: Iterable[str]) -> dict:
+    """
+    Extrai os pares título/valor das tabelas de indicadores (`table.w728`) de uma página
+    de detalhes do Fundamentus.
+
+    Percorre a árvore lxml uma única vez, lendo o texto de cada célula apenas uma vez.
+    Células que contêm '?' (ícone de ajuda) ou que correspondem a um indicador de variação
+    temporal são títulos; as demais são valores, associados aos títulos na ordem da linha.
+
+    Parâmetros:
+    html_content (str or bytes): Conteúdo HTML da página de detalhes.
+    variation_headings (Iterable[str]): Títulos de variação temporal sem ícone de ajuda.
+
+    Retorna:
+    dict: Mapeamento título -> valor (texto), com sufixo '_1' nos títulos de 12 meses.
+    """
+    variacoes = frozenset(variation_headings)
+    arvore = lxml.html.fromstring(html_content)
+
+    financial_data = {}
+    for tabela in _XPATH_TABELAS_INDICADORES(arvore):
+        for linha in tabela.iter("tr"):
+            textos = [celula.text_content() for celula in linha.iter("td")]
+
+            headings = [texto.replace("?", "").strip() for texto in textos if "?" in texto or texto in variacoes]
+            if not headings:
+                continue
+            if len(set(headings)) != len(headings):
+                headings = _renomear_titulos_duplicados(headings)
+
+            titulos = frozenset(headings)
+            values = [texto.strip() for texto in textos if "?" not in texto and texto not in titulos]
+            financial_data.update(zip(headings, values))
+
+    return financial_data
+
+
+# Tabela de resultados das páginas de listagem (resultado.php / fii_resultado.php)
+_XPATH_TABELA_LISTAGEM = etree.XPath("//table[@id='resultado'] | (//table)[1][not(//table[@id='resultado'])]")
+
+
+def extrair_tabela_listagem(html_content: Union[str, bytes]) -> tuple:
+    """
+    Extrai o cabeçalho e as linhas da tabela de resultados de uma página de listagem.
+
+    Parâmetros:
+    html_content (str or bytes): Conteúdo HTML de resultado.php ou fii_resultado.php.
+
+    Retorna:
+    tuple: (cabeçalhos, linhas), onde cabeçalhos é uma lista de títulos de coluna e
+    linhas é uma lista de listas com o texto de cada célula.
+    """
+    arvore = lxml.html.fromstring(html_content)
+    tabelas = _XPATH_TABELA_LISTAGEM(arvore)
+    if not tabelas:
+        return [], []
+
+    tabela = tabelas[0]
+    cabecalhos = [" ".join(th.text_content().split()) for th in tabela.iter("th")]
+    linhas = []
+    for linha in tabela.iter("tr"):
+        celulas = [td.text_content().strip() for td in linha.iter("td")]
+        if celulas:
+            linhas.append(celulas)
+    return cabecalhos, linhas
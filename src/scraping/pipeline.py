@@ -0,0 +1,193 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Iterator, Optional
+
+from .parser import extrair_pares_indicadores
+
+# Marcador de fim enviado por cada thread de download à fila de páginas
+_FIM = object()
+
+
+class ErroExtracao(RuntimeError):
+    """Lançada quando a extração de uma página falha no processo de parsing."""
+
+
+def _extrair_lote(lote: list, variation_headings: tuple) -> list:
+    """
+    Extrai os indicadores de um lote de páginas (executada nos processos de parsing).
+
+    Parâmetros:
+    lote (list): Pares (ticker, html).
+    variation_headings (tuple): Títulos de variação temporal sem ícone de ajuda.
+
+    Retorna:
+    list: Tuplas (ticker, financial_data, mensagem_de_erro, segundos_parse), com financial_data
+    ou a mensagem de erro None.
+    """
+    resultados = []
+    for ticker, html_content in lote:
+        inicio = time.perf_counter()
+        try:
+            financial_data, mensagem = extrair_pares_indicadores(html_content, variation_headings), None
+        except Exception as erro:
+            financial_data, mensagem = None, f"{type(erro).__name__}: {erro}"
+        resultados.append((ticker, financial_data, mensagem, time.perf_counter() - inicio))
+    return resultados
+
+
+class PipelineColeta:
+    """
+    Pipeline de coleta em dois estágios: threads de download e processos de parsing.
+
+    As threads de download colocam as páginas em uma fila limitada (`tamanho_fila`); quando
+    o parsing não acompanha, os downloads ficam bloqueados na fila (backpressure). As páginas
+    são agrupadas em lotes de `tamanho_lote` e extraídas por um pool de processos, fora do
+    GIL, com no máximo dois lotes pendentes por processo. Os resultados são devolvidos por
+    um gerador, na ordem em que ficam prontos.
+
+    Atributos:
+    baixar (callable): Função ticker -> HTML usada pelas threads de download.
+    variation_headings (tuple): Títulos de variação temporal sem ícone de ajuda.
+    workers_io (int): Número de threads de download.
+    processos (int): Número de processos de parsing; 0 extrai as páginas na thread consumidora.
+    tamanho_fila (int): Número máximo de páginas baixadas aguardando parsing.
+    tamanho_lote (int): Número de páginas enviadas a um processo por vez.
+    """
+
+    def __init__(
+            self,
+            baixar: Callable[[str], str],
+            variation_headings,
+            workers_io: int = 8,
+            processos: Optional[int] = None,
+            tamanho_fila: int = 64,
+            tamanho_lote: int = 4,
+    ) -> None:
+        """
+        Inicializa o pipeline. O pool de processos é criado na primeira execução e
+        reaproveitado até `fechar`.
+
+        Parâmetros:
+        baixar (callable): Função ticker -> HTML usada pelas threads de download.
+        variation_headings (Iterable[str]): Títulos de variação temporal sem ícone de ajuda.
+        workers_io (int): Número de threads de download.
+        processos (int): Número de processos de parsing; por padrão, o número de núcleos.
+        tamanho_fila (int): Número máximo de páginas baixadas aguardando parsing.
+        tamanho_lote (int): Número de páginas enviadas a um processo por vez.
+        """
+        self.baixar = baixar
+        self.variation_headings = tuple(variation_headings)
+        self.workers_io = max(1, int(workers_io))
+        self.processos = (os.cpu_count() or 1) if processos is None else max(0, int(processos))
+        self.tamanho_fila = max(1, int(tamanho_fila))
+        self.tamanho_lote = max(1, int(tamanho_lote))
+        self._executor = None
+
+    def _pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.processos and self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.processos)
+            # Com fork, todos os processos são criados na primeira tarefa; ela é enviada aqui,
+            # antes das threads de download existirem, para que nenhum filho herde um lock
+            # (urllib3, limitador, logging) adquirido por uma delas
+            self._executor.submit(int).result()
+        return self._executor
+
+    def fechar(self) -> None:
+        """Encerra o pool de processos de parsing."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "PipelineColeta":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fechar()
+
+    def _iniciar_downloads(self, tickers: list, paginas: queue.Queue, parar: threading.Event) -> int:
+        entrada = queue.SimpleQueue()
+        for ticker in tickers:
+            entrada.put(ticker)
+
+        def trabalhador() -> None:
+            while not parar.is_set():
+                try:
+                    ticker = entrada.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    item = (ticker, self.baixar(ticker), None)
+                except Exception as erro:
+                    item = (ticker, None, erro)
+                paginas.put(item)
+            paginas.put(_FIM)
+
+        num_threads = min(self.workers_io, max(1, len(tickers)))
+        for _ in range(num_threads):
+            threading.Thread(target=trabalhador, daemon=True).start()
+        return num_threads
+
+    def executar(self, tickers: list) -> Iterator[tuple]:
+        """
+        Baixa e extrai as páginas de detalhes dos tickers.
+
+        Parâmetros:
+        tickers (list): Tickers a coletar.
+
+        Retorna:
+        Iterator[tuple]: Tuplas (ticker, financial_data, erro, segundos_parse), na ordem de
+        conclusão; em caso de falha, financial_data é None e erro traz a exceção do download ou
+        da extração. segundos_parse é a duração da extração da página (None se o download falhou).
+        """
+        if not tickers:
+            return
+
+        executor = self._pool()
+        paginas = queue.Queue(maxsize=self.tamanho_fila)
+        parar = threading.Event()
+        threads_ativas = self._iniciar_downloads(tickers, paginas, parar)
+        max_pendentes = 2 * self.processos
+        pendentes = set()
+        lote = []
+
+        def resultados_do_lote(resultados: list) -> Iterator[tuple]:
+            for ticker, financial_data, mensagem, segundos in resultados:
+                yield ticker, financial_data, ErroExtracao(mensagem) if mensagem else None, segundos
+
+        try:
+            while threads_ativas or lote or pendentes:
+                # Recebe páginas enquanto há capacidade de parsing; caso contrário, espera um lote
+                if threads_ativas and len(pendentes) < max(1, max_pendentes):
+                    item = paginas.get()
+                    if item is _FIM:
+                        threads_ativas -= 1
+                    else:
+                        ticker, html_content, erro = item
+                        if erro is not None:
+                            yield ticker, None, erro, None
+                        else:
+                            lote.append((ticker, html_content))
+
+                lote_cheio = len(lote) >= self.tamanho_lote
+                if lote and (lote_cheio or paginas.empty() or not threads_ativas):
+                    if executor is None:
+                        yield from resultados_do_lote(_extrair_lote(lote, self.variation_headings))
+                    else:
+                        pendentes.add(executor.submit(_extrair_lote, lote, self.variation_headings))
+                    lote = []
+
+                if pendentes:
+                    bloquear = len(pendentes) >= max_pendentes or not threads_ativas
+                    prontos, pendentes = wait(pendentes, timeout=None if bloquear else 0,
+                                              return_when=FIRST_COMPLETED)
+                    for futuro in prontos:
+                        yield from resultados_do_lote(futuro.result())
+        finally:
+            # Interrompe os downloads se o consumidor abandonar o gerador
+            parar.set()
+            while threads_ativas:
+                if paginas.get() is _FIM:
+                    threads_ativas -= 1
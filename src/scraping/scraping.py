@@ -1,11 +1,28 @@
+import asyncio
+import functools
+import os
+import time
+from typing import Callable, Iterator, Optional, Union
+
+from armazenamento import GravadorTabela, ler_tabela, salvar_tabela
+from conversao import converter_colunas_br
+from metricas import Metricas
 from util import Utils
 import pandas as pd
-import numpy as np
 import logging
 from datetime import datetime, timedelta, timezone
-import requests
 from bs4 import BeautifulSoup
 
+from .acumulador import AcumuladorColunar
+from .cache import CacheHttp
+from .diario import DIRETORIO_EXECUCOES, DiarioExecucao
+from .falhas import FilaFalhas, LayoutDesconhecidoError
+from .incremental import COLUNA_COLETA, atualizar_precos, classificar_desatualizados
+from .limitador import LimitadorTaxa
+from .parser import extrair_pares_indicadores, extrair_tabela_listagem
+from .pipeline import PipelineColeta
+from .sessao import SessaoHttp
+
 # URL para extração de todos os tickers de ações e FIIs
 URL_TICKERS_ACOES = "https://www.fundamentus.com.br/resultado.php"
 URL_TICKERS_FIIS = "https://www.fundamentus.com.br/fii_resultado.php"
@@ -38,6 +55,9 @@ class Scraping:
     variation_headings (list): Lista de indicadores de variação temporal.
     metadata_cols_acoes (dict): Mapeamento de colunas para ações.
     metadata_cols_fiis (dict): Mapeamento de colunas para FIIs.
+    sessao (SessaoHttp): Sessão HTTP compartilhada por todas as requisições.
+    limitador (LimitadorTaxa): Limitador de taxa da sessão, ou None.
+    metricas (Metricas): Coletor de métricas (spans por etapa, latência por ticker, bytes baixados).
     """
 
     def __init__(
@@ -49,7 +69,15 @@ class Scraping:
             request_header: dict = REQUEST_HEADER,
             variation_headings: list = VARIATION_HEADINGS,
             metadata_cols_acoes: dict = Utils.METADATA_COLS_ACOES,
-            metadata_cols_fiis: dict = Utils.METADATA_COLS_FIIS
+            metadata_cols_fiis: dict = Utils.METADATA_COLS_FIIS,
+            sessao: Optional[SessaoHttp] = None,
+            timeout: Union[float, tuple] = (5, 30),
+            tentativas: int = 3,
+            cache: Optional[CacheHttp] = None,
+            limitador: Optional[LimitadorTaxa] = None,
+            formato_armazenamento: Optional[str] = None,
+            diretorio_execucoes: str = DIRETORIO_EXECUCOES,
+            metricas: Optional[Metricas] = None
     ) -> None:
         """
         Inicializa a classe Scraping com os parâmetros especificados.
@@ -63,6 +91,17 @@ class Scraping:
         variation_headings (list): Lista de indicadores de variação temporal.
         metadata_cols_acoes (dict): Mapeamento de colunas para ações.
         metadata_cols_fiis (dict): Mapeamento de colunas para FIIs.
+        sessao (SessaoHttp): Sessão HTTP a reutilizar; se omitida, uma nova é criada.
+        timeout (float or tuple): Timeout (conexão, leitura) de cada requisição, em segundos.
+        tentativas (int): Número de novas tentativas, com backoff exponencial, em respostas 5xx/429.
+        cache (CacheHttp): Cache em disco das respostas HTTP (ignorado quando `sessao` é informada).
+        limitador (LimitadorTaxa): Limitador de taxa adaptativo compartilhado por todas as
+            requisições (ignorado quando `sessao` é informada); None não limita a taxa.
+        formato_armazenamento (str): Formato dos arquivos gravados ('feather', 'parquet' ou 'csv');
+            por padrão, Feather se o pyarrow estiver instalado, CSV caso contrário.
+        diretorio_execucoes (str): Diretório dos diários usados para retomar coletas interrompidas.
+        metricas (Metricas): Coletor de métricas compartilhado com as demais etapas; se omitido,
+            um novo é criado.
         """
         self.logger_level = logger_level
         self.logger = Utils.log_config(logger_level=self.logger_level)
@@ -73,6 +112,11 @@ class Scraping:
         self.variation_headings = variation_headings
         self.metadata_cols_acoes = metadata_cols_acoes
         self.metadata_cols_fiis = metadata_cols_fiis
+        self.formato_armazenamento = formato_armazenamento
+        self.diretorio_execucoes = diretorio_execucoes
+        self.falhas = FilaFalhas()
+        self.resumo_coleta = {}
+        self.metricas = metricas or Metricas()
 
         logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
         self.logger = logging.getLogger(__name__)
@@ -81,10 +125,13 @@ class Scraping:
             'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64; rv:109.0) Gecko/20100101 Firefox/117.0',
             'Accept': '*/*',
             'Accept-Language': 'pt-BR,pt;q=0.8,en-US;q=0.5,en;q=0.3',
-            'DNT': '1',
-            'Connection': 'close'
+            'DNT': '1'
         }
 
+        self.sessao = sessao or SessaoHttp(timeout=timeout, tentativas=tentativas, cache=cache, limitador=limitador,
+                                            metricas=self.metricas)
+        self.limitador = self.sessao.limitador
+
     @staticmethod
     def _parse_float_cols(df: pd.DataFrame, cols_list: list) -> pd.DataFrame:
         """
@@ -97,12 +144,7 @@ class Scraping:
         Retorna:
         pandas.DataFrame: DataFrame com as colunas convertidas para float.
         """
-        for col in cols_list:
-            df[col] = df[col].replace('[^0-9,]', '', regex=True)
-            df[col] = df[col].replace("", np.nan)
-            df[col] = df[col].replace(",", ".", regex=True)
-            df[col] = df[col].astype(float)
-        return df
+        return converter_colunas_br(df, cols_list)
 
     @staticmethod
     def _parse_pct_cols(df: pd.DataFrame, cols_list: list) -> pd.DataFrame:
@@ -116,10 +158,59 @@ class Scraping:
         Retorna:
         pandas.DataFrame: DataFrame com as colunas convertidas para porcentagem (float).
         """
-        for col in cols_list:
-            df[col] = df[col].replace("%", "")
-            df[col] = df[col].astype(float) / 100
-        return df
+        return converter_colunas_br(df, cols_list, fracao=True)
+
+    def _baixar_listagem(self, tipo_prep: str) -> str:
+        """
+        Baixa o HTML da página de listagem (resultado.php ou fii_resultado.php).
+
+        Parâmetros:
+        tipo_prep (str): Tipo de papel já normalizado ('acoes' ou 'fiis').
+
+        Retorna:
+        str: Conteúdo HTML da página.
+        """
+        if tipo_prep == "acoes":
+            url = self.url_tickers_acoes
+            self.logger.info("Extraindo lista de tickers de ações da B3")
+        else:
+            url = self.url_tickers_fiis
+            self.logger.info("Extraindo lista de tickers de FIIs da B3")
+
+        with self.metricas.etapa("scraping.listagem") as etapa:
+            resposta = self.sessao.get(url, headers=self.headers)
+            etapa.bytes = len(resposta.content)
+        return resposta.text
+
+    def _converter_tipos(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Converte as colunas numéricas (prefixos vlr_, vol_, num_, pct_, ...) para float,
+        transformando as colunas pct_ em fração decimal.
+
+        Parâmetros:
+        df (pandas.DataFrame): DataFrame com as colunas já renomeadas.
+
+        Retorna:
+        pandas.DataFrame: DataFrame com as colunas convertidas.
+        """
+        float_cols_to_parse = [
+            col for col in list(df.columns)
+            if col[:4] in (
+                "vlr_", "vol_", "num_", "pct_", "qtd_", "max_", "min_",
+                "total_"
+            )
+        ]
+        percent_cols_to_parse = [
+            col for col in float_cols_to_parse if col[:4] in "pct_"
+        ]
+        df_float_prep = self._parse_float_cols(
+            df=df,
+            cols_list=float_cols_to_parse
+        )
+        return self._parse_pct_cols(
+            df=df_float_prep,
+            cols_list=percent_cols_to_parse
+        )
 
     def retornar_lista_papeis(self, tipo: str, diretorio: str, nome_do_arquivo=str):
         """
@@ -140,14 +231,7 @@ class Scraping:
             if tipo_prep not in ("acoes", "fiis"):
                 raise TypeError(f"Tipo inválido para o método (tipo={tipo}). Opções válidas: 'acoes' ou 'fiis'.")
 
-            if tipo_prep == "acoes":
-                url = self.url_tickers_acoes
-                self.logger.info("Extraindo lista de tickers de ações da B3")
-            else:
-                url = self.url_tickers_fiis
-                self.logger.info("Extraindo lista de tickers de FIIs da B3")
-
-            html_content = requests.get(url, headers=self.headers).text
+            html_content = self._baixar_listagem(tipo_prep)
             soup = BeautifulSoup(html_content, "html.parser")
 
             tickers = [row.find_all("a")[0].text.strip() for row in soup.find_all("tr")[1:]]
@@ -166,161 +250,738 @@ class Scraping:
             self.logger.error(f"Erro durante a extração de lista de tickers: {e}")
             return []
 
-    def coleta_indicadores_de_ativos(self, tickers, parse_dtypes=False) -> pd.DataFrame:
+    def _ler_lista_tickers(self, tickers) -> Optional[list]:
         """
-        Coleta indicadores financeiros para uma lista de tickers.
+        Normaliza a entrada de tickers aceita pelos métodos de coleta.
 
         Parâmetros:
-        tickers (list or str): Lista de tickers ou caminho para um arquivo CSV com tickers.
-        parse_dtypes (bool): Indica se deve converter tipos de dados após a coleta.
+        tickers (list or str): Lista de tickers ou caminho (com ou sem extensão) do arquivo com tickers.
 
         Retorna:
-        pandas.DataFrame: DataFrame com os indicadores financeiros dos tickers.
+        list: Lista de tickers, ou None caso a entrada seja inválida.
         """
         if isinstance(tickers, list):
-            tickers_list = tickers
+            return tickers
         elif isinstance(tickers, str):
             try:
-                tickers_df = pd.read_csv(tickers)
-                tickers_list = tickers_df['tickers'].tolist()
+                tickers_df = ler_tabela(tickers, colunas=['tickers'])
+                return tickers_df['tickers'].tolist()
             except Exception as e:
-                self.logger.error(f"Erro ao ler o arquivo CSV: {e}")
-                return pd.DataFrame()
+                self.logger.error(f"Erro ao ler o arquivo de tickers: {e}")
+                return None
         else:
             self.logger.error("Tipo de entrada inválido.")
-            return pd.DataFrame()
+            return None
+
+    def _baixar_pagina_ativo(self, ticker: str) -> str:
+        """
+        Baixa o HTML da página de detalhes de um ticker.
+
+        Parâmetros:
+        ticker (str): Código do papel.
+
+        Retorna:
+        str: Conteúdo HTML da página.
+        """
+        url = self.url_kpis_ticker + ticker.strip().upper()
+        # A latência e os bytes das respostas da rede são registrados pela sessão
+        resposta = self.sessao.get(url, headers=self.request_header)
+        resposta.raise_for_status()
+        return resposta.text
+
+    def _extrair_registro_ativo(self, html_content: str, ticker: str) -> tuple:
+        """
+        Extrai os indicadores financeiros da página de detalhes de um ticker.
+
+        Parâmetros:
+        html_content (str): Conteúdo HTML da página de detalhes.
+        ticker (str): Código do papel (usado nas mensagens de log e erro).
+
+        Retorna:
+        tuple: (financial_data, metadata_cols), com o mapeamento título -> valor extraído e
+        o mapeamento de colunas correspondente ao tipo do papel (ação ou FII).
+        """
+        inicio = time.perf_counter()
+        financial_data = extrair_pares_indicadores(html_content, self.variation_headings)
+        self.metricas.observar("parse_ticker_segundos", time.perf_counter() - inicio)
+        return financial_data, self._identificar_registro(financial_data, ticker)
+
+    def _identificar_registro(self, financial_data: dict, ticker: str) -> dict:
+        """
+        Identifica o tipo do papel (ação ou FII) a partir dos indicadores extraídos.
+
+        Parâmetros:
+        financial_data (dict): Mapeamento título -> valor extraído da página de detalhes.
+        ticker (str): Código do papel (usado nas mensagens de log e erro).
+
+        Retorna:
+        dict: Mapeamento de colunas correspondente ao tipo do papel.
+        """
+        if "Papel" in financial_data:
+            metadata_cols = self.metadata_cols_acoes
+        elif "FII" in financial_data:
+            metadata_cols = self.metadata_cols_fiis
+        else:
+            raise LayoutDesconhecidoError("Não foram encontradas informações financeiras "
+                                          f"para o ticker '{ticker}'. Verifique se o mesmo "
+                                          "refere-se a uma Ação ou Fundo Imobiliário.")
+
+        titulos_ausentes = [titulo for titulo in metadata_cols if titulo not in financial_data]
+        if titulos_ausentes:
+            self.logger.debug("Ocorreu um erro ao tentar mapear as colunas "
+                              "dos indicadores financeiros no DataFrame "
+                              "resultante do processo de web scrapping para "
+                              f"o ticker {ticker}.\n\n"
+                              "Existem uma série de motivos capazes de "
+                              "ocasionar esta falha no mapeamento, como por "
+                              "exemplo:\n\n"
+                              "1. Alteração no layout do portal Fundamentus.\n"
+                              "2. Diferença entre indicadores entre ativos "
+                              "distintos.\n\n"
+                              "Por experiências de consumo, o layout do site "
+                              "não costuma sofrer alterações, sendo mais "
+                              "provável a segunda hipótese que defende que "
+                              "diferentes ativos podem apresentar diferentes "
+                              "indicadores.\n\n"
+                              f"Indicadores ausentes: {titulos_ausentes}")
+
+        return metadata_cols
+
+    @staticmethod
+    def _datetime_exec() -> str:
+        now = datetime.now(timezone(timedelta(hours=-3)))
+        return now.strftime("%d-%m-%Y %H:%M:%S")
+
+    def _finalizar_coleta(self, acumulador: AcumuladorColunar, parse_dtypes=False) -> pd.DataFrame:
+        """
+        Materializa o DataFrame da coleta, convertendo os tipos em uma única passada.
+
+        Parâmetros:
+        acumulador (AcumuladorColunar): Registros acumulados durante a coleta.
+        parse_dtypes (bool): Indica se deve converter tipos de dados após a coleta.
+
+        Retorna:
+        pandas.DataFrame: DataFrame com os indicadores financeiros dos tickers.
+        """
+        final_df = acumulador.para_dataframe()
+        if parse_dtypes and not final_df.empty:
+            final_df = self._converter_tipos(final_df)
+        return final_df
+
+    def _tipo_do_registro(self, metadata_cols: dict) -> str:
+        return "fiis" if metadata_cols is self.metadata_cols_fiis else "acoes"
+
+    def _abrir_diario(self, id_execucao: Optional[str], total: int) -> Optional[DiarioExecucao]:
+        """
+        Abre o diário da execução informada, se houver.
+
+        Parâmetros:
+        id_execucao (str): Identificador da execução; None desativa o diário.
+        total (int): Número de tickers da coleta, usado apenas no log.
+
+        Retorna:
+        DiarioExecucao: Diário aberto, ou None.
+        """
+        if id_execucao is None:
+            return None
+        diario = DiarioExecucao(id_execucao, diretorio=self.diretorio_execucoes)
+        if len(diario):
+            self.logger.info(f"{len(diario)} de {total} tickers recuperados do diário da execução '{id_execucao}'")
+        return diario
+
+    def _registro_do_diario(self, diario: Optional[DiarioExecucao], ticker: str) -> Optional[tuple]:
+        registro = diario.obter(ticker) if diario is not None else None
+        if registro is None:
+            return None
+        metadata_cols = self.metadata_cols_fiis if registro["tipo"] == "fiis" else self.metadata_cols_acoes
+        return registro["dados"], metadata_cols, registro["datetime_exec"]
+
+    def _coletar_registro(self, html_content: str, ticker: str, diario: Optional[DiarioExecucao]) -> tuple:
+        """
+        Extrai o registro de um ticker e o grava no diário da execução, se houver.
+
+        Parâmetros:
+        html_content (str): Conteúdo HTML da página de detalhes.
+        ticker (str): Código do papel.
+        diario (DiarioExecucao): Diário da execução, ou None.
+
+        Retorna:
+        tuple: (financial_data, metadata_cols, datetime_exec).
+        """
+        financial_data, metadata_cols = self._extrair_registro_ativo(html_content, ticker)
+        return self._gravar_registro(financial_data, metadata_cols, ticker, diario)
+
+    def _gravar_registro(self, financial_data: dict, metadata_cols: dict, ticker: str,
+                         diario: Optional[DiarioExecucao]) -> tuple:
+        """
+        Monta o registro de um ticker já extraído, gravando-o no diário da execução.
+
+        Parâmetros:
+        financial_data (dict): Indicadores extraídos da página de detalhes.
+        metadata_cols (dict): Mapeamento de colunas do tipo do papel.
+        ticker (str): Código do papel.
+        diario (DiarioExecucao): Diário da execução, ou None.
+
+        Retorna:
+        tuple: (financial_data, metadata_cols, datetime_exec).
+        """
+        datetime_exec = self._datetime_exec()
+        if diario is not None:
+            diario.registrar(ticker, self._tipo_do_registro(metadata_cols), financial_data, datetime_exec)
+        return financial_data, metadata_cols, datetime_exec
+
+    def _coletar_ticker(self, ticker: str, i: int, total: int, diario: Optional[DiarioExecucao],
+                        falhas: FilaFalhas) -> Optional[tuple]:
+        """
+        Coleta um ticker, isolando a falha: em caso de erro, o ticker vai para a fila de
+        falhas e a coleta dos demais continua.
+
+        Parâmetros:
+        ticker (str): Código do papel.
+        i (int): Posição do ticker na rodada (usada no log).
+        total (int): Número de tickers da rodada.
+        diario (DiarioExecucao): Diário da execução, ou None.
+        falhas (FilaFalhas): Fila de falhas, atualizada in-place.
+
+        Retorna:
+        tuple: Registro (financial_data, metadata_cols, datetime_exec), ou None em caso de falha.
+        """
+        registro = self._registro_do_diario(diario, ticker)
+        if registro is None:
+            self.logger.info(f"Processando papel {i}/{total}: {ticker}")
+            try:
+                html_content = self._baixar_pagina_ativo(ticker)
+                registro = self._coletar_registro(html_content, ticker, diario)
+            except Exception as erro:
+                self._registrar_falha(falhas, ticker, erro)
+                return None
+        falhas.remover(ticker)
+        return registro
+
+    def _registrar_falha(self, falhas: FilaFalhas, ticker: str, erro: Exception) -> None:
+        falha = falhas.adicionar(ticker, erro)
+        self.logger.warning(f"Falha ao coletar o papel {ticker} ({falha['motivo']}, tentativa "
+                            f"{falha['tentativas']}): {falha['detalhe']}")
+
+    def _tickers_para_retentativa(self, falhas: FilaFalhas, rodada: int, concorrencia: int) -> list:
+        pendentes = falhas.transitorias()
+        if pendentes:
+            self.logger.info(f"Retentativa {rodada}: {len(pendentes)} papéis com falhas transitórias "
+                             f"(concorrência {concorrencia})")
+        return pendentes
+
+    def _encerrar_coleta(self, tickers_list: list, registros: dict, falhas: FilaFalhas, recuperados: set,
+                         diario: Optional[DiarioExecucao], parse_dtypes: bool) -> pd.DataFrame:
+        """
+        Monta o resultado na ordem da lista de entrada, sem os tickers descartados, e
+        registra o resumo da coleta em `falhas` e `resumo_coleta`.
+
+        Parâmetros:
+        tickers_list (list): Tickers da coleta, na ordem de entrada.
+        registros (dict): Registros coletados (ticker -> registro).
+        falhas (FilaFalhas): Tickers descartados após as retentativas.
+        recuperados (set): Tickers coletados com sucesso em uma retentativa.
+        diario (DiarioExecucao): Diário da execução, ou None.
+        parse_dtypes (bool): Indica se deve converter tipos de dados após a coleta.
+
+        Retorna:
+        pandas.DataFrame: DataFrame com os indicadores financeiros dos tickers coletados.
+        """
+        acumulador = AcumuladorColunar()
+        for ticker in tickers_list:
+            if ticker in registros:
+                financial_data, metadata_cols, datetime_exec = registros[ticker]
+                acumulador.adicionar(financial_data, metadata_cols, datetime_exec=datetime_exec)
+
+        self._resumir_coleta(len(set(tickers_list)), len(registros), falhas, recuperados, diario)
+        return self._finalizar_coleta(acumulador, parse_dtypes=parse_dtypes)
+
+    def _resumir_coleta(self, total: int, coletados: int, falhas: FilaFalhas, recuperados: set,
+                        diario: Optional[DiarioExecucao]) -> None:
+        """
+        Registra o resumo da coleta em `falhas` e `resumo_coleta` (com o relatório do limitador
+        de taxa, se houver) e arquiva o diário da execução quando nenhum ticker foi descartado.
+
+        Parâmetros:
+        total (int): Número de tickers distintos da coleta.
+        coletados (int): Número de tickers coletados.
+        falhas (FilaFalhas): Tickers descartados após as retentativas.
+        recuperados (set): Tickers coletados com sucesso em uma retentativa.
+        diario (DiarioExecucao): Diário da execução, ou None.
 
-        # Lista para acumular os DataFrames resultantes de cada ticker
-        dfs = []
-
-        for i, ticker in enumerate(tickers_list, start=1):
-            self.logger.info(f"Processando papel {i}/{len(tickers_list)}: {ticker}")
-
-            url = self.url_kpis_ticker + ticker.strip().upper()
-            html_content = requests.get(url=url, headers=self.request_header).text
-            soup = BeautifulSoup(html_content, "lxml")
-            tables = soup.find_all("table", attrs={'class': 'w728'})
-
-            financial_data_raw = []
-            for table in tables:
-                table_row = table.find_all("tr")
-                for table_data in table_row:
-                    cells_list = table_data.find_all("td")
-                    headings = [
-                        cell.text.replace("?", "").strip()
-                        for cell in cells_list
-                        if "?" in cell.text or cell.text in self.variation_headings
-                    ]
-                    for header in headings:
-                        if headings.count(header) > 1:
-                            new_header_name = header + "_1"
-                            headings[headings.index(header)] = new_header_name
-                    values = [
-                        cell.text.strip() for cell in cells_list
-                        if ("?" not in cell.text) and (cell.text not in headings)
-                    ]
-                    table_data_dict = {
-                        header: value for header, value in zip(headings, values)
-                    }
-                    if table_data_dict != {}:
-                        financial_data_raw.append(table_data_dict)
-
-            financial_data = {
-                name: value for dictionary in financial_data_raw
-                for name, value in dictionary.items()
-            }
-
-            if "Papel" in financial_data:
-                metadata_cols = self.metadata_cols_acoes
-            elif "FII" in financial_data:
-                metadata_cols = self.metadata_cols_fiis
+        Retorna:
+        None
+        """
+        self.falhas = falhas
+        self.resumo_coleta = {
+            "total": total,
+            "coletados": coletados,
+            "recuperados_na_retentativa": len(recuperados),
+            "descartados": len(falhas),
+            "falhas_por_motivo": falhas.por_motivo(),
+        }
+        if self.limitador is not None:
+            # Vazão efetiva alcançada sob o limitador de taxa
+            self.resumo_coleta["limitador"] = self.limitador.relatorio()
+        if falhas:
+            self.logger.warning(f"Coleta concluída com {len(falhas)} papéis descartados: {self.resumo_coleta}")
+        else:
+            self.logger.info(f"Coleta concluída: {self.resumo_coleta}")
+
+        if diario is not None:
+            if falhas:
+                # Mantém o diário: uma nova execução com o mesmo id coleta apenas os descartados
+                self.logger.info(f"Diário da execução '{diario.id_execucao}' mantido para retomada.")
             else:
-                raise TypeError("Não foram encontradas informações financeiras "
-                                f"para o ticker '{ticker}'. Verifique se o mesmo "
-                                "refere-se a uma Ação ou Fundo Imobiliário.")
-
-            df_ativo_raw = pd.DataFrame(financial_data, index=[0])
-            df_indicadores_ativo = df_ativo_raw.rename(
-                columns=metadata_cols,
-                errors="ignore"
-            )
+                diario.concluir()
 
-            dataset_cols = list(metadata_cols.values())
+    def _coletar_rodada_pipeline(self, pipeline: PipelineColeta, pendentes: list, diario: Optional[DiarioExecucao],
+                                 falhas: FilaFalhas) -> Iterator[tuple]:
+        """
+        Coleta uma rodada de tickers pelo pipeline de download/parsing, com as mesmas regras
+        de diário e isolamento de falhas de `_coletar_ticker`.
+
+        Parâmetros:
+        pipeline (PipelineColeta): Pipeline de download e parsing.
+        pendentes (list): Tickers da rodada.
+        diario (DiarioExecucao): Diário da execução, ou None.
+        falhas (FilaFalhas): Fila de falhas, atualizada in-place.
+
+        Retorna:
+        Iterator[tuple]: Pares (ticker, registro) dos tickers coletados, à medida que ficam prontos.
+        """
+        a_baixar = []
+        for ticker in pendentes:
+            registro = self._registro_do_diario(diario, ticker)
+            if registro is None:
+                a_baixar.append(ticker)
+            else:
+                falhas.remover(ticker)
+                yield ticker, registro
+
+        for i, (ticker, financial_data, erro, segundos_parse) in enumerate(pipeline.executar(a_baixar), start=1):
+            self.logger.info(f"Processando papel {i}/{len(a_baixar)}: {ticker}")
+            if segundos_parse is not None:
+                # Medida no processo (ou na thread) que extraiu a página
+                self.metricas.observar("parse_ticker_segundos", segundos_parse)
             try:
-                df_indicadores_ativo = df_indicadores_ativo[dataset_cols]
-            except KeyError as ke:
-                self.logger.debug("Ocorreu um erro ao tentar mapear as colunas "
-                                  "dos indicadores financeiros no DataFrame "
-                                  "resultante do processo de web scrapping para "
-                                  f"o ticker {ticker}.\n\n"
-                                  "Existem uma série de motivos capazes de "
-                                  "ocasionar esta falha no mapeamento, como por "
-                                  "exemplo:\n\n"
-                                  "1. Alteração no layout do portal Fundamentus.\n"
-                                  "2. Diferença entre indicadores entre ativos "
-                                  "distintos.\n\n"
-                                  "Por experiências de consumo, o layout do site "
-                                  "não costuma sofrer alterações, sendo mais "
-                                  "provável a segunda hipótese que defende que "
-                                  "diferentes ativos podem apresentar diferentes "
-                                  "indicadores.\n\n"
-                                  f"Exception: {ke}")
-
-                self.logger.debug("Iterando sobre colunas mapeadas e validando "
-                                  "quais delas não estão presentes no DataFrame "
-                                  f"resultante para o ticker {ticker}.")
-                for col in dataset_cols:
-                    if col not in list(df_indicadores_ativo.columns):
-                        df_indicadores_ativo[col] = None
-
-            df_indicadores_ativo = df_indicadores_ativo[dataset_cols]
-            now = datetime.now(timezone(timedelta(hours=-3)))
-            datetime_exec = now.strftime("%d-%m-%Y %H:%M:%S")
-            df_indicadores_ativo.loc[:, ["datetime_exec"]] = datetime_exec
-
-            if parse_dtypes:
-                float_cols_to_parse = [
-                    col for col in list(df_indicadores_ativo.columns)
-                    if col[:4] in (
-                        "vlr_", "vol_", "num_", "pct_", "qtd_", "max_", "min_",
-                        "total_"
-                    )
-                ]
-                percent_cols_to_parse = [
-                    col for col in float_cols_to_parse if col[:4] in "pct_"
-                ]
-                df_indicadores_ativo_float_prep = self._parse_float_cols(
-                    df=df_indicadores_ativo,
-                    cols_list=float_cols_to_parse
-                )
-                df_indicadores_ativo_prep = self._parse_pct_cols(
-                    df=df_indicadores_ativo_float_prep,
-                    cols_list=percent_cols_to_parse
-                )
+                if erro is not None:
+                    raise erro
+                metadata_cols = self._identificar_registro(financial_data, ticker)
+                registro = self._gravar_registro(financial_data, metadata_cols, ticker, diario)
+            except Exception as erro_registro:
+                self._registrar_falha(falhas, ticker, erro_registro)
+                continue
+            falhas.remover(ticker)
+            yield ticker, registro
+
+    def _coletar_em_rodadas(self, tickers_list: list, diario: Optional[DiarioExecucao], falhas: FilaFalhas,
+                            recuperados: set, max_concorrencia: int, rodadas_retentativa: int,
+                            pausa_retentativa: float, pipeline: Optional[PipelineColeta]) -> Iterator[tuple]:
+        """
+        Coleta os tickers em uma rodada principal seguida das rodadas de nova tentativa dos
+        tickers com falhas transitórias, devolvendo cada registro assim que fica pronto.
+
+        Parâmetros:
+        tickers_list (list): Tickers da coleta.
+        diario (DiarioExecucao): Diário da execução, ou None.
+        falhas (FilaFalhas): Fila de falhas, atualizada in-place.
+        recuperados (set): Tickers coletados em uma retentativa, atualizado in-place.
+        max_concorrencia (int): Número de downloads simultâneos da rodada principal.
+        rodadas_retentativa (int): Número máximo de rodadas de nova tentativa.
+        pausa_retentativa (float): Espera, em segundos, antes de cada rodada de nova tentativa.
+        pipeline (PipelineColeta): Pipeline de download/parsing; None coleta sequencialmente.
+
+        Retorna:
+        Iterator[tuple]: Pares (ticker, registro), uma vez por ticker coletado.
+        """
+        def coletar_rodada(pendentes: list, concorrencia: int) -> Iterator[tuple]:
+            pendentes = list(dict.fromkeys(pendentes))
+            if pipeline is None:
+                for i, ticker in enumerate(pendentes, start=1):
+                    registro = self._coletar_ticker(ticker, i, len(pendentes), diario, falhas)
+                    if registro is not None:
+                        yield ticker, registro
             else:
-                df_indicadores_ativo_prep = df_indicadores_ativo
+                pipeline.workers_io = concorrencia
+                yield from self._coletar_rodada_pipeline(pipeline, pendentes, diario, falhas)
+
+        yield from coletar_rodada(tickers_list, max_concorrencia)
+
+        for rodada in range(1, rodadas_retentativa + 1):
+            concorrencia = max(1, max_concorrencia // 2 ** rodada)
+            pendentes = self._tickers_para_retentativa(falhas, rodada, concorrencia)
+            if not pendentes:
+                break
+            time.sleep(pausa_retentativa)
+            for ticker, registro in coletar_rodada(pendentes, concorrencia):
+                recuperados.add(ticker)
+                yield ticker, registro
+
+    def coleta_indicadores_de_ativos(self, tickers, parse_dtypes=False, max_concorrencia: int = 1,
+                                     id_execucao: Optional[str] = None, rodadas_retentativa: int = 1,
+                                     pausa_retentativa: float = 1.0, processos_parse: int = 0,
+                                     tamanho_fila: int = 64, tamanho_lote: int = 4) -> pd.DataFrame:
+        """
+        Coleta indicadores financeiros para uma lista de tickers.
 
-            # Adicione o DataFrame processado à lista de resultados
-            dfs.append(df_indicadores_ativo_prep)
+        A falha de um ticker (erro HTTP, timeout, layout desconhecido) não interrompe a
+        coleta: o ticker vai para a fila de falhas (`self.falhas`), com o motivo. Ao final,
+        os tickers com falhas transitórias passam por até `rodadas_retentativa` novas
+        tentativas, com concorrência reduzida à metade a cada rodada. Os tickers que ainda
+        falharem são descartados do resultado e contabilizados em `self.resumo_coleta`.
 
-        # Concatene todos os DataFrames processados em um único DataFrame final
-        final_df = pd.concat(dfs, ignore_index=True)
-        return final_df
+        Com `id_execucao`, cada ticker concluído é gravado no diário da execução; se a coleta
+        for interrompida, uma nova chamada com o mesmo id retoma do ponto da falha, sem baixar
+        novamente os tickers já concluídos, e produz o mesmo resultado de uma execução contínua.
+
+        Com `max_concorrencia` > 1 ou `processos_parse` > 0, a coleta usa o `PipelineColeta`:
+        `max_concorrencia` threads baixam as páginas para uma fila limitada a `tamanho_fila`
+        páginas, e os indicadores são extraídos na thread que chama o método ou, com
+        `processos_parse` > 0, por processos em lotes de `tamanho_lote` páginas, usando vários
+        núcleos. As rodadas, o diário e as retentativas são os mesmos da coleta sequencial
+        (`_coletar_em_rodadas`), e o resultado também.
+
+        Parâmetros:
+        tickers (list or str): Lista de tickers ou caminho (com ou sem extensão) do arquivo com tickers.
+        parse_dtypes (bool): Indica se deve converter tipos de dados após a coleta.
+        max_concorrencia (int): Número máximo de páginas baixadas simultaneamente. Com o valor
+            padrão (1) a coleta é sequencial.
+        id_execucao (str): Identificador da execução para retomada (ex.: 'acoes_17_10_2026').
+        rodadas_retentativa (int): Número máximo de rodadas de nova tentativa dos tickers com falha.
+        pausa_retentativa (float): Espera, em segundos, antes de cada rodada de nova tentativa.
+        processos_parse (int): Número de processos de parsing (0 = parsing na thread que chama o método).
+        tamanho_fila (int): Páginas baixadas aguardando parsing, na coleta concorrente.
+        tamanho_lote (int): Páginas enviadas a um processo de parsing por vez.
+
+        Retorna:
+        pandas.DataFrame: DataFrame com os indicadores financeiros dos tickers coletados.
+        """
+        tickers_list = self._ler_lista_tickers(tickers)
+        if tickers_list is None:
+            return pd.DataFrame()
+
+        with self.metricas.etapa("scraping.coleta_detalhes", len(tickers_list)) as etapa:
+            diario = self._abrir_diario(id_execucao, len(tickers_list))
+            registros, falhas, recuperados = {}, FilaFalhas(), set()
+            max_concorrencia = max(1, int(max_concorrencia))
+            pipeline = None
+            if max_concorrencia > 1 or processos_parse > 0:
+                pipeline = PipelineColeta(self._baixar_pagina_ativo, self.variation_headings,
+                                          workers_io=max_concorrencia, processos=processos_parse,
+                                          tamanho_fila=tamanho_fila, tamanho_lote=tamanho_lote)
+            try:
+                for ticker, registro in self._coletar_em_rodadas(tickers_list, diario, falhas, recuperados,
+                                                                 max_concorrencia, rodadas_retentativa,
+                                                                 pausa_retentativa, pipeline):
+                    registros[ticker] = registro
+            finally:
+                if pipeline is not None:
+                    pipeline.fechar()
+                if diario is not None:
+                    diario.fechar()
+
+            df = self._encerrar_coleta(tickers_list, registros, falhas, recuperados, diario, parse_dtypes)
+            etapa.linhas_saida = len(df)
+        return df
+
+    async def coleta_indicadores_de_ativos_async(self, tickers, parse_dtypes=False,
+                                                 max_concorrencia: int = 8,
+                                                 id_execucao: Optional[str] = None,
+                                                 rodadas_retentativa: int = 1,
+                                                 pausa_retentativa: float = 1.0,
+                                                 processos_parse: int = 0) -> pd.DataFrame:
+        """
+        Versão assíncrona de `coleta_indicadores_de_ativos`, para chamadores que já estão em
+        um event loop (ex.: Jupyter).
+
+        A coleta concorrente é executada em uma thread do executor padrão do loop, sem
+        bloqueá-lo; o resultado é idêntico ao da coleta sequencial.
+
+        Parâmetros:
+        tickers (list or str): Lista de tickers ou caminho (com ou sem extensão) do arquivo com tickers.
+        parse_dtypes (bool): Indica se deve converter tipos de dados após a coleta.
+        max_concorrencia (int): Número máximo de páginas baixadas simultaneamente.
+        id_execucao (str): Identificador da execução para retomada (ex.: 'acoes_17_10_2026').
+        rodadas_retentativa (int): Número máximo de rodadas de nova tentativa dos tickers com falha.
+        pausa_retentativa (float): Espera, em segundos, antes de cada rodada de nova tentativa.
+        processos_parse (int): Número de processos de parsing (0 = parsing na thread da coleta).
+
+        Retorna:
+        pandas.DataFrame: DataFrame com os indicadores financeiros dos tickers coletados.
+        """
+        coletar = functools.partial(self.coleta_indicadores_de_ativos, tickers, parse_dtypes=parse_dtypes,
+                                    max_concorrencia=max_concorrencia, id_execucao=id_execucao,
+                                    rodadas_retentativa=rodadas_retentativa, pausa_retentativa=pausa_retentativa,
+                                    processos_parse=processos_parse)
+        return await asyncio.get_running_loop().run_in_executor(None, coletar)
+
+    def coleta_indicadores_em_fluxo(self, tickers, max_concorrencia: int = 1, id_execucao: Optional[str] = None,
+                                    rodadas_retentativa: int = 1, pausa_retentativa: float = 1.0,
+                                    processos_parse: int = 0, tamanho_fila: int = 64,
+                                    tamanho_lote: int = 4) -> Iterator[dict]:
+        """
+        Coleta indicadores financeiros devolvendo um registro por ticker, assim que ele fica
+        pronto, sem acumular a coleta em memória.
+
+        Segue as mesmas regras de `coleta_indicadores_de_ativos` (diário, isolamento de falhas,
+        retentativas); `self.falhas` e `self.resumo_coleta` são preenchidos quando o gerador
+        termina. Os registros são devolvidos na ordem de conclusão: os tickers recuperados em
+        uma retentativa vêm depois dos demais e, com `max_concorrencia` > 1, a ordem pode
+        diferir da lista de entrada.
+
+        Parâmetros:
+        tickers (list or str): Lista de tickers ou caminho (com ou sem extensão) do arquivo com tickers.
+        max_concorrencia (int): Número de páginas baixadas simultaneamente (1 = sequencial).
+        id_execucao (str): Identificador da execução para retomada (ex.: 'acoes_17_10_2026').
+        rodadas_retentativa (int): Número máximo de rodadas de nova tentativa dos tickers com falha.
+        pausa_retentativa (float): Espera, em segundos, antes de cada rodada de nova tentativa.
+        processos_parse (int): Número de processos de parsing (0 = parsing na thread consumidora).
+        tamanho_fila (int): Páginas baixadas aguardando parsing, na coleta concorrente.
+        tamanho_lote (int): Páginas enviadas a um processo de parsing por vez.
+
+        Retorna:
+        Iterator[dict]: Registros no formato coluna do dataset -> valor em texto, com a coluna datetime_exec.
+        """
+        tickers_list = self._ler_lista_tickers(tickers)
+        if tickers_list is None:
+            return
+
+        diario = self._abrir_diario(id_execucao, len(tickers_list))
+        falhas, recuperados = FilaFalhas(), set()
+        max_concorrencia = max(1, int(max_concorrencia))
+        pipeline = None
+        if max_concorrencia > 1 or processos_parse > 0:
+            pipeline = PipelineColeta(self._baixar_pagina_ativo, self.variation_headings,
+                                      workers_io=max_concorrencia, processos=processos_parse,
+                                      tamanho_fila=tamanho_fila, tamanho_lote=tamanho_lote)
+        coletados = 0
+        try:
+            for _, (financial_data, metadata_cols, datetime_exec) in self._coletar_em_rodadas(
+                    tickers_list, diario, falhas, recuperados, max_concorrencia, rodadas_retentativa,
+                    pausa_retentativa, pipeline):
+                coletados += 1
+                linha = {coluna: financial_data.get(titulo) for titulo, coluna in metadata_cols.items()}
+                linha["datetime_exec"] = datetime_exec
+                yield linha
+        finally:
+            if pipeline is not None:
+                pipeline.fechar()
+            if diario is not None:
+                diario.fechar()
+
+        self._resumir_coleta(len(set(tickers_list)), coletados, falhas, recuperados, diario)
+
+    def gravar_coleta_em_fluxo(self, tickers, tipo: str, diretorio: str, nome_do_arquivo: str,
+                               filtro: Optional[Callable[[dict], bool]] = None, tamanho_bloco: int = 500,
+                               formato: Optional[str] = None, **opcoes_coleta) -> tuple:
+        """
+        Coleta os tickers em fluxo, gravando o consolidado em blocos à medida que os registros
+        chegam e aplicando o filtro a cada registro, sem reler o arquivo gravado.
+
+        A memória usada não cresce com o universo de papéis: apenas o bloco em gravação e os
+        registros aprovados pelo filtro (ex.: `Utils.filtro_cotados_no_mes`) ficam em memória.
+
+        Parâmetros:
+        tickers (list or str): Lista de tickers ou caminho (com ou sem extensão) do arquivo com tickers.
+        tipo (str): Tipo de papel ('acoes' ou 'fiis'), que define as colunas do consolidado.
+        diretorio (str): Diretório onde o consolidado será salvo.
+        nome_do_arquivo (str): Nome base do arquivo (a data atual é acrescentada).
+        filtro (callable): Função registro -> bool; por padrão, todos os registros são mantidos.
+        tamanho_bloco (int): Número de registros por bloco gravado.
+        formato (str): Formato do arquivo; por padrão, `formato_armazenamento`.
+        opcoes_coleta: Opções repassadas a `coleta_indicadores_em_fluxo` (max_concorrencia, id_execucao, ...).
+
+        Retorna:
+        tuple: (caminho do consolidado, pandas.DataFrame com os registros aprovados pelo filtro, em texto
+        e na ordem da lista de entrada). O consolidado segue a ordem de conclusão da coleta.
+        """
+        tipo_prep = tipo.strip().lower()
+        if tipo_prep not in ("acoes", "fiis"):
+            raise ValueError(f"Tipo '{tipo}' inválido. Os tipos válidos são 'acoes' ou 'fiis'.")
+        metadata_cols = self.metadata_cols_acoes if tipo_prep == "acoes" else self.metadata_cols_fiis
+        colunas = list(metadata_cols.values()) + ["datetime_exec"]
+        coluna_papel = metadata_cols["Papel" if tipo_prep == "acoes" else "FII"]
+        tickers = self._ler_lista_tickers(tickers) or []
+
+        data_atual = datetime.now().strftime("%d_%m_%Y")
+        aprovados = []
+        with self.metricas.etapa("scraping.coleta_em_fluxo", len(tickers)) as etapa:
+            with GravadorTabela(f"{diretorio}{nome_do_arquivo}{data_atual}", colunas,
+                                formato=formato or self.formato_armazenamento, tamanho_bloco=tamanho_bloco) as gravador:
+                for linha in self.coleta_indicadores_em_fluxo(tickers, **opcoes_coleta):
+                    gravador.adicionar(linha)
+                    if filtro is None or filtro(linha):
+                        aprovados.append(linha)
+            etapa.linhas_saida = len(aprovados)
+            etapa.bytes = os.path.getsize(gravador.caminho)
+        # Os aprovados voltam à ordem da lista de entrada, como na coleta em memória
+        posicoes = {ticker: i for i, ticker in enumerate(tickers)}
+        aprovados.sort(key=lambda linha: posicoes.get(linha[coluna_papel], len(posicoes)))
+        self.logger.info(f"DataFrame salvo com sucesso como '{gravador.caminho}' ({gravador.linhas} registros, "
+                         f"{len(aprovados)} aprovados pelo filtro).")
+        return gravador.caminho, pd.DataFrame(aprovados, columns=colunas)
+
+    def _extrair_listagem(self, tipo: str) -> pd.DataFrame:
+        """
+        Baixa a página de listagem e a organiza nas colunas do dataset de detalhes.
+
+        Parâmetros:
+        tipo (str): Tipo de papel ('acoes' ou 'fiis').
+
+        Retorna:
+        pandas.DataFrame: Listagem com os valores em texto, as colunas de `METADATA_COLS_ACOES`/
+        `METADATA_COLS_FIIS` (vazias quando ausentes da listagem) e a coluna datetime_exec.
+        """
+        tipo_prep = tipo.strip().lower()
+        if tipo_prep not in ("acoes", "fiis"):
+            raise TypeError(f"Tipo inválido para o método (tipo={tipo}). Opções válidas: 'acoes' ou 'fiis'.")
+
+        if tipo_prep == "acoes":
+            metadata_listagem, metadata_cols = Utils.METADATA_LISTAGEM_ACOES, self.metadata_cols_acoes
+        else:
+            metadata_listagem, metadata_cols = Utils.METADATA_LISTAGEM_FIIS, self.metadata_cols_fiis
+
+        cabecalhos, linhas = extrair_tabela_listagem(self._baixar_listagem(tipo_prep))
+        df_listagem = pd.DataFrame(linhas, columns=cabecalhos).rename(columns=metadata_listagem)
+        self.logger.info(f"Listagem extraída com {len(df_listagem)} papéis")
+
+        dataset_cols = list(metadata_cols.values())
+        df_listagem = df_listagem[[col for col in df_listagem.columns if col in dataset_cols]]
+        df_listagem = df_listagem.reindex(columns=dataset_cols)
+        df_listagem["datetime_exec"] = self._datetime_exec()
+        return df_listagem
+
+    def coleta_indicadores_da_listagem(self, tipo: str, colunas_detalhes: Optional[list] = None,
+                                       max_concorrencia: int = 1) -> pd.DataFrame:
+        """
+        Coleta os indicadores de todos os papéis a partir de uma única requisição à página de
+        listagem (resultado.php ou fii_resultado.php).
+
+        A tabela da listagem já traz cotação, P/L, P/VP, Div. Yield, EV/EBIT, ROIC, liquidez,
+        entre outros. O resultado usa os nomes de `METADATA_COLS_ACOES`/`METADATA_COLS_FIIS`,
+        com tipos convertidos como em `coleta_indicadores_de_ativos(parse_dtypes=True)`; as
+        colunas ausentes da listagem ficam vazias, exceto as informadas em `colunas_detalhes`,
+        que são completadas com a coleta das páginas de detalhes.
+
+        Parâmetros:
+        tipo (str): Tipo de papel ('acoes' ou 'fiis').
+        colunas_detalhes (list): Colunas (ex.: ['dt_ult_cot']) a buscar nas páginas de detalhes.
+        max_concorrencia (int): Número máximo de páginas de detalhes baixadas simultaneamente.
+
+        Retorna:
+        pandas.DataFrame: DataFrame com os indicadores de todos os papéis da listagem.
+        """
+        with self.metricas.etapa("scraping.coleta_listagem") as etapa:
+            df_listagem = self._extrair_listagem(tipo)
+
+            if colunas_detalhes:
+                coluna_papel = df_listagem.columns[0]
+                df_detalhes = self.coleta_indicadores_de_ativos(df_listagem[coluna_papel].tolist(),
+                                                                max_concorrencia=max_concorrencia)
+                # Papéis descartados na coleta de detalhes ficam com as colunas vazias
+                df_detalhes = df_detalhes.reindex(columns=df_listagem.columns)
+                df_detalhes = df_detalhes.drop_duplicates(subset=coluna_papel).set_index(coluna_papel)
+                for col in colunas_detalhes:
+                    df_listagem[col] = df_listagem[coluna_papel].map(df_detalhes[col])
+
+            df = self._converter_tipos(df_listagem)
+            etapa.linhas_saida = len(df)
+        return df
+
+    def coleta_indicadores_incremental(self, tipo: str, caminho_base: str, max_idade_dias: int = 30,
+                                        max_concorrencia: int = 1, tolerancia: float = 0.01,
+                                        id_execucao: Optional[str] = None) -> pd.DataFrame:
+        """
+        Coleta os indicadores de todos os papéis da listagem, baixando apenas as páginas de
+        detalhes desatualizadas.
+
+        Os fundamentos mudam apenas quando um balanço novo é processado; a cotação e os
+        múltiplos derivados dela estão na listagem. A base em `caminho_base` guarda o último
+        registro de detalhes de cada ticker e a data da coleta. A cada execução, a listagem é
+        baixada, os tickers novos, com coleta mais antiga que `max_idade_dias`, com prazo do
+        balanço seguinte vencido ou com fundamentos divergentes da listagem são coletados
+        novamente, e os demais têm os múltiplos recalculados a partir da cotação do dia (e a data
+        da última cotação atualizada para a data de hoje quando a cotação mudou; ver
+        `atualizar_precos`).
+
+        Parâmetros:
+        tipo (str): Tipo de papel ('acoes' ou 'fiis').
+        caminho_base (str): Caminho (sem extensão) da base de fundamentos; criada se não existir.
+        max_idade_dias (int): Idade máxima, em dias, dos registros de detalhes da base.
+        max_concorrencia (int): Número máximo de páginas de detalhes baixadas simultaneamente.
+        tolerancia (float): Diferença relativa a partir da qual um fundamento é considerado alterado.
+        id_execucao (str): Identificador da execução para retomar a coleta das páginas de detalhes.
+
+        Retorna:
+        pandas.DataFrame: DataFrame com os indicadores de todos os papéis da listagem, com tipos
+        convertidos como em `coleta_indicadores_de_ativos(parse_dtypes=True)`.
+        """
+        tipo_prep = tipo.strip().lower()
+        df_listagem = self._extrair_listagem(tipo_prep)
+        coluna_papel = df_listagem.columns[0]
+        colunas = list(df_listagem.columns)
+        listagem = self._converter_tipos(df_listagem.copy())
+
+        try:
+            base = ler_tabela(caminho_base)
+        except FileNotFoundError:
+            base = pd.DataFrame(columns=colunas + [COLUNA_COLETA], dtype=object)
+        base = base.astype({coluna_papel: str, COLUNA_COLETA: object})
+        base_tipada = self._converter_tipos(base.copy())
+
+        desatualizados = classificar_desatualizados(base_tipada, listagem, tipo_prep, coluna_papel,
+                                                    max_idade_dias=max_idade_dias, tolerancia=tolerancia)
+        motivos = pd.Series(list(desatualizados.values()), dtype=object).value_counts().to_dict()
+        self.logger.info(f"Atualização incremental: {len(desatualizados)} de {len(listagem)} páginas de "
+                         f"detalhes a coletar {motivos}")
+
+        coletados = pd.DataFrame()
+        if desatualizados:
+            coletados = self.coleta_indicadores_de_ativos(list(desatualizados), max_concorrencia=max_concorrencia,
+                                                          id_execucao=id_execucao)
+        if coletados.empty:
+            coletados = pd.DataFrame(columns=[coluna_papel])
+        else:
+            coletados[COLUNA_COLETA] = datetime.now().strftime("%Y-%m-%d")
+            base = pd.concat([base[~base[coluna_papel].isin(coletados[coluna_papel])], coletados],
+                             ignore_index=True)
+            salvar_tabela(base, caminho_base, formato=self.formato_armazenamento)
+            base_tipada = self._converter_tipos(base.copy())
+
+        # Registros coletados agora já têm a cotação do dia; os demais (inclusive os que falharam
+        # na coleta, mas constam da base) são atualizados pela listagem
+        base_tipada = base_tipada.drop_duplicates(subset=coluna_papel, keep="last")
+        coletados_agora = base_tipada[coluna_papel].isin(coletados[coluna_papel])
+        reaproveitados = atualizar_precos(base_tipada[~coletados_agora], listagem, tipo_prep, coluna_papel,
+                                          data_listagem=datetime.now().strftime("%d/%m/%Y"))
+
+        df = pd.concat([reaproveitados, base_tipada[coletados_agora]])
+        papeis = listagem[coluna_papel]
+        df = df.set_index(coluna_papel).loc[papeis[papeis.isin(df[coluna_papel])]].reset_index()
+        df["datetime_exec"] = self._datetime_exec()
+        return df[colunas]
 
     def salvar_dataframe_como_csv(self, df: pd.DataFrame, tipo: str, diretorio: str,
-                                  nome_do_arquivo=str):
+                                  nome_do_arquivo=str, formato: Optional[str] = None) -> str:
         """
-        Salva um DataFrame em um arquivo CSV com nome baseado no tipo (acoes ou fiis) e data atual.
+        Salva um DataFrame em arquivo com nome baseado no tipo (acoes ou fiis) e data atual.
         O arquivo é salvo no diretório './dados/'.
 
+        O formato segue `formato_armazenamento`: Feather/Parquet preservam os tipos das
+        colunas e são lidos com mapeamento em memória por `armazenamento.ler_tabela`; sem o
+        pyarrow instalado, o arquivo é gravado em CSV.
+
         Parâmetros:
         df (pandas.DataFrame): DataFrame a ser salvo.
         tipo (str): Tipo de dados ('acoes' ou 'fiis').
         diretorio (str): Diretório onde o arquivo será salvo.
         nome_do_arquivo (str): Nome base do arquivo.
+        formato (str): Formato do arquivo ('feather', 'parquet' ou 'csv'); por padrão,
+            `formato_armazenamento`.
 
         Retorna:
-        None
+        str: Caminho do arquivo gravado.
         """
         # Mapeia o tipo para um nome de arquivo
         tipos = {
@@ -335,17 +996,16 @@ class Scraping:
         # Obtém a data atual no formato dd_mm_yyyy
         data_atual = datetime.now().strftime("%d_%m_%Y")
 
-        # Define o nome do arquivo CSV
-        nome_arquivo = f"{diretorio}{nome_do_arquivo}{data_atual}.csv"
-        nome_arquivo_xlsx = f"{diretorio}{nome_do_arquivo}{data_atual}.xlsx"
-
-        # Salva o DataFrame como arquivo CSV
-        df.to_csv(nome_arquivo, index=False)
-        # df.to_excel(nome_arquivo_xlsx, index=False)
+        # Salva o DataFrame no formato configurado (a extensão é definida pelo formato)
+        with self.metricas.etapa("scraping.gravacao", len(df)) as etapa:
+            nome_arquivo = salvar_tabela(df, f"{diretorio}{nome_do_arquivo}{data_atual}",
+                                         formato=formato or self.formato_armazenamento)
+            etapa.linhas_saida = len(df)
+            etapa.bytes = os.path.getsize(nome_arquivo)
 
         # Mensagem de confirmação
         self.logger.info(f"DataFrame salvo com sucesso como '{nome_arquivo}'.")
-
+        return nome_arquivo
 
 if __name__ == "__main__":
     Scraping().scraping()
\ No newline at end of file
@@ -0,0 +1,229 @@
+import time
+from typing import Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError
+from urllib3.util.retry import Retry
+
+from metricas import Metricas
+from .cache import CacheAusenteError, CacheHttp
+from .limitador import LimitadorTaxa
+
+# Cabeçalhos enviados em todas as requisições da sessão
+HEADERS_PADRAO = {
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+# Códigos de status que disparam uma nova tentativa com backoff exponencial
+STATUS_PARA_RETENTATIVA = (429, 500, 502, 503, 504)
+
+
+class SessaoHttp:
+    """
+    Sessão HTTP compartilhada pelas requisições do scraping.
+
+    Mantém um pool de conexões keep-alive, solicita respostas compactadas (gzip/deflate),
+    aplica timeout em cada requisição e refaz automaticamente as requisições que falham
+    com 5xx/429 usando backoff exponencial (respeitando o cabeçalho Retry-After).
+    Opcionalmente consulta um `CacheHttp` antes de acessar a rede e limita a taxa das
+    requisições que chegam à rede com um `LimitadorTaxa` (respostas do cache não consomem
+    tokens). Com limitador, as novas tentativas são feitas pela própria sessão, com a mesma
+    política de backoff, para que cada tentativa consuma um token e tenha o resultado
+    informado ao limitador.
+
+    Nas métricas, apenas as respostas da rede entram na série `latencia_http_segundos` e no
+    contador `bytes_baixados` (tamanho transferido, pelo `Content-Length`); a espera pelo
+    limitador fica na série `espera_limitador_segundos` e as respostas servidas do cache sem
+    acessar a rede, no contador `respostas_cache`.
+
+    Atributos:
+    timeout (float or tuple): Timeout padrão (conexão, leitura) em segundos.
+    cache (CacheHttp): Cache em disco das respostas, ou None para sempre acessar a rede.
+    limitador (LimitadorTaxa): Limitador de taxa das requisições, ou None para não limitar.
+    metricas (Metricas): Coletor das métricas das requisições.
+    session (requests.Session): Sessão subjacente com o adaptador configurado.
+    """
+
+    def __init__(
+            self,
+            headers: Optional[dict] = None,
+            timeout: Union[float, tuple] = (5, 30),
+            tentativas: int = 3,
+            fator_backoff: float = 0.5,
+            tamanho_pool: int = 16,
+            status_para_retentativa: tuple = STATUS_PARA_RETENTATIVA,
+            cache: Optional[CacheHttp] = None,
+            limitador: Optional[LimitadorTaxa] = None,
+            metricas: Optional[Metricas] = None,
+    ) -> None:
+        """
+        Inicializa a sessão com pool de conexões e política de retentativas.
+
+        Parâmetros:
+        headers (dict): Cabeçalhos adicionais enviados em todas as requisições.
+        timeout (float or tuple): Timeout padrão (conexão, leitura) em segundos.
+        tentativas (int): Número máximo de novas tentativas por requisição.
+        fator_backoff (float): Fator do backoff exponencial entre tentativas, em segundos.
+        tamanho_pool (int): Número máximo de conexões mantidas abertas por host.
+        status_para_retentativa (tuple): Códigos de status HTTP que disparam nova tentativa.
+        cache (CacheHttp): Cache em disco das respostas, ou None para sempre acessar a rede.
+        limitador (LimitadorTaxa): Limitador de taxa das requisições, ou None para não limitar.
+        metricas (Metricas): Coletor das métricas das requisições; se omitido, um novo é criado.
+        """
+        self.timeout = timeout
+        self.cache = cache
+        self.limitador = limitador
+        self.metricas = metricas or Metricas()
+
+        retry = Retry(
+            total=tentativas,
+            connect=tentativas,
+            read=tentativas,
+            status=tentativas,
+            backoff_factor=fator_backoff,
+            status_forcelist=status_para_retentativa,
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        # Com limitador, o adaptador não refaz as requisições: as tentativas passam por `_requisitar`
+        self._retentativas = retry if limitador is not None else None
+        adapter = HTTPAdapter(pool_connections=tamanho_pool, pool_maxsize=tamanho_pool,
+                              max_retries=retry if limitador is None else 0)
+
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(HEADERS_PADRAO)
+        if headers:
+            self.session.headers.update(headers)
+
+    def get(self, url: str, headers: Optional[dict] = None, timeout: Union[float, tuple, None] = None,
+            **kwargs) -> requests.Response:
+        """
+        Executa uma requisição GET reaproveitando as conexões do pool.
+
+        Com cache configurado, entradas dentro do tempo de vida são devolvidas sem acessar a
+        rede; entradas expiradas são revalidadas com If-None-Match/If-Modified-Since e apenas
+        respostas 200 são armazenadas. No modo offline, URLs ausentes do cache lançam
+        `CacheAusenteError`.
+
+        Parâmetros:
+        url (str): Endereço requisitado.
+        headers (dict): Cabeçalhos adicionais apenas para esta requisição.
+        timeout (float or tuple): Timeout desta requisição; usa o padrão da sessão se omitido.
+
+        Retorna:
+        requests.Response: Resposta HTTP (já descompactada).
+        """
+        if self.cache is None:
+            return self._requisitar(url, headers, timeout, **kwargs)
+
+        entrada = self.cache.ler(url)
+        if self.cache.modo_offline:
+            if entrada is None:
+                raise CacheAusenteError(f"URL ausente do cache no modo offline: {url}")
+            self.metricas.incrementar("respostas_cache")
+            return self.cache.como_resposta(url, entrada)
+
+        if entrada is not None and self.cache.esta_valida(url, entrada):
+            self.metricas.incrementar("respostas_cache")
+            return self.cache.como_resposta(url, entrada)
+
+        headers_requisicao = dict(headers or {})
+        if entrada is not None:
+            headers_requisicao.update(self.cache.headers_condicionais(entrada))
+
+        resposta = self._requisitar(url, headers_requisicao, timeout, **kwargs)
+        if resposta.status_code == 304 and entrada is not None:
+            self.cache.renovar(url, entrada)
+            return self.cache.como_resposta(url, entrada)
+        if resposta.status_code == 200:
+            self.cache.gravar(url, resposta)
+        return resposta
+
+    def _requisitar(self, url: str, headers: Optional[dict], timeout: Union[float, tuple, None],
+                    **kwargs) -> requests.Response:
+        """
+        Executa a requisição na rede. Com limitador, cada tentativa aguarda um token e tem o
+        status e a latência informados a ele (status None quando falha por timeout ou erro de
+        conexão); as novas tentativas seguem a política de retentativas da sessão. A latência
+        registrada nas métricas começa depois da espera pelo limitador.
+
+        Parâmetros:
+        url (str): Endereço requisitado.
+        headers (dict): Cabeçalhos adicionais da requisição.
+        timeout (float or tuple): Timeout da requisição; usa o padrão da sessão se omitido.
+
+        Retorna:
+        requests.Response: Resposta HTTP.
+        """
+        politica = self._retentativas
+        while True:
+            if self.limitador is not None:
+                inicio_espera = time.perf_counter()
+                self.limitador.adquirir()
+                self.metricas.observar("espera_limitador_segundos", time.perf_counter() - inicio_espera)
+
+            inicio = time.perf_counter()
+            try:
+                resposta = self.session.get(url, headers=headers, timeout=timeout or self.timeout, **kwargs)
+            except (requests.Timeout, requests.ConnectionError) as erro:
+                if self.limitador is None:
+                    raise
+                self.limitador.registrar(None, time.perf_counter() - inicio)
+                try:
+                    politica = politica.increment(method="GET", url=url, error=erro)
+                except MaxRetryError:
+                    raise erro from None
+                politica.sleep()
+                continue
+            latencia = time.perf_counter() - inicio
+            self.metricas.observar("latencia_http_segundos", latencia)
+            self.metricas.incrementar("bytes_baixados", self._bytes_transferidos(resposta))
+
+            if self.limitador is None:
+                return resposta
+            self.limitador.registrar(resposta.status_code, latencia)
+            if not politica.is_retry("GET", resposta.status_code, "Retry-After" in resposta.headers):
+                return resposta
+            try:
+                politica = politica.increment(method="GET", url=url, response=resposta.raw)
+            except MaxRetryError:
+                return resposta
+            politica.sleep(resposta.raw)
+
+    @staticmethod
+    def _bytes_transferidos(resposta: requests.Response) -> int:
+        """
+        Tamanho do corpo transferido pela rede, pelo `Content-Length` da resposta (tamanho
+        comprimido quando há `Content-Encoding`). Sem ele (ex.: `Transfer-Encoding: chunked`),
+        usa o tamanho do corpo após a descompressão.
+
+        Parâmetros:
+        resposta (requests.Response): Resposta da rede, com o corpo já lido.
+
+        Retorna:
+        int: Número de bytes do corpo transferido.
+        """
+        tamanho = resposta.headers.get("Content-Length", "")
+        if tamanho.isdigit():
+            return int(tamanho)
+        return len(resposta.content)
+
+    def fechar(self) -> None:
+        """
+        Fecha as conexões mantidas pelo pool.
+
+        Retorna:
+        None
+        """
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.fechar()
@@ -1,5 +1,3 @@
-import numpy as np
-import pandas as pd
 import logging
 import os
 from datetime import datetime
@@ -120,6 +118,48 @@ class Utils:
         "Vacância Média": "vlr_vacancia_media",
     }
 
+    # Colunas da tabela de listagem (resultado.php) mapeadas para os nomes de METADATA_COLS_ACOES
+    METADATA_LISTAGEM_ACOES = {
+        "Papel": "nome_papel",
+        "Cotação": "vlr_cot",
+        "P/L": "vlr_ind_p_sobre_l",
+        "P/VP": "vlr_ind_p_sobre_vp",
+        "PSR": "vlr_ind_psr",
+        "Div.Yield": "vlr_ind_div_yield",
+        "P/Ativo": "vlr_ind_p_sobre_ativ",
+        "P/Cap.Giro": "vlr_ind_p_sobre_cap_giro",
+        "P/EBIT": "vlr_ind_p_sobre_ebit",
+        "P/Ativ Circ.Liq": "vlr_ind_p_sobre_ativ_circ_liq",
+        "EV/EBIT": "vlr_ind_ev_sobre_ebit",
+        "EV/EBITDA": "vlr_ind_ev_sobre_ebitda",
+        "Mrg Ebit": "vlr_ind_margem_ebit",
+        "Mrg. Líq.": "vlr_ind_margem_liq",
+        "Liq. Corr.": "vlr_liquidez_corr",
+        "ROIC": "vlr_ind_roic",
+        "ROE": "vlr_ind_roe",
+        "Liq.2meses": "vol_med_neg_2m",
+        "Patrim. Líq": "vlr_patrim_liq",
+        "Dív.Brut/ Patrim.": "vlr_ind_divida_bruta_sobre_patrim",
+        "Cresc. Rec.5a": "pct_cresc_rec_liq_ult_5a"
+    }
+
+    # Colunas da tabela de listagem (fii_resultado.php) mapeadas para os nomes de METADATA_COLS_FIIS
+    METADATA_LISTAGEM_FIIS = {
+        "Papel": "fii",
+        "Segmento": "segmento",
+        "Cotação": "vlr_cot",
+        "FFO Yield": "vlr_ffo_yield",
+        "Dividend Yield": "vlr_div_yield",
+        "P/VP": "vlr_p_sobre_vp",
+        "Valor de Mercado": "vlr_mercado",
+        "Liquidez": "vol_med_neg_2m",
+        "Qtd de imóveis": "qtd_imoveis",
+        "Preço do m2": "vlr_do_m2",
+        "Aluguel por m2": "vlr_aluguel_por_m2",
+        "Cap Rate": "vlr_cap_rate",
+        "Vacância Média": "vlr_vacancia_media"
+    }
+
     METADATA_ACOES = {
         "nome_papel": "Papel",
         "tipo_papel": "Tipo",
@@ -236,6 +276,7 @@ class Utils:
     def limpar_e_converter_colunas(df, colunas):
         """
         Limpa e converte valores em colunas específicas de um DataFrame.
+        Colunas que já são numéricas (ex.: vindas do modo de listagem) são mantidas.
 
         Parâmetros:
         df (pandas.DataFrame): O DataFrame contendo os dados a serem processados.
@@ -244,27 +285,16 @@ class Utils:
         Retorna:
         pandas.DataFrame: O DataFrame com as colunas especificadas limpas e convertidas.
         """
-        def limpar_e_converter(valor):
-            if pd.isnull(valor) or isinstance(valor, str) and (valor.strip() == "" or valor.strip() == "-"):
-                return np.nan  # Converter valores nulos, vazios ou representados por "-" para NaN
+        # Importado aqui para que `util` não carregue o pandas nos subcomandos que não o usam (ex.: report)
+        from conversao import converter_colunas_br
 
-            try:
-                valor_limpo = valor.replace("%", "").replace(".", "").replace(",", ".")
-                valor_convertido = float(valor_limpo)
-                return valor_convertido
-            except ValueError:
-                return np.nan
-
-        for coluna in colunas:
-            if coluna in df.columns:
-                df[coluna] = df[coluna].apply(limpar_e_converter)
-
-        return df
+        return converter_colunas_br(df, colunas)
 
     @staticmethod
     def tratar_coluna_div_yield(df, coluna='Div. Yield'):
         """
         Trata a coluna 'Div. Yield' de um DataFrame, convertendo os valores para fração decimal.
+        Aceita tanto o texto extraído ("6,50%") quanto valores já numéricos em pontos percentuais (6.5).
 
         Parâmetros:
         df (pandas.DataFrame): O DataFrame contendo os dados a serem processados.
@@ -273,15 +303,34 @@ class Utils:
         Retorna:
         pandas.DataFrame: O DataFrame com a coluna 'Div. Yield' tratada.
         """
-        df[coluna] = (
-            df[coluna].str.replace("%", "")
-                      .str.replace(".", "")
-                      .str.replace(",", ".")
-                      .astype(float)
-                      .pipe(lambda x: x / 100)
-        )
+        from conversao import converter_numeros_br
+
+        df[coluna] = converter_numeros_br(df[coluna], fracao=True)
         return df
 
+    @staticmethod
+    def filtro_cotados_no_mes(mes, ano, coluna='dt_ult_cot'):
+        """
+        Cria um filtro de registros que mantém apenas os papéis cotados no mês informado,
+        para uso durante a coleta em fluxo (equivale ao filtro por 'dt_ult_cot' do DataFrame).
+
+        Parâmetros:
+        mes (int): Mês da última cotação.
+        ano (int): Ano da última cotação.
+        coluna (str): Coluna com a data da última cotação, no formato dd/mm/aaaa.
+
+        Retorna:
+        callable: Função registro (dict) -> bool.
+        """
+        def cotado_no_mes(registro):
+            try:
+                data_cotacao = datetime.strptime(registro.get(coluna), '%d/%m/%Y')
+            except (TypeError, ValueError):
+                return False
+            return data_cotacao.month == mes and data_cotacao.year == ano
+
+        return cotado_no_mes
+
     @staticmethod
     def log_config(logger_name: str = __file__, logger_level: int = logging.INFO, logger_date_format: str = "%Y-%m-%d %H:%M:%S") -> logging.Logger:
         """
@@ -372,15 +421,20 @@ class Utils:
         return dicionario_invertido
 
     @staticmethod
-    def criar_diretorios():
+    def criar_diretorios(diretorio_dados: str = "dados"):
         """
         Cria diretórios necessários para armazenar dados extraídos, processados e finais.
 
+        Parâmetros:
+        diretorio_dados (str): Diretório raiz dos dados, relativo ao diretório atual ou absoluto.
+
         Retorna:
         None
         """
         base_dir = os.getcwd()
-        paths = ["dados/01_extraidos", "dados/02_processados", "dados/03_final/pdf", "dados/03_final/csv"]
+        paths = [os.path.join(diretorio_dados, subdiretorio)
+                 for subdiretorio in ("00_base", "01_extraidos", "02_processados", "03_final/pdf", "03_final/csv",
+                                      "05_metricas")]
 
         if isinstance(paths, str):
             paths = [paths]
@@ -0,0 +1,75 @@
+"""Testa a gravação em blocos do `GravadorTabela`: mudança de tipos entre blocos e interrupções."""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+from armazenamento import GravadorTabela, formato_disponivel, ler_tabela  # noqa: E402
+
+COLUNAS = ["nome_papel", "vlr_cot", "nome_setor"]
+
+FORMATOS_COLUNARES = [
+    pytest.param(formato, marks=pytest.mark.skipif(not formato_disponivel(formato), reason="pyarrow ausente"))
+    for formato in ("feather", "parquet")
+]
+
+
+def _gravar(caminho_base: str, formato: str, registros: list, tamanho_bloco: int = 2) -> GravadorTabela:
+    with GravadorTabela(caminho_base, COLUNAS, formato=formato, tamanho_bloco=tamanho_bloco) as gravador:
+        for registro in registros:
+            gravador.adicionar(registro)
+    return gravador
+
+
+@pytest.mark.parametrize("formato", FORMATOS_COLUNARES)
+def test_coluna_vazia_no_primeiro_bloco_preenchida_depois(tmp_path, formato):
+    registros = [
+        {"nome_papel": "PETR4", "vlr_cot": 38.5},
+        {"nome_papel": "VALE3", "vlr_cot": 61.2},
+        {"nome_papel": "ITUB4", "vlr_cot": 33.0, "nome_setor": "Financeiro"},
+    ]
+    gravador = _gravar(str(tmp_path / "tabela"), formato, registros)
+
+    assert gravador.formato == formato
+    tabela = ler_tabela(gravador.caminho)
+    assert tabela["nome_papel"].tolist() == ["PETR4", "VALE3", "ITUB4"]
+    assert tabela["vlr_cot"].tolist() == [38.5, 61.2, 33.0]
+    assert tabela["nome_setor"].tolist()[2] == "Financeiro"
+    assert tabela["nome_setor"].isna().tolist() == [True, True, False]
+
+
+@pytest.mark.parametrize("formato", FORMATOS_COLUNARES)
+def test_bloco_posterior_com_tipo_incompativel_converte_para_csv(tmp_path, formato):
+    registros = [
+        {"nome_papel": "PETR4", "vlr_cot": 38.5},
+        {"nome_papel": "VALE3", "vlr_cot": 61.2},
+        {"nome_papel": "ITUB4", "vlr_cot": "abc"},
+        {"nome_papel": "BBAS3", "vlr_cot": 27.9},
+        {"nome_papel": "WEGE3", "vlr_cot": 40.1},
+    ]
+    caminho_base = str(tmp_path / "tabela")
+    gravador = _gravar(caminho_base, formato, registros)
+
+    # Nenhuma linha é perdida e o arquivo colunar parcial é removido
+    assert gravador.formato == "csv"
+    assert gravador.caminho.endswith(".csv")
+    assert os.listdir(tmp_path) == [os.path.basename(gravador.caminho)]
+    tabela = pd.read_csv(gravador.caminho, dtype=str)
+    assert tabela["nome_papel"].tolist() == ["PETR4", "VALE3", "ITUB4", "BBAS3", "WEGE3"]
+    assert tabela["vlr_cot"].tolist() == ["38.5", "61.2", "abc", "27.9", "40.1"]
+
+
+@pytest.mark.parametrize("formato", FORMATOS_COLUNARES + ["csv"])
+def test_excecao_remove_o_arquivo_parcial(tmp_path, formato):
+    caminho_base = str(tmp_path / "tabela")
+    with pytest.raises(RuntimeError):
+        with GravadorTabela(caminho_base, COLUNAS, formato=formato, tamanho_bloco=2) as gravador:
+            for ticker in ("PETR4", "VALE3", "ITUB4"):
+                gravador.adicionar({"nome_papel": ticker, "vlr_cot": 10.0})
+            assert os.path.exists(gravador.caminho)
+            raise RuntimeError("coleta interrompida")
+
+    assert os.listdir(tmp_path) == []
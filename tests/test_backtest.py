@@ -0,0 +1,47 @@
+"""Compara as carteiras do backtest com a seleção da triagem em cada snapshot."""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+from backtest import Backtest  # noqa: E402
+from modelos import RegraTriagem  # noqa: E402
+
+COLUNAS = ["Cotação", "P/L", "P/VP", "Vol $ méd (2m)", "EV / EBIT", "ROIC", "P/EBIT", "Div. Yield",
+           "Div Br/ Patrim"]
+
+
+def _snapshots(datas: int = 30, papeis: int = 120, semente: int = 0) -> pd.DataFrame:
+    """Snapshots diários com valores inteiros (muitos empates) e papéis em ordem aleatória."""
+    gerador = np.random.default_rng(semente)
+    tabelas = []
+    for data in pd.date_range("2022-01-03", periods=datas, freq="B"):
+        tickers = gerador.choice(papeis, size=papeis - 10, replace=False)
+        tabela = pd.DataFrame({coluna: gerador.integers(-2, 8, size=tickers.size).astype(float)
+                               for coluna in COLUNAS})
+        tabela["Cotação"] = gerador.integers(1, 5, size=tickers.size).astype(float)
+        tabela["Vol $ méd (2m)"] = gerador.choice([0.0, 2e6], size=tickers.size)
+        tabela["Div. Yield"] = tabela["Div. Yield"] / 100
+        tabela.insert(0, "Papel", [f"T{ticker:04d}" for ticker in tickers])
+        tabela.insert(0, "dt_snapshot", data)
+        tabelas.append(tabela)
+    return pd.concat(tabelas, ignore_index=True)
+
+
+@pytest.mark.parametrize("nome", ["ben_grahan", "magic_form", "decio_bazin"])
+def test_pesos_iguais_a_selecao_por_data(nome):
+    painel = _snapshots()
+    backtest = Backtest(painel)
+    regra = RegraTriagem.padrao(nome)
+    rebalanceamentos = backtest.datas_rebalanceamento("diaria")
+    pesos = backtest.pesos(regra, rebalanceamentos)
+
+    for linha, data in enumerate(backtest.datas[rebalanceamentos]):
+        snapshot = painel[painel["dt_snapshot"] == data]
+        carteira = regra.selecionar(snapshot)
+        esperado = sorted(snapshot.loc[carteira.index, "Papel"])
+        assert sorted(backtest.papeis[pesos[linha] > 0]) == esperado, data
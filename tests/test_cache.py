@@ -0,0 +1,120 @@
+"""Testa o cache HTTP em disco da `SessaoHttp` contra um servidor HTTP local.
+
+O servidor responde com ETag e Last-Modified da versão atual do conteúdo e devolve 304 às
+requisições condicionais que ainda correspondem a ela.
+"""
+import http.server
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+from metricas import Metricas  # noqa: E402
+from scraping.cache import CacheAusenteError, CacheHttp  # noqa: E402
+from scraping.sessao import SessaoHttp  # noqa: E402
+
+ULTIMA_MODIFICACAO = "Sat, 17 Oct 2026 10:00:00 GMT"
+
+
+class _Versionado(http.server.BaseHTTPRequestHandler):
+    versao = 1
+    requisicoes = []
+
+    def do_GET(self):
+        etag = f'"v{self.versao}"'
+        _Versionado.requisicoes.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        corpo = f"conteudo v{self.versao}".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", ULTIMA_MODIFICACAO)
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def url():
+    _Versionado.versao = 1
+    _Versionado.requisicoes = []
+    servidor = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Versionado)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{servidor.server_port}/detalhes.php?papel=PETR4"
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def _sessao(cache: CacheHttp) -> SessaoHttp:
+    return SessaoHttp(cache=cache, metricas=Metricas())
+
+
+def test_ttl_pelo_endpoint_mais_especifico(tmp_path):
+    cache = CacheHttp(str(tmp_path), ttls={"detalhes.php": 10, "detalhes.php?papel=PETR4": 5}, ttl_padrao=1)
+    assert cache.ttl("https://exemplo/detalhes.php?papel=PETR4") == 5
+    assert cache.ttl("https://exemplo/detalhes.php?papel=VALE3") == 10
+    assert cache.ttl("https://exemplo/resultado.php") == 1
+
+
+def test_entrada_dentro_do_ttl_nao_acessa_a_rede(tmp_path, url):
+    sessao = _sessao(CacheHttp(str(tmp_path)))
+    assert sessao.get(url).text == "conteudo v1"
+    _Versionado.versao = 2
+
+    resposta = sessao.get(url)
+    assert resposta.text == "conteudo v1"
+    assert resposta.from_cache
+    assert len(_Versionado.requisicoes) == 1
+    assert sessao.metricas.relatorio()["contadores"]["respostas_cache"] == 1
+
+
+def test_entrada_expirada_revalidada_com_304(tmp_path, url):
+    cache = CacheHttp(str(tmp_path), ttls={}, ttl_padrao=0)
+    sessao = _sessao(cache)
+    sessao.get(url)
+    armazenado_em = cache.ler(url)["armazenado_em"]
+
+    resposta = sessao.get(url)
+    condicional = _Versionado.requisicoes[-1]
+    assert condicional["If-None-Match"] == '"v1"'
+    assert condicional["If-Modified-Since"] == ULTIMA_MODIFICACAO
+    # O 304 devolve o conteúdo do cache e reinicia o tempo de vida da entrada
+    assert resposta.status_code == 200 and resposta.from_cache
+    assert resposta.text == "conteudo v1"
+    assert cache.ler(url)["armazenado_em"] > armazenado_em
+
+
+def test_entrada_expirada_alterada_e_regravada(tmp_path, url):
+    cache = CacheHttp(str(tmp_path), ttls={}, ttl_padrao=0)
+    sessao = _sessao(cache)
+    sessao.get(url)
+    _Versionado.versao = 2
+
+    resposta = sessao.get(url)
+    assert resposta.text == "conteudo v2"
+    assert not getattr(resposta, "from_cache", False)
+    entrada = cache.ler(url)
+    assert entrada["conteudo"] == b"conteudo v2"
+    assert entrada["headers"]["ETag"] == '"v2"'
+
+
+def test_modo_offline(tmp_path, url):
+    _sessao(CacheHttp(str(tmp_path))).get(url)
+    offline = _sessao(CacheHttp(str(tmp_path), ttls={}, ttl_padrao=0, modo_offline=True))
+
+    # Mesmo expirada, a entrada é usada sem acessar a rede
+    assert offline.get(url).text == "conteudo v1"
+    assert len(_Versionado.requisicoes) == 1
+    with pytest.raises(CacheAusenteError):
+        offline.get(url.replace("PETR4", "VALE3"))
+    assert len(_Versionado.requisicoes) == 1
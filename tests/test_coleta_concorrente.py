@@ -0,0 +1,66 @@
+"""Compara as coletas sequencial, concorrente e assíncrona contra um servidor HTTP local.
+
+O servidor entrega as fixtures de `src/benchmarks/fixtures` como páginas de detalhes, com o
+código do papel trocado pelo ticker requisitado e latências diferentes por ticker, para que a
+ordem de conclusão dos downloads concorrentes seja diferente da ordem dos tickers.
+"""
+import asyncio
+import http.server
+import os
+import sys
+import threading
+import time
+import urllib.parse
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+from benchmarks import ler_fixture  # noqa: E402
+from scraping import Scraping  # noqa: E402
+
+TICKERS = ["PETR4", "HGLG11", "VALE3", "KNRI11", "ITUB4", "BBAS3"]
+
+
+class _Fixtures(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        ticker = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)["papel"][0]
+        fixture, original = ("detalhes_hglg11.html", "HGLG11") if ticker.endswith("11") \
+            else ("detalhes_petr4.html", "PETR4")
+        # Os primeiros tickers respondem por último
+        time.sleep(0.02 * (len(TICKERS) - TICKERS.index(ticker)))
+        corpo = ler_fixture(fixture).replace(original, ticker).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def url_detalhes():
+    servidor = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Fixtures)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{servidor.server_port}/detalhes.php?papel="
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def _sem_horario(df):
+    return df.drop(columns="datetime_exec").reset_index(drop=True)
+
+
+def test_coletas_concorrente_e_assincrona_iguais_a_sequencial(url_detalhes):
+    sequencial = Scraping(url_kpis_ticker=url_detalhes).coleta_indicadores_de_ativos(TICKERS)
+    concorrente = Scraping(url_kpis_ticker=url_detalhes).coleta_indicadores_de_ativos(TICKERS, max_concorrencia=8)
+    assincrona = asyncio.run(
+        Scraping(url_kpis_ticker=url_detalhes).coleta_indicadores_de_ativos_async(TICKERS, max_concorrencia=8))
+
+    # Ações e FIIs usam colunas de código diferentes
+    assert sequencial["nome_papel"].fillna(sequencial["fii"]).tolist() == TICKERS
+    assert list(sequencial.columns) == list(concorrente.columns) == list(assincrona.columns)
+    assert _sem_horario(concorrente).equals(_sem_horario(sequencial))
+    assert _sem_horario(assincrona).equals(_sem_horario(sequencial))
@@ -0,0 +1,38 @@
+"""Testes da retomada de coletas pelo diário de execução."""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+from scraping.diario import DiarioExecucao  # noqa: E402
+
+
+def _registrar(diario, ticker):
+    diario.registrar(ticker, "acoes", {"Papel": ticker}, "17/10/2026 10:00:00")
+
+
+def test_retomada_apos_interrupcao_no_meio_de_uma_linha(tmp_path):
+    with DiarioExecucao("acoes_17_10_2026", str(tmp_path)) as diario:
+        _registrar(diario, "A")
+        caminho = diario.caminho
+    # Interrupção durante a gravação do registro de B
+    with open(caminho, "a", encoding="utf-8") as arquivo:
+        arquivo.write('{"ticker": "B", "tipo": "ac')
+
+    with DiarioExecucao("acoes_17_10_2026", str(tmp_path)) as diario:
+        assert [ticker for ticker in "ABC" if ticker in diario] == ["A"]
+        _registrar(diario, "C")
+
+    with DiarioExecucao("acoes_17_10_2026", str(tmp_path)) as diario:
+        assert [ticker for ticker in "ABC" if ticker in diario] == ["A", "C"]
+        assert diario.obter("C")["dados"] == {"Papel": "C"}
+
+
+def test_concluir_arquiva_o_diario(tmp_path):
+    with DiarioExecucao("acoes_17_10_2026", str(tmp_path)) as diario:
+        _registrar(diario, "A")
+        diario.concluir()
+
+    with DiarioExecucao("acoes_17_10_2026", str(tmp_path)) as diario:
+        assert len(diario) == 0
+    assert os.path.exists(tmp_path / "acoes_17_10_2026.concluido.jsonl")
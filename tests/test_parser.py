@@ -0,0 +1,31 @@
+"""Compara a extração lxml/XPath das páginas de detalhes com o laço BeautifulSoup original.
+
+Usa as mesmas fixtures de `benchmarks.parser_detalhes`. Execute a partir da raiz do repositório:
+    python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+from benchmarks import ler_fixture  # noqa: E402
+from benchmarks.parser_detalhes import FIXTURES_DETALHES, extrair_pares_indicadores_bs4  # noqa: E402
+from scraping.parser import extrair_pares_indicadores  # noqa: E402
+from scraping.scraping import VARIATION_HEADINGS  # noqa: E402
+
+
+@pytest.mark.parametrize("nome", FIXTURES_DETALHES)
+def test_extracao_igual_ao_beautifulsoup(nome):
+    pagina = ler_fixture(nome)
+    esperado = extrair_pares_indicadores_bs4(pagina, VARIATION_HEADINGS)
+    obtido = extrair_pares_indicadores(pagina, VARIATION_HEADINGS)
+    assert esperado
+    assert obtido == esperado
+    # A ordem das chaves define a ordem das colunas do consolidado
+    assert list(obtido) == list(esperado)
+
+
+def test_pagina_sem_tabelas():
+    assert extrair_pares_indicadores("<html><body><p>sem dados</p></body></html>", VARIATION_HEADINGS) == {}